@@ -0,0 +1,172 @@
+"""
+Alias index for the Discord bot.
+Builds a bidirectional index over the alternative names file once, reloads it
+only when the file changes, and maps any normalized name to its canonical
+operators (and back) in O(1).
+"""
+
+import json
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Tuple
+
+from constants import ALTERNATIVE_NAMES_PATH, ERROR_MESSAGES, DATA_RELOAD_CHECK_INTERVAL
+from logging_utils import get_logger
+from observability import observability
+from utils import WatchedFile, normalize_operator_name, parse_alternative_names
+
+logger = get_logger(__name__)
+
+# (canonical -> aliases, name -> canonicals, name -> alternatives)
+AliasLookups = Tuple[Dict[str, Tuple[str, ...]], Dict[str, FrozenSet[str]], Dict[str, Tuple[str, ...]]]
+
+
+class AliasIndex:
+    """Canonical name <-> alias lookups backed by the alternative names file."""
+
+    def __init__(self, path: str = ALTERNATIVE_NAMES_PATH,
+                 check_interval: float = DATA_RELOAD_CHECK_INTERVAL):
+        """
+        Initialize the index. The file is read on first access.
+
+        Args:
+            path: Path to the alternative names JSON file
+            check_interval: Minimum seconds between checks for a changed file
+        """
+        self.path = path
+        self._watcher = WatchedFile(path, check_interval)
+        self._raw: Mapping[str, List[str]] = MappingProxyType({})
+        self._aliases: Dict[str, Tuple[str, ...]] = {}
+        self._canonicals: Dict[str, FrozenSet[str]] = {}
+        self._alternatives: Dict[str, Tuple[str, ...]] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Number of times the data was (re)loaded; lets dependents rebuild their caches."""
+        self._refresh()
+        return self._version
+
+    def _refresh(self, force: bool = False) -> None:
+        """Rebuild the index if the file content changed since the last load."""
+        try:
+            content = self._watcher.poll(force)
+            if content is None:
+                return
+            raw = json.loads(content.decode("utf-8"))
+            if not isinstance(raw, dict):
+                raise ValueError("expected a JSON object")
+        except (OSError, ValueError) as e:
+            logger.error("%s", ERROR_MESSAGES["LOAD_ERROR"].format(e))
+            observability.error_tracker.track_error(e, {'file': self.path})
+            return
+        self._build(raw)
+
+    def _build(self, raw: Dict[str, List[str]]) -> None:
+        """Precompute every lookup from the raw mapping."""
+        names = parse_alternative_names(raw)
+        aliases: Dict[str, Tuple[str, ...]] = {}
+        canonicals: Dict[str, List[str]] = {}
+        for main_name, alt_list in names.items():
+            aliases[main_name] = tuple(alt_list) if alt_list else (main_name,)
+            for name in [main_name] + alt_list:
+                owners = canonicals.setdefault(name, [])
+                if main_name not in owners:
+                    owners.append(main_name)
+
+        alternatives: Dict[str, Tuple[str, ...]] = {}
+        for name, owners in canonicals.items():
+            ordered = [name]
+            for main_name in owners:
+                ordered.append(main_name)
+                ordered.extend(names[main_name])
+            alternatives[name] = tuple(dict.fromkeys(ordered))
+
+        lookups = (aliases, {name: frozenset(owners) for name, owners in canonicals.items()}, alternatives)
+        self._install(raw, lookups)
+
+    def _install(self, raw: Dict[str, List[str]], lookups: AliasLookups) -> None:
+        """Swap in a new raw mapping and its precomputed lookups."""
+        self._raw = MappingProxyType(raw)
+        self._aliases, self._canonicals, self._alternatives = lookups
+        self._version += 1
+        logger.info("Built alias index with %d names for %d operators (version %d)",
+                    len(self._canonicals), len(self._aliases), self._version)
+
+    def lookups(self) -> AliasLookups:
+        """The precomputed (aliases, canonicals, alternatives) maps, e.g. for the data bundle."""
+        self._refresh()
+        return self._aliases, self._canonicals, self._alternatives
+
+    def seed(self, raw: Dict[str, List[str]], lookups: AliasLookups,
+             signature: Tuple[int, int], digest: str) -> None:
+        """
+        Install lookups compiled ahead of time instead of parsing the file.
+
+        Args:
+            raw: Alternative names mapping as written in the file
+            lookups: Maps returned by lookups() when the bundle was built
+            signature: Signature of the file they were compiled from
+            digest: SHA-256 hex digest of that file's content
+        """
+        self._install(raw, lookups)
+        self._watcher.prime(signature, digest)
+
+    def reload(self) -> None:
+        """Check the file for changes immediately, ignoring the check interval."""
+        self._refresh(force=True)
+
+    def raw(self) -> Mapping[str, List[str]]:
+        """The alternative names mapping as written in the file (original casing)."""
+        self._refresh()
+        return self._raw
+
+    def aliases_for(self, canonical: str) -> Tuple[str, ...]:
+        """
+        Accepted answers for an operator, in file order.
+
+        Args:
+            canonical: Operator (folder) name
+
+        Returns:
+            Normalized alternatives, or just the normalized name if it has none
+        """
+        self._refresh()
+        key = normalize_operator_name(canonical)
+        return self._aliases.get(key, (key,))
+
+    def answer_set(self, canonical: str) -> FrozenSet[str]:
+        """Accepted answers for an operator as a set, for O(1) winner checks."""
+        key = normalize_operator_name(canonical)
+        return frozenset(self.aliases_for(key)) | {key}
+
+    def canonicals_for(self, name: str) -> FrozenSet[str]:
+        """
+        Operators a name may refer to ("amiya" belongs to every Amiya variant).
+
+        Args:
+            name: Any name or alias
+
+        Returns:
+            Normalized canonical names (empty if the name is not in the file)
+        """
+        self._refresh()
+        return self._canonicals.get(normalize_operator_name(name), frozenset())
+
+    def alternatives_for(self, name: str) -> List[str]:
+        """
+        Every name equivalent to the given one: the name itself, then each
+        operator it belongs to followed by that operator's alternatives.
+
+        Args:
+            name: Any name or alias
+
+        Returns:
+            Normalized names without duplicates
+        """
+        self._refresh()
+        key = normalize_operator_name(name)
+        return list(self._alternatives.get(key, (key,)))
+
+
+# Global alias index instance
+alias_index = AliasIndex()
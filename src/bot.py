@@ -1,18 +1,47 @@
 import interactions
 from config import TOKEN
 from observability import observability
+from constants import ROUND_JOURNAL_FLUSH_SECONDS, SELECTION_FLUSH_SECONDS
+from data_bundle import warm_start
+from game_state import game_state
+from round_journal import round_journal
+from selection import selection_scheduler
+from timer_wheel import timer_wheel
 
 # Initialize observability system
 observability.logger.info("Starting Discord bot initialization")
 
+# Seed the static data from the precompiled bundle when it is up to date
+if not warm_start():
+    observability.logger.info("No current data bundle, loading data from the source files")
+
+# Bring back the rounds that were in progress before the restart
+restored_rounds = round_journal.attach(game_state)
+observability.logger.info("Round journal attached", restored_rounds=restored_rounds)
+
 bot = interactions.Client(
     token=TOKEN,
     intents=interactions.Intents.DEFAULT | interactions.Intents.MESSAGE_CONTENT,
 )
 
 
+@interactions.Task.create(interactions.IntervalTrigger(seconds=ROUND_JOURNAL_FLUSH_SECONDS))
+async def flush_round_journal():
+    round_journal.flush()
+
+
+@interactions.Task.create(interactions.IntervalTrigger(seconds=SELECTION_FLUSH_SECONDS))
+async def flush_selection_state():
+    selection_scheduler.flush()
+
+
 @bot.event
 async def on_ready():
+    if not flush_round_journal.running:
+        flush_round_journal.start()
+    if not flush_selection_state.running:
+        flush_selection_state.start()
+    timer_wheel.start()
     observability.set_bot_ready(True)
     observability.logger.info(
         f"Bot {bot.user.username} is online!",
@@ -67,6 +96,18 @@ try:
 except Exception as e:
     observability.error_tracker.track_error(e, {'extension': 'arkdle'})
 
+try:
+    bot.load_extension("commands.arkdle_daily")
+    observability.logger.info("Loaded arkdle_daily extension")
+except Exception as e:
+    observability.error_tracker.track_error(e, {'extension': 'arkdle_daily'})
+
+try:
+    bot.load_extension("commands.match")
+    observability.logger.info("Loaded match extension")
+except Exception as e:
+    observability.error_tracker.track_error(e, {'extension': 'match'})
+
 try:
     bot.load_extension("commands.ranking")
     observability.logger.info("Loaded ranking extension")
@@ -3,8 +3,9 @@ Type definitions and data structures for the Discord bot.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
 from enum import Enum
+from array import array
 import uuid
 
 
@@ -79,6 +80,18 @@ class GameRound:
     correct_answer: Optional[List[str]] = None
     answers: Dict[str, str] = field(default_factory=dict)
     start_time: Optional[str] = None
+    answer_set: FrozenSet[str] = frozenset()
+    winners: Set[str] = field(default_factory=set)
+    operator_data: Optional[Mapping[str, str]] = None
+    hint_fields: Tuple[str, ...] = ()
+    user_states: Dict[str, Any] = field(default_factory=dict)
+    image_ref: Optional[str] = None
+    competitive: bool = False
+    match_id: Optional[str] = None  # Match the round belongs to, if any
+    started_at: float = 0.0  # time.perf_counter() at the start of the round
+    guess_users: List[str] = field(default_factory=list)
+    guess_times: array = field(default_factory=lambda: array("d"))  # Seconds after the start, per accepted guess
+    correct_indices: array = field(default_factory=lambda: array("L"))  # Positions of correct guesses
     
     def reset(self) -> None:
         """Reset the round to initial state."""
@@ -87,6 +100,27 @@ class GameRound:
         self.correct_answer = None
         self.answers.clear()
         self.start_time = None
+        self.answer_set = frozenset()
+        self.winners.clear()
+        self.operator_data = None
+        self.hint_fields = ()
+        self.user_states.clear()
+        self.image_ref = None
+        self.competitive = False
+        self.match_id = None
+        self.started_at = 0.0
+        self.guess_users.clear()
+        self.guess_times = array("d")
+        self.correct_indices = array("L")
+
+
+@dataclass
+class PreparedRound:
+    """Data class representing a Guess Who round selected and rendered ahead of time."""
+    operator: str
+    image_bytes: bytes
+    file_name: str
+    image_ref: str
 
 
 @dataclass
@@ -1,55 +1,76 @@
-import interactions
-import json
-import random
+import asyncio
 import math
+import interactions
 import logging
+from datetime import datetime
 from scores import load_scores, save_scores
+from constants import ARKDLE_RARITY_WEIGHTS, ARKDLE_ROUND_SECONDS, ARKDLE_GUESS_COOLDOWN_SECONDS
+from operator_repository import operator_repository
+from selection import selection_scheduler
+from hint_planner import get_hint_plan, get_hint_plans
+from round_store import is_daily_key, round_key
+from game_state import ARKDLE, game_state
+from match import match_manager
+from timer_wheel import Cooldowns, KeyedTimers, timer_wheel
+from exceptions import InvalidGameStateError
+from operator_table import get_operator_table
+from name_index import get_name_index, resolve_guess
+from rate_limit import rate_limited
 from observability import observability, log_command_usage, monitor_performance
 
-OPERATORS_JSON = "data/operators_structured.json"
 
+# Members of each Arkdle pool for the data version they were computed from:
+# {pool: (version, names, candidate count)}
+_pool_members = {}
 
-@monitor_performance("load_operators")
-def load_operators():
-    """Carrega operadores do arquivo JSON."""
-    try:
-        with open(OPERATORS_JSON, encoding="utf-8") as f:
-            data = json.load(f)
-        operators = data["operators"]
-        observability.logger.info(f"Loaded {len(operators)} operators from {OPERATORS_JSON}")
-        return operators
-    except FileNotFoundError:
-        observability.logger.error(f"Arquivo não encontrado: {OPERATORS_JSON}")
-        observability.error_tracker.track_error(FileNotFoundError(f"File not found: {OPERATORS_JSON}"))
-        return []
-    except json.JSONDecodeError as e:
-        observability.logger.error(f"Erro ao decodificar JSON: {OPERATORS_JSON}")
-        observability.error_tracker.track_error(e, {'file': OPERATORS_JSON})
-        return []
-    except Exception as e:
-        observability.logger.error(f"Erro ao carregar operadores: {e}")
-        observability.error_tracker.track_error(e, {'operation': 'load_operators'})
-        return []
-
-
-# Store the current round's operator (shared) and per-user hint index
-current_operator = None
-user_hint_indices = {}  # {user_id: hint_index}
-
-
-def normalize_guess(guess):
-    """Normaliza o palpite do usuário."""
-    return guess.strip().lower()
-
-
-def already_won(scores, user_id, operator_name):
-    return (
-        str(user_id) in scores
-        and scores[str(user_id)].get("arkdle_last_win") == operator_name
-    )
 
+@monitor_performance("select_operator")
+def select_operator(raridade=None, classe=None, faccao=None, guild_id=None):
+    """
+    Sorteia o próximo operador do baralho do servidor entre os que atendem aos
+    filtros (raridade, classe, facção); cada combinação de filtros tem seu baralho.
+    """
+    # Read before the table: a reload in between only makes the next call recompute
+    version = operator_repository.version
+    table = get_operator_table()
+    if table.size == 0:
+        observability.logger.error(f"Nenhum operador disponível em {operator_repository.path}")
+        return None, 0
+
+    def canonical(field, value):
+        # The deck is named after the table's spelling of the filter, whatever the user typed
+        code = table.code_of(field, value)
+        return None if code is None else table.vocabularies[field][code]
+
+    classe = canonical("class", classe) if classe else ""
+    faccao = canonical("faction", faccao) if faccao else ""
+    if classe is None or faccao is None:
+        return None, 0
+    pool = f"arkdle:{raridade or ''}:{classe}:{faccao}"
+
+    cached = _pool_members.get(pool)
+    if cached is None or cached[0] != version:
+        criteria = {}
+        if classe:
+            criteria["class"] = classe
+        if faccao:
+            criteria["faction"] = faccao
+        candidates = table.select(criteria, min_rarity=raridade, max_rarity=raridade)
+        cached = _pool_members[pool] = (version, table.names_for(candidates), table.count(candidates))
+    _, names, count = cached
 
-def update_score(scores, user_id, username, operator_name, pontos):
+    def weight(name):
+        return ARKDLE_RARITY_WEIGHTS.get(int(table.rarity[table.find(name)]), 1.0)
+
+    chosen = selection_scheduler.draw(guild_id, pool, names, weight, version=version)
+    if chosen is None:
+        return None, 0
+    return table.records[table.find(chosen)], count
+
+
+def update_score(user_id, username, operator_name, pontos):
+    """Credita os pontos de uma vitória; é o único acesso do Arkdle ao arquivo de pontuação."""
+    scores = load_scores()
     if str(user_id) in scores:
         scores[str(user_id)]["pontos"] += pontos
         scores[str(user_id)]["username"] = username
@@ -63,14 +84,33 @@ def update_score(scores, user_id, username, operator_name, pontos):
     save_scores(scores)
 
 
-async def send_hint(ctx, current_operator, hint_fields, hint_index, user_id):
-    field = hint_fields[hint_index]
-    value = current_operator.get(field, "Unknown")
+def format_feedback(table, guess_index, target_index):
+    """
+    Monta a comparação campo a campo entre o palpite e o operador da rodada; vazia se
+    o operador da rodada não está mais nos dados (rodada restaurada após uma atualização).
+    """
+    if target_index is None:
+        return ""
+    matches, direction = table.compare(guess_index, target_index)
+    guessed = table.records[guess_index]
+    lines = []
+    for field, matched in zip(table.fields, matches):
+        line = f"{'🟩' if matched else '🟥'} {field.capitalize()}: {guessed.get(field, 'Unknown')}"
+        if field == "rarity" and direction:
+            line += " ⬆️" if direction > 0 else " ⬇️"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def feedback_block(feedback):
+    return f"{feedback}\n" if feedback else ""
+
+
+async def send_hint(ctx, field, value, feedback=""):
     await ctx.send(
-        f"Palpite incorreto. Próxima dica: {field.capitalize()} é '{value}'. Tente novamente!",
+        f"Palpite incorreto.\n{feedback_block(feedback)}Próxima dica: {field.capitalize()} é '{value}'. Tente novamente!",
         ephemeral=True,
     )
-    user_hint_indices[user_id] = hint_index + 1
 
 
 async def send_correct(ctx, current_operator, hints_used, pontos):
@@ -80,46 +120,111 @@ async def send_correct(ctx, current_operator, hints_used, pontos):
     )
 
 
-async def send_no_more_hints(ctx):
+async def send_no_more_hints(ctx, feedback=""):
     await ctx.send(
-        "Palpite incorreto. Não há mais dicas disponíveis! Tente novamente!",
+        f"Palpite incorreto.\n{feedback_block(feedback)}Não há mais dicas disponíveis! Tente novamente!",
         ephemeral=True,
     )
 
 
+# Expiry deadline of each channel's round and cooldown of each player after a wrong guess
+expiry_timers = KeyedTimers(timer_wheel)
+guess_cooldowns = Cooldowns(timer_wheel)
+
+
+def schedule_expiry(client, key, delay=ARKDLE_ROUND_SECONDS):
+    expiry_timers.schedule(key, delay, expire_round, client, key)
+
+
+def cancel_expiry(event, game, key, data):
+    """Rodadas encerradas ou substituídas não precisam mais do prazo."""
+    if event == "round_ended" and game == ARKDLE:
+        expiry_timers.cancel(key)
+
+
+game_state.subscribe(cancel_expiry)
+
+
+async def expire_round(client, key):
+    """Encerra a rodada que passou do prazo e revela o operador no canal."""
+    try:
+        arkdle_round = game_state.end_arkdle_round(key)
+    except InvalidGameStateError:
+        return
+    observability.logger.info("Arkdle round expired", guild_id=key[0], channel_id=key[1])
+    channel = await client.fetch_channel(int(key[1]))
+    await channel.send(f"O Arkdle expirou! O operador era **{arkdle_round.current_operator}**.")
+
+
+def schedule_restored_expiries(client):
+    """Agenda o prazo das rodadas restauradas após um reinício, contando do início de cada uma."""
+    now = datetime.now()
+    for game, key, arkdle_round in game_state.iter_rounds():
+        # Match rounds are ended by the match extension, since their match did not survive
+        if game != ARKDLE or key in expiry_timers or is_daily_key(key) or arkdle_round.match_id:
+            continue
+        elapsed = (now - datetime.fromisoformat(arkdle_round.start_time)).total_seconds()
+        schedule_expiry(client, key, max(ARKDLE_ROUND_SECONDS - elapsed, 0))
+
+
 class ArkdleGame(interactions.Extension):
     def __init__(self, client):
         self.client = client
+        # Load operator data and plan every operator's hints up front so rounds never wait on them
+        operator_repository.reload()
+        get_hint_plans()
+
+    @interactions.listen(interactions.events.Startup)
+    async def on_startup(self):
+        schedule_restored_expiries(self.client)
 
     @interactions.slash_command(
         name="arkdle",
         description="Comece uma nova rodada Arkdle com um operador Arknights aleatório.",
         default_member_permissions=interactions.Permissions.ADMINISTRATOR,
     )
+    @interactions.slash_option(
+        name="raridade",
+        description="Sortear apenas operadores com esta raridade (estrelas).",
+        opt_type=interactions.OptionType.INTEGER,
+        required=False,
+        min_value=1,
+        max_value=6,
+    )
+    @interactions.slash_option(
+        name="classe",
+        description="Sortear apenas operadores desta classe (ex.: Caster).",
+        opt_type=interactions.OptionType.STRING,
+        required=False,
+    )
+    @interactions.slash_option(
+        name="faccao",
+        description="Sortear apenas operadores desta facção (ex.: Rhodes Island).",
+        opt_type=interactions.OptionType.STRING,
+        required=False,
+    )
     @log_command_usage("arkdle")
-    async def arkdle(self, ctx: interactions.SlashContext):
-        """Inicia uma nova rodada do Arkdle (apenas para administradores)."""
-        global current_operator, user_hint_indices
+    async def arkdle(self, ctx: interactions.SlashContext, raridade: int = None,
+                     classe: str = None, faccao: str = None):
+        """Inicia uma nova rodada do Arkdle no canal (apenas para administradores)."""
         await ctx.defer()
         try:
-            operators = load_operators()
-            if not operators:
-                await ctx.send(
-                    "Erro ao carregar operadores. Tente novamente mais tarde."
-                )
+            key = round_key(ctx)
+            if match_manager.get(key):
+                await ctx.send("Há uma partida em andamento neste canal!")
+                return
+            chosen, candidates = await asyncio.to_thread(select_operator, raridade, classe, faccao, key[0])
+            if chosen is None:
+                if candidates == 0 and (raridade or classe or faccao):
+                    await ctx.send("Nenhum operador corresponde aos filtros escolhidos.")
+                else:
+                    await ctx.send(
+                        "Erro ao carregar operadores. Tente novamente mais tarde."
+                    )
                 return
-            chosen = random.choice(operators)
-            current_operator = chosen
-            user_hint_indices = {}  # Reset all users' hint indices
-            hint_fields = [
-                "gender",
-                "faction",
-                "rarity",
-                "class",
-                "subclass",
-                "nationality",
-                "infection_status",
-            ]
+            hint_fields = get_hint_plan(chosen["name"]).fields
+            game_state.start_arkdle_round(key, chosen, hint_fields)
+            schedule_expiry(self.client, key)
             hint = chosen.get(hint_fields[0], "Unknown")
             await ctx.send(
                 f"Arkdle começou! Dica: {hint_fields[0].capitalize()} é '{hint}'. Use /arkdle_guess para fazer um palpite."
@@ -142,50 +247,74 @@ class ArkdleGame(interactions.Extension):
         description="Seu palpite para o nome do operador.",
         opt_type=interactions.OptionType.STRING,
         required=True,
+        autocomplete=True,
     )
     @log_command_usage("arkdle_guess")
+    @rate_limited("arkdle_guess")
     async def arkdle_guess(self, ctx: interactions.SlashContext, guess: str):
         """Processa o palpite do usuário e atualiza pontuação conforme dicas usadas."""
-        global current_operator, user_hint_indices
         await ctx.defer(ephemeral=True)
         try:
-            if not current_operator:
+            key = round_key(ctx)
+            arkdle_round = game_state.get_arkdle_round(key)
+            if arkdle_round is None:
                 await ctx.send(
                     "No Arkdle round in progress. Use /arkdle to start one.",
                     ephemeral=True,
                 )
                 return
-            user_id = ctx.author.id
-            hint_fields = [
-                "gender",
-                "faction",
-                "rarity",
-                "class",
-                "subclass",
-                "nationality",
-                "infection_status",
-            ]
-            guess_normalized = normalize_guess(guess)
-            correct_name = current_operator["name"].lower()
-            hint_index = user_hint_indices.get(user_id, 1)
-            scores = load_scores()
-            username = str(ctx.author)
-            if already_won(scores, user_id, current_operator["name"]):
+            current_operator = arkdle_round.operator_data
+            user_id = str(ctx.author.id)
+            if guess_cooldowns.active((key, user_id)):
+                await ctx.send(
+                    f"Aguarde {math.ceil(guess_cooldowns.remaining((key, user_id)))}s antes do próximo palpite.",
+                    ephemeral=True,
+                )
+                return
+            if game_state.has_won(key, user_id):
+                await ctx.send(
+                    "Você já acertou esse operador nesta rodada!", ephemeral=True
+                )
+                return
+            guess_normalized = resolve_guess(guess, include_aliases=False)
+            table = get_operator_table()
+            guess_index = table.find(guess_normalized)
+            result = game_state.submit_arkdle_guess(
+                key, user_id, guess_normalized, known=guess_index is not None
+            )
+            if result["status"] == "correct":
+                match = match_manager.get(key)
+                if match is not None:
+                    # Match points stay on the match leaderboard until the match ends
+                    match.award(user_id, result["points"], str(ctx.author))
+                else:
+                    update_score(
+                        user_id, str(ctx.author), current_operator["name"], result["points"]
+                    )
+                await send_correct(ctx, current_operator, result["hints_used"], result["points"])
+                return
+            if result["status"] == "already_won":
                 await ctx.send(
                     "Você já acertou esse operador nesta rodada!", ephemeral=True
                 )
                 return
-            if guess_normalized == correct_name:
-                hints_used = hint_index
-                pontos = math.ceil(30 / hints_used)
-                update_score(
-                    scores, user_id, username, current_operator["name"], pontos
+            if result["status"] == "unknown":
+                await ctx.send(
+                    f"Operador '{guess}' não encontrado. Confira o nome e tente novamente!",
+                    ephemeral=True,
                 )
-                await send_correct(ctx, current_operator, hints_used, pontos)
-            elif hint_index < len(hint_fields):
-                await send_hint(ctx, current_operator, hint_fields, hint_index, user_id)
+                return
+            guess_cooldowns.start((key, user_id), ARKDLE_GUESS_COOLDOWN_SECONDS)
+            feedback = format_feedback(table, guess_index, table.find(current_operator["name"]))
+            if result["status"] == "incorrect":
+                await send_hint(ctx, result["hint_field"], result["hint_value"], feedback)
             else:
-                await send_no_more_hints(ctx)
+                await send_no_more_hints(ctx, feedback)
+        except InvalidGameStateError:
+            await ctx.send(
+                "No Arkdle round in progress. Use /arkdle to start one.",
+                ephemeral=True,
+            )
         except (KeyError, ValueError) as e:
             logging.error(f"Erro de dados no comando arkdle_guess: {e}")
             await ctx.send(
@@ -202,6 +331,12 @@ class ArkdleGame(interactions.Extension):
             except Exception:
                 pass
 
+    @arkdle_guess.autocomplete("guess")
+    async def guess_autocomplete(self, ctx: interactions.AutocompleteContext):
+        """Sugere nomes de operadores conforme o usuário digita."""
+        names = get_name_index(include_aliases=False).suggest(ctx.input_text or "")
+        await ctx.send(choices=[{"name": name, "value": name} for name in names])
+
 
 def setup(client):
     return ArkdleGame(client)
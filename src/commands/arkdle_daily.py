@@ -0,0 +1,195 @@
+import logging
+import interactions
+from exceptions import InvalidGameStateError
+from scores import load_scores, save_scores
+from operator_table import get_operator_table
+from daily_schedule import daily_schedule
+from game_state import ARKDLE, game_state
+from hint_planner import get_hint_plan
+from name_index import get_name_index, resolve_guess
+from round_store import daily_round_key, is_daily_key
+from timer_wheel import KeyedTimers, timer_wheel
+from commands.arkdle import format_feedback, send_hint, send_no_more_hints
+from rate_limit import rate_limited
+from observability import observability, log_command_usage, monitor_performance
+
+
+@monitor_performance("get_daily_round")
+def get_daily_round(guild_id, day):
+    """
+    Rodada diária do servidor, criada a partir do cronograma na primeira consulta do dia.
+    É uma rodada do Arkdle no game_state, então vencedores e dicas entram no diário de
+    rodadas e sobrevivem a reinícios.
+    """
+    key = daily_round_key(guild_id, day)
+    daily = game_state.get_arkdle_round(key)
+    if daily is not None:
+        return daily
+    table = get_operator_table()
+    name = daily_schedule.operator_for(guild_id, table.names, day)
+    if name is None:
+        return None
+    game_state.start_arkdle_round(key, table.records[table.find(name)], get_hint_plan(name).fields)
+    return game_state.get_arkdle_round(key)
+
+
+def rollover_daily_rounds():
+    """Encerra as rodadas de dias anteriores; a próxima consulta usa o operador do novo dia."""
+    today = daily_schedule.today()
+    expired = [
+        key for game, key, _ in game_state.iter_rounds()
+        if game == ARKDLE and is_daily_key(key) and key != daily_round_key(key[0], today)
+    ]
+    for key in expired:
+        try:
+            game_state.end_arkdle_round(key)
+        except InvalidGameStateError:
+            pass
+    if expired:
+        observability.logger.info(
+            "Daily Arkdle rollover",
+            day=today.isoformat(),
+            guilds=len(expired)
+        )
+    return len(expired)
+
+
+# The next rollover, scheduled at midnight of the schedule's timezone
+rollover_timers = KeyedTimers(timer_wheel)
+
+
+def schedule_rollover():
+    """Agenda a próxima virada para a meia-noite do fuso do cronograma."""
+    rollover_timers.schedule("rollover", daily_schedule.seconds_until_rollover(), run_rollover)
+
+
+def run_rollover():
+    # A timer that fires a little early finds the same day and simply waits for midnight again
+    rollover_daily_rounds()
+    schedule_rollover()
+
+
+def add_points(user_id, username, pontos, day):
+    """
+    Credita os pontos do Arkdle diário, no máximo uma vez por dia: o dia da última
+    vitória fica na pontuação, então nem uma rodada perdida paga duas vezes.
+
+    Returns:
+        False se o usuário já tinha recebido os pontos desse dia
+    """
+    scores = load_scores()
+    entry = scores.setdefault(str(user_id), {"username": username, "pontos": 0, "arkdle_last_win": None})
+    if entry.get("arkdle_daily_last_win") == day.isoformat():
+        return False
+    entry["pontos"] += pontos
+    entry["username"] = username
+    entry["arkdle_daily_last_win"] = day.isoformat()
+    save_scores(scores)
+    return True
+
+
+class ArkdleDaily(interactions.Extension):
+    def __init__(self, client):
+        self.client = client
+
+    @interactions.listen(interactions.events.Startup)
+    async def on_startup(self):
+        # Rounds restored from a previous day end now; later days end at each midnight
+        run_rollover()
+
+    @interactions.slash_command(
+        name="arkdle_daily",
+        description="Veja a primeira dica do Arkdle diário.",
+    )
+    @log_command_usage("arkdle_daily")
+    async def arkdle_daily(self, ctx: interactions.SlashContext):
+        """Mostra a dica inicial do operador do dia."""
+        guild_id = str(ctx.guild.id) if ctx.guild else None
+        today = daily_schedule.today()
+        daily = get_daily_round(guild_id, today)
+        if daily is None:
+            await ctx.send("Erro ao carregar operadores. Tente novamente mais tarde.", ephemeral=True)
+            return
+        if game_state.has_won(daily_round_key(guild_id, today), str(ctx.author.id)):
+            await ctx.send("Você já acertou o operador de hoje! Volte amanhã.", ephemeral=True)
+            return
+        field = daily.hint_fields[0]
+        hint = daily.operator_data.get(field, "Unknown")
+        await ctx.send(
+            f"Arkdle diário de {today.strftime('%d/%m/%Y')}! Dica: {field.capitalize()} é '{hint}'. "
+            "Use /arkdle_daily_guess para fazer um palpite.",
+            ephemeral=True,
+        )
+
+    @interactions.slash_command(
+        name="arkdle_daily_guess",
+        description="Faça um palpite para o operador do Arkdle diário.",
+    )
+    @interactions.slash_option(
+        name="guess",
+        description="Seu palpite para o nome do operador.",
+        opt_type=interactions.OptionType.STRING,
+        required=True,
+        autocomplete=True,
+    )
+    @log_command_usage("arkdle_daily_guess")
+    @rate_limited("arkdle_daily_guess")
+    async def arkdle_daily_guess(self, ctx: interactions.SlashContext, guess: str):
+        """Processa o palpite do usuário para o operador do dia."""
+        await ctx.defer(ephemeral=True)
+        try:
+            guild_id = str(ctx.guild.id) if ctx.guild else None
+            today = daily_schedule.today()
+            daily = get_daily_round(guild_id, today)
+            if daily is None:
+                await ctx.send("Erro ao carregar operadores. Tente novamente mais tarde.", ephemeral=True)
+                return
+            key = daily_round_key(guild_id, today)
+            user_id = str(ctx.author.id)
+            operator = daily.operator_data
+            guess_normalized = resolve_guess(guess, include_aliases=False)
+            table = get_operator_table()
+            guess_index = table.find(guess_normalized)
+            result = game_state.submit_arkdle_guess(
+                key, user_id, guess_normalized, known=guess_index is not None
+            )
+            if result["status"] == "correct" and add_points(user_id, str(ctx.author), result["points"], today):
+                await ctx.send(
+                    f"Correto! O operador de hoje era {operator['name']}. Você usou {result['hints_used']} "
+                    f"dica(s) e ganhou {result['points']} ponto(s)!",
+                    ephemeral=True,
+                )
+                return
+            if result["status"] in ("correct", "already_won"):
+                await ctx.send("Você já acertou o operador de hoje! Volte amanhã.", ephemeral=True)
+                return
+            if result["status"] == "unknown":
+                await ctx.send(
+                    f"Operador '{guess}' não encontrado. Confira o nome e tente novamente!",
+                    ephemeral=True,
+                )
+                return
+            feedback = format_feedback(table, guess_index, table.find(operator["name"]))
+            if result["status"] == "incorrect":
+                await send_hint(ctx, result["hint_field"], result["hint_value"], feedback)
+            else:
+                await send_no_more_hints(ctx, feedback)
+        except Exception as e:
+            logging.error(f"Erro inesperado no comando arkdle_daily_guess: {e}")
+            try:
+                await ctx.send(
+                    "Ocorreu um erro ao processar seu palpite. Tente novamente mais tarde.",
+                    ephemeral=True,
+                )
+            except Exception:
+                pass
+
+    @arkdle_daily_guess.autocomplete("guess")
+    async def guess_autocomplete(self, ctx: interactions.AutocompleteContext):
+        """Sugere nomes de operadores conforme o usuário digita."""
+        names = get_name_index(include_aliases=False).suggest(ctx.input_text or "")
+        await ctx.send(choices=[{"name": name, "value": name} for name in names])
+
+
+def setup(client):
+    return ArkdleDaily(client)
@@ -1,41 +1,92 @@
+import asyncio
+import io
 import os
 import random
+from datetime import datetime
 import interactions
-from constants import ORIGINAL_IMAGES_FOLDER, OBSCURED_IMAGES_FOLDER
-from utils import load_alternative_names
+from constants import (
+    ORIGINAL_IMAGES_FOLDER, ERROR_MESSAGES, GUESS_WHO_ROUND_SECONDS,
+    GUESS_WHO_POINTS, GUESS_WHO_SPEED_TOP
+)
+from bot_types import PreparedRound
+from exceptions import GameError, InvalidGameStateError
+from utils import file_signature, list_operator_images
+from alias_index import alias_index
 from scores import load_scores, save_scores
 from image_utils import obscure_image
+from silhouette_index import filter_quality_images, load_silhouette_index
+from silhouette_atlas import get_silhouette_atlas
+from image_dedup import filter_duplicate_images, load_dedup_catalog
+from round_prefetch import RoundPrefetcher
+from round_store import round_key
+from guess_ingest import GuessBatcher
+from user_cache import user_cache
+from game_state import GUESS_WHO, game_state, speed_points
+from match import match_manager
+from timer_wheel import KeyedTimers, timer_wheel
+from data_bundle import catalog_folders, catalog_images
+from selection import selection_scheduler
+from name_index import get_name_index, resolve_guess
+from rate_limit import rate_limited
 from observability import observability, log_command_usage, monitor_performance
 
-# Global state for the current round (should be improved for production)
-round_state = {"answers": {}, "current_operator": None, "correct_answer": None}
-
-
-def reset_round():
-    round_state["answers"] = {}
-    round_state["current_operator"] = None
-    round_state["correct_answer"] = None
-
-
 # Helper functions for GuessWhoGame
 
 
 # Helper for getting operator folders
 def get_operator_folders(base_path):
+    folders = catalog_folders(base_path)
+    if folders is not None:
+        return folders
     return [
         d for d in os.listdir(base_path) if os.path.isdir(os.path.join(base_path, d))
     ]
 
 
+# Sorted operator folders per base path, with the folder signature they were listed at
+_folder_lists = {}
+
+
+# Helper for getting the sorted operator folders and a version that changes with them
+# (adding or removing a folder changes the base folder's mtime), so the shuffle bag is
+# only reconciled when the pool actually changes
+def get_operator_pool(base_path):
+    version = file_signature(base_path)
+    cached = _folder_lists.get(base_path)
+    if cached is None or cached[0] != version:
+        cached = _folder_lists[base_path] = (version, sorted(get_operator_folders(base_path)))
+    return cached
+
+
 # Helper for getting valid images in a folder
 def get_operator_images(folder_path):
-    return [
-        f
-        for f in os.listdir(folder_path)
-        if f.lower().endswith((".png", ".jpg", ".jpeg"))
-        and "_e2" not in f.lower()
-        and "_skin" not in f.lower()
-    ]
+    base_path, folder = os.path.split(folder_path)
+    images = catalog_images(base_path, folder)
+    if images is not None:
+        return images
+    return list_operator_images(folder_path)
+
+
+# Helper for picking the guild's next operator from its shuffle bag, skipping those
+# without an image above the quality bar and keeping one representative per cluster
+# of near-duplicate images
+def choose_playable_operator(base_path, subfolders, guild_id=None, version=None):
+    index = load_silhouette_index()
+    catalog = load_dedup_catalog()
+    playable = {}
+
+    def has_images(folder):
+        images = get_operator_images(os.path.join(base_path, folder))
+        images = filter_quality_images(folder, images, index)
+        playable[folder] = filter_duplicate_images(folder, images, catalog)
+        return bool(playable[folder])
+
+    # With a version the folders come sorted from get_operator_pool
+    pool = subfolders if version is not None else sorted(subfolders)
+    folder = selection_scheduler.draw(guild_id, "guess_who", pool, accept=has_images, version=version)
+    if folder is None:
+        return None, []
+    return folder, playable[folder]
 
 
 # Helper for choosing a random image
@@ -48,87 +99,126 @@ def choose_operator_image(images):
     return chosen_image, random_name
 
 
-# Helper for preparing the obscured image
+# Helper for rendering the obscured image in memory (rounds of several guilds render
+# at once in worker threads, so nothing is written to a shared folder)
 @monitor_performance("prepare_obscured_image")
-def prepare_obscured_image(original_path, dest_folder, random_name):
+def prepare_obscured_image(original_path):
     try:
-        if os.path.exists(dest_folder):
-            for f in os.listdir(dest_folder):
-                if f.lower().endswith((".png", ".jpg", ".jpeg")):
-                    try:
-                        os.remove(os.path.join(dest_folder, f))
-                    except Exception as e:
-                        observability.logger.error(
-                            f"Error removing old image: {f}",
-                            file=f,
-                            error=str(e)
-                        )
-        else:
-            os.makedirs(dest_folder)
-        output_path = os.path.join(dest_folder, random_name)
-        obscure_image(original_path, output_path)
-        return output_path
+        buffer = io.BytesIO()
+        obscure_image(original_path, buffer)
+        return buffer.getvalue()
     except Exception as e:
         observability.error_tracker.track_error(e, {
             'operation': 'prepare_obscured_image',
-            'original_path': original_path,
-            'dest_folder': dest_folder
+            'original_path': original_path
         })
         raise
 
 
-# Helper for updating round state
-def update_round_state(chosen_folder, output_path):
-    alternative_names = load_alternative_names()
-    key = chosen_folder.lower()
-    if key in alternative_names:
-        round_state["correct_answer"] = alternative_names[key]
-    else:
-        round_state["correct_answer"] = [key]
-    round_state["current_operator"] = output_path
-    round_state["answers"] = {}
+# Helper for getting the obscured image, sliced from the atlas when it has been built
+def render_round_image(chosen_folder, chosen_image, random_name):
+    file_name = f"{os.path.splitext(random_name)[0]}.png"
+    atlas = get_silhouette_atlas()
+    if atlas is not None and (chosen_folder, chosen_image) in atlas:
+        image_ref = f"atlas:{chosen_folder}/{chosen_image}"
+        return atlas.encode_png(chosen_folder, chosen_image), file_name, image_ref
+    original_path = os.path.join(ORIGINAL_IMAGES_FOLDER, chosen_folder, chosen_image)
+    return prepare_obscured_image(original_path), file_name, original_path
+
+
+# Helper for starting the round of a channel
+def update_round_state(key, chosen_folder, image_ref, competitive=False, match_id=None):
+    game_state.start_guess_who_round(
+        key,
+        chosen_folder,
+        list(alias_index.aliases_for(chosen_folder)),
+        alias_index.answer_set(chosen_folder),
+        image_ref,
+        competitive,
+        match_id,
+    )
+
+
+# Selects and renders one round; blocking, so it runs in a worker thread
+@monitor_performance("prepare_round")
+def prepare_round(guild_id=None):
+    base_path = ORIGINAL_IMAGES_FOLDER
+    version, subfolders = get_operator_pool(base_path)
+    if not subfolders:
+        observability.logger.error("No operator folder found in 'Original Images'.")
+        raise GameError(ERROR_MESSAGES["NO_OPERATORS"])
+
+    chosen_folder, images = choose_playable_operator(base_path, subfolders, guild_id, version)
+    if not images:
+        observability.logger.error("No operator folder has a valid image above the quality bar.")
+        raise GameError(ERROR_MESSAGES["NO_IMAGES"])
+
+    chosen_image, random_name = choose_operator_image(images)
+    image_bytes, file_name, image_ref = render_round_image(chosen_folder, chosen_image, random_name)
+    return PreparedRound(chosen_folder, image_bytes, file_name, image_ref)
+
+
+# Ready-to-play rounds per guild, refilled in the background whenever a round starts
+prefetcher = RoundPrefetcher("guess_who", prepare_round)
+
+
+# Auto-reveal deadline of each channel's round
+reveal_timers = KeyedTimers(timer_wheel)
+
+
+def schedule_auto_reveal(client, key, delay=GUESS_WHO_ROUND_SECONDS):
+    reveal_timers.schedule(key, delay, auto_reveal, client, key)
+
+
+# Rounds revealed by hand (or dropped) no longer need their deadline
+def cancel_auto_reveal(event, game, key, data):
+    if event == "round_ended" and game == GUESS_WHO:
+        reveal_timers.cancel(key)
+
+
+game_state.subscribe(cancel_auto_reveal)
 
 
 @monitor_performance("start_new_round")
-async def start_new_round(ctx):
+async def start_new_round(ctx, client, competitive=False):
     try:
-        if round_state["current_operator"]:
-            await ctx.send("Já há uma rodada em andamento!", ephemeral=True)
+        key = round_key(ctx)
+        if match_manager.get(key):
+            await ctx.send("Há uma partida em andamento neste canal!", ephemeral=True)
             return
-        
-        base_path = ORIGINAL_IMAGES_FOLDER
-        subfolders = get_operator_folders(base_path)
-        if not subfolders:
-            observability.logger.error("No operator folder found in 'Original Images'.")
-            await ctx.send("Erro: Nenhuma pasta de operador encontrada.", ephemeral=True)
+        if game_state.get_guess_who_round(key):
+            await ctx.send("Já há uma rodada em andamento!", ephemeral=True)
             return
         
-        chosen_folder = random.choice(subfolders)
-        folder_path = os.path.join(base_path, chosen_folder)
-        images = get_operator_images(folder_path)
-        if not images:
-            observability.logger.error(f"No valid image found in folder '{chosen_folder}'.")
-            await ctx.send(f"Erro: Nenhuma imagem válida encontrada na pasta '{chosen_folder}'.", ephemeral=True)
+        guild_id = key[0]
+        prepared = prefetcher.pop(guild_id)
+        if prepared is None:
+            try:
+                prepared = await asyncio.to_thread(prepare_round, guild_id)
+            except GameError as e:
+                await ctx.send(f"Erro: {e}", ephemeral=True)
+                return
+        try:
+            update_round_state(key, prepared.operator, prepared.image_ref, competitive)
+        except InvalidGameStateError:
+            # Another admin started a round in this channel while this one was rendering
+            await ctx.send("Já há uma rodada em andamento!", ephemeral=True)
             return
-        
-        chosen_image, random_name = choose_operator_image(images)
-        original_path = os.path.join(folder_path, chosen_image)
-        dest_folder = os.path.join(OBSCURED_IMAGES_FOLDER, chosen_folder)
-        output_path = prepare_obscured_image(original_path, dest_folder, random_name)
-        update_round_state(chosen_folder, output_path)
+        prefetcher.refill(guild_id)
+        schedule_auto_reveal(client, key)
         
         observability.logger.info(
             "Started new guess_who round",
-            operator=chosen_folder,
+            operator=prepared.operator,
             user_id=str(ctx.author.id),
-            guild_id=str(ctx.guild.id) if ctx.guild else None
+            guild_id=guild_id,
+            channel_id=key[1]
         )
         
-        with open(output_path, "rb") as f:
-            await ctx.send(
-                "Quem é esse operador?",
-                files=interactions.File(f, file_name=random_name),
-            )
+        await ctx.send(
+            "Quem é esse operador? Valendo pontos por velocidade!" if competitive else "Quem é esse operador?",
+            files=interactions.File(io.BytesIO(prepared.image_bytes), file_name=prepared.file_name),
+        )
     except Exception as e:
         observability.error_tracker.track_error(e, {
             'operation': 'start_new_round',
@@ -138,60 +228,155 @@ async def start_new_round(ctx):
         await ctx.send("Ocorreu um erro ao iniciar a rodada. Tente novamente.", ephemeral=True)
 
 
+# Resolves a batch of raw guesses (each distinct text once) and records them in one go;
+# guesses made in an earlier round of the channel get None instead of being recorded
+def evaluate_guesses(key, guesses):
+    game_round = game_state.get_guess_who_round(key)
+    round_id = game_round.round_id if game_round else None
+    current = [queued for queued in guesses if queued.round_id == round_id]
+    resolved = {}
+    for queued in current:
+        if queued.guess not in resolved:
+            resolved[queued.guess] = resolve_guess(queued.guess)
+    accepted = iter(game_state.submit_guess_who_answers(
+        key, [(queued.user_id, resolved[queued.guess], queued.arrived_at) for queued in current]
+    ) if current else ())
+    return [next(accepted) if queued.round_id == round_id else None for queued in guesses]
+
+
+# Guesses are queued per round and evaluated in micro-batches during bursts
+guess_batcher = GuessBatcher("guess_who", evaluate_guesses)
+
+
 async def register_answer(ctx, palpite):
-    if round_state["current_operator"] is None:
+    key = round_key(ctx)
+    user_id = str(ctx.author.id)
+    game_round = game_state.get_guess_who_round(key)
+    if game_round is None:
         await ctx.send("No round in progress.", ephemeral=True)
         return
-    user_id = str(ctx.author.id)
-    if user_id in round_state["answers"]:
+    if game_state.has_answered(key, user_id):
+        await ctx.send("Você já respondeu a esta rodada!", ephemeral=True)
+        return
+    # The reveal will need this player's name and mention; keep them while they are at hand
+    user_cache.remember(ctx.author)
+    try:
+        accepted = await guess_batcher.submit(key, user_id, palpite, game_round.round_id)
+    except InvalidGameStateError:
+        await ctx.send("No round in progress.", ephemeral=True)
+        return
+    if accepted is None:
+        await ctx.send("A rodada terminou antes do seu palpite ser registrado.", ephemeral=True)
+        return
+    if not accepted:
         await ctx.send("Você já respondeu a esta rodada!", ephemeral=True)
         return
-    round_state["answers"][user_id] = palpite.lower()
     await ctx.send("Palpite registrado com sucesso!", ephemeral=True)
 
 
+# Points of each winner of an ended round and the reveal message
+def score_results(results, users):
+    msg = f"O operador era **{results['round'].correct_answer[0].capitalize()}**!\n"
+    if not results["winners"]:
+        return {}, msg + "Ninguém acertou desta vez."
+    if results["round"].competitive:
+        # Every winner scores by their own time; the ranking only picks who is shown
+        points = {
+            user_id: speed_points(elapsed)
+            for user_id, elapsed in zip(results["winners"], results["winner_times"])
+        }
+        msg += "Mais rápidos:\n" + "\n".join(
+            f"{position}. {users[user_id].mention} — {elapsed:.1f}s (+{points[user_id]})"
+            for position, (user_id, elapsed) in enumerate(results["ranking"], 1)
+        )
+        others = len(results["winners"]) - len(results["ranking"])
+        if others:
+            msg += f"\nMais {others} acerto(s), pontuados pelo tempo de cada um."
+    else:
+        points = {user_id: GUESS_WHO_POINTS for user_id in results["winners"]}
+        msg += "Respostas corretas: " + ", ".join(users[user_id].mention for user_id in results["winners"])
+    return points, msg
+
+
+# Awards the winners of an ended round and builds the reveal message
+async def settle_round(results, client):
+    users = await user_cache.resolve(client, results["winners"])
+    points, msg = score_results(results, users)
+    if not points:
+        return msg
+    scores = load_scores()
+    for user_id, pontos in points.items():
+        user = users[user_id]
+        if user_id in scores:
+            scores[user_id]["pontos"] += pontos
+            if user.name:
+                scores[user_id]["username"] = user.name
+        else:
+            scores[user_id] = {"username": user.name or user_id, "pontos": pontos}
+    save_scores(scores)
+    return msg + "\nPontuação atualizada!"
+
+
 async def reveal_operator(ctx, client):
-    if round_state["current_operator"] is None:
+    key = round_key(ctx)
+    if match_manager.get(key):
+        await ctx.send("As rodadas da partida são reveladas automaticamente.", ephemeral=True)
+        return
+    guess_batcher.flush(key)
+    try:
+        results = game_state.end_guess_who_round(key, top=GUESS_WHO_SPEED_TOP)
+    except InvalidGameStateError:
         await ctx.send("No round in progress.", ephemeral=True)
         return
-    winners = []
-    for user_id, guess in round_state["answers"].items():
-        if guess in round_state["correct_answer"]:
-            user = await client.fetch_user(int(user_id))
-            winners.append((user_id, user))
-    msg = f"O operador era **{round_state['correct_answer'][0].capitalize()}**!\n"
-    if winners:
-        msg += "Respostas corretas: " + ", ".join(user.mention for _, user in winners)
-        scores = load_scores()
-        for user_id, user in winners:
-            if user_id in scores:
-                scores[user_id]["pontos"] += 10
-                scores[user_id]["username"] = str(user)
-            else:
-                scores[user_id] = {"username": str(user), "pontos": 10}
-        save_scores(scores)
-        msg += "\nPontuação atualizada!"
-    else:
-        msg += "Ninguém acertou desta vez."
-    await ctx.send(msg)
-    reset_round()
+    await ctx.send(await settle_round(results, client))
 
 
+async def auto_reveal(client, key):
+    guess_batcher.flush(key)
+    try:
+        results = game_state.end_guess_who_round(key, top=GUESS_WHO_SPEED_TOP)
+    except InvalidGameStateError:
+        return
+    observability.logger.info("Guess Who round timed out", guild_id=key[0], channel_id=key[1])
+    msg = await settle_round(results, client)
+    channel = await client.fetch_channel(int(key[1]))
+    await channel.send(f"Tempo esgotado! {msg}")
+
+
+# Deadlines of rounds restored after a restart, counted from when they started
+def schedule_restored_reveals(client):
+    now = datetime.now()
+    for game, key, game_round in game_state.iter_rounds():
+        # Match rounds are ended by the match extension, since their match did not survive
+        if game != GUESS_WHO or key in reveal_timers or game_round.match_id:
+            continue
+        elapsed = (now - datetime.fromisoformat(game_round.start_time)).total_seconds()
+        schedule_auto_reveal(client, key, max(GUESS_WHO_ROUND_SECONDS - elapsed, 0))
 
 
 class GuessWhoGame(interactions.Extension):
     def __init__(self, client):
         self.client = client
 
+    @interactions.listen(interactions.events.Startup)
+    async def on_startup(self):
+        schedule_restored_reveals(self.client)
+
     @interactions.slash_command(
         name="guess_who",
         description="Inicia uma nova rodada (apenas para admins/mods)",
         default_member_permissions=interactions.Permissions.ADMINISTRATOR
         | interactions.Permissions.MANAGE_GUILD,
     )
+    @interactions.slash_option(
+        name="competitivo",
+        description="Acertos mais rápidos valem mais pontos.",
+        opt_type=interactions.OptionType.BOOLEAN,
+        required=False,
+    )
     @log_command_usage("guess_who")
-    async def guess_who(self, ctx: interactions.SlashContext):
-        await start_new_round(ctx)
+    async def guess_who(self, ctx: interactions.SlashContext, competitivo: bool = False):
+        await start_new_round(ctx, self.client, competitivo)
 
     @interactions.slash_command(
         name="guess_who_guess", description="Dê seu palpite para a rodada atual."
@@ -201,11 +386,18 @@ class GuessWhoGame(interactions.Extension):
         description="Seu palpite para o operador",
         opt_type=interactions.OptionType.STRING,
         required=True,
+        autocomplete=True,
     )
     @log_command_usage("guess_who_guess")
+    @rate_limited("guess_who_guess")
     async def answer(self, ctx: interactions.SlashContext, palpite: str):
         await register_answer(ctx, palpite)
 
+    @answer.autocomplete("palpite")
+    async def answer_autocomplete(self, ctx: interactions.AutocompleteContext):
+        names = get_name_index().suggest(ctx.input_text or "")
+        await ctx.send(choices=[{"name": name, "value": name} for name in names])
+
     @interactions.slash_command(
         name="revelar",
         description="Revela o operador correto e atualiza a pontuação (apenas para admins/mods)",
@@ -0,0 +1,295 @@
+import asyncio
+import io
+import interactions
+from constants import (
+    MATCH_DEFAULT_ROUNDS, MATCH_MAX_ROUNDS, MATCH_DEFAULT_ROUND_SECONDS, MATCH_MIN_ROUND_SECONDS,
+    MATCH_MAX_ROUND_SECONDS, MATCH_STANDINGS_TOP, GUESS_WHO_SPEED_TOP
+)
+from exceptions import GameError, InvalidGameStateError
+from game_state import ARKDLE, GUESS_WHO, game_state
+from hint_planner import get_hint_plan
+from match import MIXED, match_manager, plan_games
+from round_store import round_key
+from timer_wheel import KeyedTimers, timer_wheel
+from user_cache import user_cache
+from commands.guess_who import guess_batcher, prefetcher, prepare_round, score_results, update_round_state
+from commands.arkdle import select_operator
+from observability import observability, log_command_usage
+
+
+# Deadline of the current round of each match
+round_timers = KeyedTimers(timer_wheel)
+
+
+def format_standings(match, title="Placar da partida"):
+    """Placar da partida com os melhores colocados."""
+    standings = match.standings(MATCH_STANDINGS_TOP)
+    if not standings:
+        return f"**{title}:** ninguém pontuou ainda."
+    lines = [
+        f"{position}. <@{user_id}> — {points} ponto(s)"
+        for position, (user_id, points) in enumerate(standings, 1)
+    ]
+    return f"**{title}:**\n" + "\n".join(lines)
+
+
+async def prepare_upcoming(match):
+    """
+    Seleciona (e renderiza) o conteúdo da próxima rodada enquanto a atual é jogada.
+    O conteúdo fica marcado com o índice da rodada: se a partida avançar durante a
+    espera, ele é descartado em vez de cair numa rodada de outro jogo.
+    """
+    guild_id = match.key[0]
+    index, game = match.index + 1, match.next_game
+    try:
+        if game == GUESS_WHO:
+            content = prefetcher.pop(guild_id) or await asyncio.to_thread(prepare_round, guild_id)
+            prefetcher.refill(guild_id)
+        elif game == ARKDLE:
+            content = (await asyncio.to_thread(select_operator, guild_id=guild_id))[0]
+        else:
+            return
+    except Exception as e:
+        # The next round tries again when it starts
+        observability.error_tracker.track_error(e, {'operation': 'prepare_match_round'})
+        return
+    match.stage(index, content)
+
+
+async def start_match_round(match, channel):
+    """Inicia a rodada atual da partida com o conteúdo já preparado."""
+    key, guild_id = match.key, match.key[0]
+    prepared = match.take_upcoming()
+    header = f"**Rodada {match.index + 1}/{len(match.games)}**"
+    if match.current_game == GUESS_WHO:
+        if prepared is None:
+            prepared = prefetcher.pop(guild_id) or await asyncio.to_thread(prepare_round, guild_id)
+        update_round_state(key, prepared.operator, prepared.image_ref, match.competitive, match.match_id)
+        await channel.send(
+            f"{header} — Quem é esse operador? Use /guess_who_guess para responder.",
+            files=interactions.File(io.BytesIO(prepared.image_bytes), file_name=prepared.file_name),
+        )
+    else:
+        chosen = prepared or (await asyncio.to_thread(select_operator, guild_id=guild_id))[0]
+        if chosen is None:
+            raise GameError("Nenhum operador disponível para o Arkdle.")
+        hint_fields = get_hint_plan(chosen["name"]).fields
+        game_state.start_arkdle_round(key, chosen, hint_fields, match.match_id)
+        await channel.send(
+            f"{header} — Arkdle! Dica: {hint_fields[0].capitalize()} é "
+            f"'{chosen.get(hint_fields[0], 'Unknown')}'. Use /arkdle_guess para fazer um palpite."
+        )
+
+
+async def play_next_round(client, key):
+    """Avança a partida: inicia a próxima rodada ou encerra a partida após a última."""
+    match = match_manager.get(key)
+    if match is None:
+        return
+    try:
+        channel = await client.fetch_channel(int(key[1]))
+        if match.advance() is None:
+            finish_match(key)
+            await channel.send("🏁 Fim da partida!\n" + format_standings(match, "Placar final"))
+            return
+        await start_match_round(match, channel)
+        round_timers.schedule(key, match.round_seconds, end_match_round, client, key)
+    except Exception as e:
+        await abort_match(client, key, e, "start_match_round")
+        return
+    # The next round is selected and rendered while this one is played, so the transition is instant
+    await prepare_upcoming(match)
+
+
+async def end_match_round(client, key):
+    """Encerra a rodada atual no prazo, soma os pontos no placar da partida e segue para a próxima."""
+    match = match_manager.get(key)
+    if match is None:
+        return
+    try:
+        try:
+            if match.current_game == GUESS_WHO:
+                guess_batcher.flush(key)
+                results = game_state.end_guess_who_round(key, top=GUESS_WHO_SPEED_TOP)
+                users = await user_cache.resolve(client, results["winners"])
+                points, msg = score_results(results, users)
+                for user_id, pontos in points.items():
+                    match.award(user_id, pontos, users[user_id].name)
+            else:
+                arkdle_round = game_state.end_arkdle_round(key)
+                msg = (
+                    f"O operador era **{arkdle_round.current_operator}**! "
+                    f"{len(arkdle_round.winners)} jogador(es) acertaram."
+                )
+        except InvalidGameStateError:
+            msg = "Rodada encerrada."
+        channel = await client.fetch_channel(int(key[1]))
+        await channel.send(f"⏱️ Tempo esgotado! {msg}\n{format_standings(match)}")
+    except Exception as e:
+        await abort_match(client, key, e, "end_match_round")
+        return
+    await play_next_round(client, key)
+
+
+async def abort_match(client, key, error, operation):
+    """
+    Encerra a partida após uma falha numa transição (as transições rodam em timers, sem
+    ninguém para tratar o erro): a rodada em andamento é encerrada e os pontos já
+    feitos entram no ranking.
+    """
+    observability.error_tracker.track_error(error, {'operation': operation, 'channel_id': key[1]})
+    match = match_manager.get(key)
+    if match is None:
+        return
+    end_current_round(key, match.current_game)
+    try:
+        finish_match(key)
+        channel = await client.fetch_channel(int(key[1]))
+        await channel.send(
+            "Erro na partida; ela foi encerrada.\n" + format_standings(match, "Placar final")
+        )
+    except Exception as e:
+        observability.error_tracker.track_error(e, {'operation': 'abort_match', 'channel_id': key[1]})
+
+
+def finish_match(key):
+    """Encerra a partida e grava o placar dela na pontuação geral, de uma só vez."""
+    round_timers.cancel(key)
+    return match_manager.finish(key)
+
+
+def end_current_round(key, game):
+    try:
+        if game == GUESS_WHO:
+            guess_batcher.flush(key)
+            game_state.end_guess_who_round(key)
+        elif game == ARKDLE:
+            game_state.end_arkdle_round(key)
+    except InvalidGameStateError:
+        pass
+
+
+async def end_orphaned_rounds(client):
+    """
+    Encerra as rodadas restauradas após um reinício cuja partida se perdeu (as partidas
+    vivem só na memória): sem a partida, ninguém encerraria a rodada nem somaria os pontos.
+    """
+    orphaned = [
+        (game, key) for game, key, game_round in game_state.iter_rounds()
+        if game_round.match_id
+        and getattr(match_manager.get(key), "match_id", None) != game_round.match_id
+    ]
+    for game, key in orphaned:
+        end_current_round(key, game)
+        try:
+            channel = await client.fetch_channel(int(key[1]))
+            await channel.send(
+                "A partida deste canal foi interrompida por um reinício do bot; a rodada foi encerrada."
+            )
+        except Exception as e:
+            observability.error_tracker.track_error(e, {'operation': 'end_orphaned_round', 'channel_id': key[1]})
+    return len(orphaned)
+
+
+class MatchGame(interactions.Extension):
+    def __init__(self, client):
+        self.client = client
+
+    @interactions.listen(interactions.events.Startup)
+    async def on_startup(self):
+        await end_orphaned_rounds(self.client)
+
+    @interactions.slash_command(
+        name="partida",
+        description="Inicia uma partida de várias rodadas (apenas para admins/mods)",
+        default_member_permissions=interactions.Permissions.ADMINISTRATOR
+        | interactions.Permissions.MANAGE_GUILD,
+    )
+    @interactions.slash_option(
+        name="rodadas",
+        description="Número de rodadas.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=False,
+        min_value=1,
+        max_value=MATCH_MAX_ROUNDS,
+    )
+    @interactions.slash_option(
+        name="jogo",
+        description="Jogo das rodadas (misto alterna Guess Who e Arkdle).",
+        opt_type=interactions.OptionType.STRING,
+        required=False,
+        choices=[
+            interactions.SlashCommandChoice(name="Misto", value=MIXED),
+            interactions.SlashCommandChoice(name="Guess Who", value=GUESS_WHO),
+            interactions.SlashCommandChoice(name="Arkdle", value=ARKDLE),
+        ],
+    )
+    @interactions.slash_option(
+        name="tempo",
+        description="Segundos de cada rodada.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=False,
+        min_value=MATCH_MIN_ROUND_SECONDS,
+        max_value=MATCH_MAX_ROUND_SECONDS,
+    )
+    @interactions.slash_option(
+        name="competitivo",
+        description="Nas rodadas de Guess Who, acertos mais rápidos valem mais pontos.",
+        opt_type=interactions.OptionType.BOOLEAN,
+        required=False,
+    )
+    @log_command_usage("partida")
+    async def partida(self, ctx: interactions.SlashContext, rodadas: int = MATCH_DEFAULT_ROUNDS,
+                      jogo: str = MIXED, tempo: int = MATCH_DEFAULT_ROUND_SECONDS,
+                      competitivo: bool = False):
+        await ctx.defer()
+        key = round_key(ctx)
+        if game_state.get_guess_who_round(key) or game_state.get_arkdle_round(key):
+            await ctx.send("Termine a rodada em andamento antes de iniciar uma partida.")
+            return
+        try:
+            match = match_manager.start(key, plan_games(rodadas, jogo), tempo, competitivo)
+        except InvalidGameStateError:
+            await ctx.send("Já há uma partida em andamento neste canal!")
+            return
+        await prepare_upcoming(match)
+        await ctx.send(
+            f"Partida de {rodadas} rodada(s) começando! Cada rodada dura {tempo} segundos; "
+            "os pontos entram no ranking ao fim da partida."
+        )
+        await play_next_round(self.client, key)
+
+    @interactions.slash_command(
+        name="partida_placar", description="Mostra o placar da partida em andamento."
+    )
+    @log_command_usage("partida_placar")
+    async def partida_placar(self, ctx: interactions.SlashContext):
+        match = match_manager.get(round_key(ctx))
+        if match is None:
+            await ctx.send("Não há partida em andamento neste canal.", ephemeral=True)
+            return
+        await ctx.send(
+            f"Rodada {match.index + 1}/{len(match.games)}\n" + format_standings(match),
+            ephemeral=True,
+        )
+
+    @interactions.slash_command(
+        name="partida_cancelar",
+        description="Cancela a partida em andamento, descartando os pontos dela (apenas para admins/mods)",
+        default_member_permissions=interactions.Permissions.ADMINISTRATOR
+        | interactions.Permissions.MANAGE_GUILD,
+    )
+    @log_command_usage("partida_cancelar")
+    async def partida_cancelar(self, ctx: interactions.SlashContext):
+        key = round_key(ctx)
+        match = match_manager.remove(key)
+        if match is None:
+            await ctx.send("Não há partida em andamento neste canal.", ephemeral=True)
+            return
+        round_timers.cancel(key)
+        end_current_round(key, match.current_game)
+        await ctx.send("Partida cancelada; os pontos dela foram descartados.")
+
+
+def setup(client):
+    return MatchGame(client)
@@ -8,15 +8,64 @@ OBSCURED_IMAGES_FOLDER = "Imagens Ofuscadas"
 OPERATORS_JSON_PATH = "data/operators_structured.json"
 SCORES_JSON_PATH = "data/scores.json"
 ALTERNATIVE_NAMES_PATH = "data/alternative_names.json"
+SILHOUETTE_INDEX_PATH = "data/silhouette_index.json"
+SILHOUETTE_ATLAS_PATH = "data/silhouette_atlas.bin"
+SILHOUETTE_ATLAS_INDEX_PATH = "data/silhouette_atlas.json"
+IMAGE_DEDUP_PATH = "data/image_dedup.json"
+DATA_BUNDLE_PATH = "data/data_bundle.pkl"
+SELECTION_STATE_PATH = "data/selection_state.json"
+ROUND_JOURNAL_PATH = "data/round_journal.jsonl"
+ROUND_SNAPSHOT_PATH = "data/round_snapshot.json"
 
 # Image processing
 SUPPORTED_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
 EXCLUDED_IMAGE_PATTERNS = ("_e2", "_skin")
 IMAGE_PROCESSING_THRESHOLD = 0.05  # Minimum area threshold for image processing
+SILHOUETTE_MIN_FOREGROUND_RATIO = 0.08  # Below this the silhouette is too small to guess
+SILHOUETTE_MAX_FOREGROUND_RATIO = 0.90  # Above this the background was not white
+IMAGE_HASH_SIZE = 8  # Perceptual hashes are IMAGE_HASH_SIZE**2 bits
+IMAGE_DEDUP_MAX_DISTANCE = 6  # Max Hamming distance between near-duplicate hashes
+
+# Data reloading
+DATA_RELOAD_CHECK_INTERVAL = 30.0  # Seconds between checks for changed data files
 
 # Game configuration
 GUESS_WHO_POINTS = 10
+# Competitive Guess Who: every correct answer scores by its own time, halving every half-life
+# after the start, down to the minimum; only the fastest ones are listed in the reveal
+GUESS_WHO_SPEED_MAX_POINTS = 20
+GUESS_WHO_SPEED_MIN_POINTS = 2
+GUESS_WHO_SPEED_HALF_LIFE_SECONDS = 30
+GUESS_WHO_SPEED_TOP = 10
 ARKDLE_BASE_POINTS = 30
+ROUND_PREFETCH_DEPTH = 2  # Ready rounds kept per guild
+ROUND_PREFETCH_MAX_GUILDS = 256
+ROUND_STORE_MAX_ROUNDS = 4096  # Concurrent rounds kept per game (one per guild channel)
+ROUND_STORE_IDLE_SECONDS = 6 * 60 * 60  # Rounds untouched this long are dropped
+GUESS_WHO_ROUND_SECONDS = 10 * 60  # Guess Who rounds are revealed automatically after this
+ARKDLE_ROUND_SECONDS = 2 * 60 * 60  # Arkdle rounds expire after this
+ARKDLE_GUESS_COOLDOWN_SECONDS = 3  # Wait between wrong Arkdle guesses of a player
+GUESS_BATCH_MAX_SIZE = 100  # Queued Guess Who guesses that are evaluated at once
+GUESS_BATCH_MAX_DELAY_SECONDS = 0.05  # Longest a guess waits for others to join its batch
+USER_CACHE_TTL_SECONDS = 60 * 60  # Names and mentions of players are reused this long
+USER_CACHE_MAX_SIZE = 10_000
+USER_FETCH_CONCURRENCY = 8  # Discord user fetches in flight at once during a reveal
+MATCH_DEFAULT_ROUNDS = 5
+MATCH_MAX_ROUNDS = 20
+MATCH_DEFAULT_ROUND_SECONDS = 90  # Time limit of each match round
+MATCH_MIN_ROUND_SECONDS = 20
+MATCH_MAX_ROUND_SECONDS = 600
+MATCH_STANDINGS_TOP = 10  # Players shown in the match leaderboard
+TIMER_WHEEL_TICK_SECONDS = 1.0  # Resolution of round deadlines and cooldowns
+TIMER_WHEEL_SLOTS = 512  # Slots of the timer wheel (one turn = slots * tick seconds)
+ROUND_JOURNAL_FLUSH_EVENTS = 64  # Buffered round events written in one batch
+ROUND_JOURNAL_FLUSH_SECONDS = 1  # Buffered events are also written at least this often
+ROUND_JOURNAL_SNAPSHOT_EVENTS = 1000  # Journaled events between snapshots
+SELECTION_FLUSH_DRAWS = 32  # Unsaved draws that trigger a write of the selection state
+SELECTION_FLUSH_SECONDS = 30  # Unsaved draws are also written at least this often
+# Relative draw weight per star count; every operator still comes up once per cycle,
+# lighter ones just tend to come later in it
+ARKDLE_RARITY_WEIGHTS = {1: 0.5, 2: 0.5, 3: 1.0, 4: 1.0, 5: 1.0, 6: 1.0}
 ARKDLE_HINT_FIELDS = [
     "gender",
     "faction", 
@@ -27,6 +76,24 @@ ARKDLE_HINT_FIELDS = [
     "infection_status"
 ]
 
+# Daily Arkdle
+DAILY_TIMEZONE = "America/Sao_Paulo"  # Day boundary for the daily operator
+DAILY_SCHEDULE_SEED = "priestess-daily"
+DAILY_SCHEDULE_EPOCH = "2024-01-01"  # Day 0 of every guild's schedule
+DAILY_SCHEDULE_DAYS = 180  # Days precomputed ahead of today
+DAILY_NO_REPEAT_DAYS = 60  # An operator never returns within this many days
+
+# Autocomplete
+AUTOCOMPLETE_MAX_CHOICES = 25  # Discord's limit for autocomplete suggestions
+
+# Guess matching
+FUZZY_MATCH_MAX_DISTANCE = 2  # Maximum typos tolerated in a guess (fewer for short names)
+
+# Guess rate limiting, as "<guesses>/<seconds>": the burst allowed, refilled over that time
+GUESS_RATE_LIMIT_USER = "5/10"
+GUESS_RATE_LIMIT_GUILD = "300/10"  # Per guild and command; a round opening brings hundreds of guesses at once
+RATE_LIMIT_MAX_BUCKETS = 100_000  # Buckets kept per scope before the least recently used are dropped
+
 # Discord permissions
 ADMIN_PERMISSIONS = 0x8  # ADMINISTRATOR
 MOD_PERMISSIONS = 0x20   # MANAGE_GUILD
@@ -69,6 +136,11 @@ ENV_CPU_THRESHOLD = "CPU_THRESHOLD"
 ENV_MEMORY_THRESHOLD = "MEMORY_THRESHOLD"
 ENV_DISK_THRESHOLD = "DISK_THRESHOLD"
 ENV_DEBUG_MODE = "DEBUG_MODE"
+ENV_FUZZY_MATCH_MAX_DISTANCE = "FUZZY_MATCH_MAX_DISTANCE"
+ENV_DAILY_TIMEZONE = "DAILY_TIMEZONE"
+ENV_DAILY_SCHEDULE_SEED = "DAILY_SCHEDULE_SEED"
+ENV_GUESS_RATE_LIMIT_USER = "GUESS_RATE_LIMIT_USER"
+ENV_GUESS_RATE_LIMIT_GUILD = "GUESS_RATE_LIMIT_GUILD"
 
 # Error messages
 ERROR_MESSAGES = {
@@ -116,7 +188,12 @@ OPTIONAL_ENV_VARS = [
     ENV_CPU_THRESHOLD,
     ENV_MEMORY_THRESHOLD,
     ENV_DISK_THRESHOLD,
-    ENV_DEBUG_MODE
+    ENV_DEBUG_MODE,
+    ENV_FUZZY_MATCH_MAX_DISTANCE,
+    ENV_DAILY_TIMEZONE,
+    ENV_DAILY_SCHEDULE_SEED,
+    ENV_GUESS_RATE_LIMIT_USER,
+    ENV_GUESS_RATE_LIMIT_GUILD
 ]
 
 # File validation
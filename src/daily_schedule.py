@@ -0,0 +1,161 @@
+"""
+Deterministic daily operator schedule for the Discord bot.
+Every guild gets its own seeded sequence of operators: each cycle is a
+shuffle of the whole roster, adjusted so an operator never comes back within
+the no-repeat window. The sequence is precomputed months ahead, so finding
+"today's operator" is a list lookup, and the same seed always yields the same
+schedule, across restarts and machines.
+"""
+
+import os
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from constants import (
+    DAILY_TIMEZONE, DAILY_SCHEDULE_SEED, DAILY_SCHEDULE_EPOCH, DAILY_SCHEDULE_DAYS,
+    DAILY_NO_REPEAT_DAYS, ENV_DAILY_TIMEZONE, ENV_DAILY_SCHEDULE_SEED
+)
+from logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def load_timezone(name: str) -> ZoneInfo:
+    """
+    Resolve a timezone name, falling back to UTC if it is unknown.
+
+    Args:
+        name: IANA timezone name (e.g. "America/Sao_Paulo")
+
+    Returns:
+        The timezone
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown timezone %r, using UTC for the daily rollover", name)
+        return ZoneInfo("UTC")
+
+
+def schedule_cycles(names: Sequence[str], seed: str, scope: Hashable,
+                    cycles: int, window: int) -> List[str]:
+    """
+    Build the first cycles of a schedule.
+
+    Each cycle is a seeded shuffle of the roster; operators that closed the
+    previous cycle are swapped out of the first window positions, so no
+    operator repeats within window days.
+
+    Args:
+        names: Roster (order does not matter)
+        seed: Schedule seed
+        scope: Schedule owner, usually the guild ID
+        cycles: Number of cycles to build
+        window: No-repeat window in days (clamped to half the roster)
+
+    Returns:
+        One operator per day, starting at day 0
+    """
+    roster = sorted(names)
+    window = min(window, len(roster) // 2)
+    days: List[str] = []
+    for cycle in range(cycles):
+        order = list(roster)
+        random.Random(f"{seed}:{scope}:{cycle}").shuffle(order)
+        if days and window:
+            recent = set(days[-window:])
+            spare = window
+            for i in range(window):
+                if order[i] in recent:
+                    while order[spare] in recent:
+                        spare += 1
+                    order[i], order[spare] = order[spare], order[i]
+                    spare += 1
+        days.extend(order)
+    return days
+
+
+class DailySchedule:
+    """Seeded per-guild schedule of daily operators."""
+
+    def __init__(self, seed: Optional[str] = None, timezone: Optional[str] = None,
+                 epoch: str = DAILY_SCHEDULE_EPOCH, days_ahead: int = DAILY_SCHEDULE_DAYS,
+                 window: int = DAILY_NO_REPEAT_DAYS):
+        """
+        Initialize the schedule. Nothing is computed until the first lookup.
+
+        Args:
+            seed: Schedule seed (defaults to the environment, then the constant)
+            timezone: Timezone whose midnight starts a new day (same defaults)
+            epoch: ISO date of day 0
+            days_ahead: Days precomputed past the requested day
+            window: No-repeat window in days
+        """
+        self.seed = seed or os.getenv(ENV_DAILY_SCHEDULE_SEED, DAILY_SCHEDULE_SEED)
+        self.timezone = load_timezone(timezone or os.getenv(ENV_DAILY_TIMEZONE, DAILY_TIMEZONE))
+        self.epoch = date.fromisoformat(epoch)
+        self.days_ahead = days_ahead
+        self.window = window
+        self._schedules: Dict[Hashable, Tuple[Tuple[str, ...], List[str]]] = {}
+
+    def today(self, now: Optional[datetime] = None) -> date:
+        """Current date in the schedule's timezone."""
+        now = now or datetime.now(self.timezone)
+        return now.astimezone(self.timezone).date()
+
+    def seconds_until_rollover(self, now: Optional[datetime] = None) -> float:
+        """Seconds until the next midnight in the schedule's timezone."""
+        now = (now or datetime.now(self.timezone)).astimezone(self.timezone)
+        tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), self.timezone)
+        return (tomorrow - now).total_seconds()
+
+    def _days(self, scope: Hashable, names: Sequence[str], index: int) -> List[str]:
+        """Precomputed days of a scope covering the index, rebuilt if the roster changed."""
+        roster = names if isinstance(names, tuple) else tuple(names)
+        cached = self._schedules.get(scope)
+        if cached and (cached[0] is roster or cached[0] == roster) and index < len(cached[1]):
+            return cached[1]
+        cycles = (index + self.days_ahead) // len(roster) + 1
+        days = schedule_cycles(roster, self.seed, scope, cycles, self.window)
+        self._schedules[scope] = (roster, days)
+        logger.info("Precomputed %d daily operators for %s", len(days), scope)
+        return days
+
+    def operator_for(self, scope: Hashable, names: Sequence[str],
+                     day: Optional[date] = None) -> Optional[str]:
+        """
+        Operator scheduled for a day.
+
+        Args:
+            scope: Schedule owner, usually the guild ID
+            names: Current roster
+            day: Day to look up (defaults to today)
+
+        Returns:
+            The operator name, or None if the roster is empty or the day is before the epoch
+        """
+        index = ((day or self.today()) - self.epoch).days
+        if not names or index < 0:
+            return None
+        return self._days(scope, names, index)[index]
+
+    def upcoming(self, scope: Hashable, names: Sequence[str], count: int,
+                 start: Optional[date] = None) -> List[Tuple[date, str]]:
+        """
+        The next scheduled operators, e.g. for admins checking the schedule.
+
+        Returns:
+            (day, operator name) pairs starting at start (defaults to today)
+        """
+        start = start or self.today()
+        index = (start - self.epoch).days
+        if not names or index < 0:
+            return []
+        days = self._days(scope, names, index + count)
+        return [(start + timedelta(days=offset), days[index + offset]) for offset in range(count)]
+
+
+# Global daily schedule instance
+daily_schedule = DailySchedule()
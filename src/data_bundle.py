@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Precompiled data bundle for the Discord bot.
+A build step compiles the static data (operator records, normalized names,
+alias lookups, attribute codes and the image catalog) into one versioned
+binary file. At startup the bundle is loaded with a single read and seeds the
+in-memory repositories, so no JSON is parsed or normalized before the bot can
+answer commands. The bundle records a fingerprint of every source, and of the
+code of the modules whose objects it pickles, and is ignored as soon as one
+of them changes.
+
+The bundle is a pickle and is unpickled at startup: only load bundles built
+locally by this script. Files under data/ are trusted, so anyone who can write
+there can run code in the bot.
+
+Scores are not bundled: they change during play and keep their own file.
+
+Usage:
+    python data_bundle.py [--output data/data_bundle.pkl]
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from constants import (
+    OPERATORS_JSON_PATH, ALTERNATIVE_NAMES_PATH, ORIGINAL_IMAGES_FOLDER, DATA_BUNDLE_PATH,
+    ERROR_MESSAGES
+)
+from alias_index import AliasIndex, alias_index
+from exceptions import DataError
+from logging_utils import get_logger
+from operator_repository import OperatorRepository, operator_repository
+from operator_table import OperatorTable, seed_operator_table
+from utils import file_signature, list_operator_images
+
+logger = get_logger(__name__)
+
+BUNDLE_VERSION = 1
+
+# Modules whose code shapes the bundled objects; a change to any of them invalidates the bundle
+BUNDLED_MODULES = ("operator_table", "name_index", "alias_index", "operator_repository", "utils", "data_bundle")
+
+# Image catalog of the loaded bundle: {base path: (mtime, {folder: (mtime, images)})}
+_image_catalog: Dict[str, Tuple[int, Dict[str, Tuple[int, List[str]]]]] = {}
+
+
+def _fingerprint(path: str) -> Optional[Tuple[Tuple[int, int], str]]:
+    """(signature, SHA-256 digest) of a source file, or None if it does not exist."""
+    signature = file_signature(path)
+    if signature is None:
+        return None
+    with open(path, "rb") as f:
+        return signature, hashlib.sha256(f.read()).hexdigest()
+
+
+def code_fingerprint(modules: Tuple[str, ...] = BUNDLED_MODULES) -> str:
+    """SHA-256 digest of the source of the bundled modules."""
+    digest = hashlib.sha256()
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    for module in modules:
+        with open(os.path.join(base_path, f"{module}.py"), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _folder_mtime(path: str) -> Optional[int]:
+    """Modification time of a folder (changes when entries are added or removed)."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def build_image_catalog(base_path: str = ORIGINAL_IMAGES_FOLDER) -> Dict[str, Any]:
+    """
+    List every operator folder and its playable images.
+
+    Returns:
+        {"mtime": base folder mtime, "folders": {folder: (folder mtime, images)}}
+    """
+    folders = {}
+    if os.path.isdir(base_path):
+        for folder in sorted(os.listdir(base_path)):
+            folder_path = os.path.join(base_path, folder)
+            if os.path.isdir(folder_path):
+                folders[folder] = (_folder_mtime(folder_path), list_operator_images(folder_path))
+    return {"mtime": _folder_mtime(base_path), "folders": folders}
+
+
+def build_data_bundle(operators_path: str = OPERATORS_JSON_PATH,
+                      alternative_names_path: str = ALTERNATIVE_NAMES_PATH,
+                      images_path: str = ORIGINAL_IMAGES_FOLDER) -> Dict[str, Any]:
+    """
+    Compile the static data into a bundle.
+
+    Raises:
+        DataError: If the operator data cannot be loaded
+    """
+    operators_source = _fingerprint(operators_path)
+    aliases_source = _fingerprint(alternative_names_path)
+    if operators_source is None:
+        raise DataError(ERROR_MESSAGES["FILE_NOT_FOUND"].format(operators_path))
+
+    repository = OperatorRepository(operators_path, check_interval=0)
+    records = repository.get_operators()
+    if not records:
+        raise DataError(ERROR_MESSAGES["JSON_DECODE_ERROR"].format(operators_path))
+    aliases = AliasIndex(alternative_names_path, check_interval=0)
+
+    return {
+        "version": BUNDLE_VERSION,
+        "code": code_fingerprint(),
+        "created": datetime.now().isoformat(),
+        "sources": {
+            "operators": (operators_path, operators_source),
+            "alternative_names": (alternative_names_path, aliases_source),
+        },
+        "table": OperatorTable(records),
+        "alternative_names": dict(aliases.raw()),
+        "alias_lookups": aliases.lookups(),
+        "image_catalog": (images_path, build_image_catalog(images_path)),
+    }
+
+
+def save_data_bundle(bundle: Dict[str, Any], path: str = DATA_BUNDLE_PATH) -> None:
+    """
+    Write the bundle, replacing any previous one atomically.
+
+    Raises:
+        DataError: If the file cannot be written
+    """
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except Exception as e:
+        error_msg = ERROR_MESSAGES["SAVE_ERROR"].format(e)
+        logger.error("%s", error_msg)
+        raise DataError(error_msg) from e
+
+
+def is_bundle_current(bundle: Dict[str, Any]) -> bool:
+    """Whether every source file still matches the one the bundle was compiled from."""
+    for path, source in bundle["sources"].values():
+        current = file_signature(path)
+        if (source is None) != (current is None) or (source is not None and source[0] != current):
+            return False
+    return True
+
+
+def load_data_bundle(path: str = DATA_BUNDLE_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Read the bundle in a single pass. The file is unpickled, so it must come
+    from a trusted build (see the module docstring).
+
+    Returns:
+        The bundle, or None if it is missing, unreadable, from another format
+        version, built by different code or compiled from source files that
+        have changed since
+    """
+    try:
+        with open(path, "rb") as f:
+            bundle = pickle.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable data bundle %s: %s", path, e)
+        return None
+
+    if not isinstance(bundle, dict) or bundle.get("version") != BUNDLE_VERSION:
+        logger.warning("Ignoring data bundle %s with unsupported version", path)
+        return None
+    if bundle.get("code") != code_fingerprint():
+        logger.info("Data bundle %s was built by other code, falling back to the source files", path)
+        return None
+    if not is_bundle_current(bundle):
+        logger.info("Data bundle %s is stale, falling back to the source files", path)
+        return None
+    return bundle
+
+
+def apply_data_bundle(bundle: Dict[str, Any]) -> None:
+    """Seed the shared repositories and caches from a loaded bundle."""
+    table = bundle["table"]
+    _, (signature, digest) = bundle["sources"]["operators"]
+    operator_repository.seed(table.records, signature, digest)
+    seed_operator_table(table)
+
+    _, aliases_source = bundle["sources"]["alternative_names"]
+    if aliases_source is not None:
+        alias_index.seed(bundle["alternative_names"], bundle["alias_lookups"], *aliases_source)
+
+    images_path, catalog = bundle["image_catalog"]
+    _image_catalog[images_path] = (catalog["mtime"], catalog["folders"])
+
+
+def warm_start(path: str = DATA_BUNDLE_PATH) -> bool:
+    """
+    Load the bundle if it is current and seed the shared data from it.
+
+    Returns:
+        True if the bundle was used, False if the data will be parsed from the sources
+    """
+    start = time.perf_counter()
+    bundle = load_data_bundle(path)
+    if bundle is None:
+        return False
+    apply_data_bundle(bundle)
+    logger.info("Loaded data bundle %s (%d operators) in %.1f ms",
+                path, bundle["table"].size, (time.perf_counter() - start) * 1000)
+    return True
+
+
+def catalog_folders(base_path: str) -> Optional[List[str]]:
+    """
+    Operator folders from the bundled image catalog.
+
+    Returns:
+        Folder names, or None if the catalog does not cover the folder or it changed
+    """
+    cached = _image_catalog.get(base_path)
+    if cached is None or cached[0] != _folder_mtime(base_path):
+        return None
+    return list(cached[1])
+
+
+def catalog_images(base_path: str, folder: str) -> Optional[List[str]]:
+    """
+    Playable images of an operator folder from the bundled image catalog.
+
+    Returns:
+        Image file names, or None if the catalog does not cover the folder or it changed
+    """
+    cached = _image_catalog.get(base_path)
+    entry = cached[1].get(folder) if cached else None
+    if entry is None or entry[0] != _folder_mtime(os.path.join(base_path, folder)):
+        return None
+    return list(entry[1])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Compile the static data into a binary bundle.")
+    parser.add_argument("--operators", default=OPERATORS_JSON_PATH, help="Operator data file")
+    parser.add_argument("--alternative-names", default=ALTERNATIVE_NAMES_PATH, help="Alternative names file")
+    parser.add_argument("--source", default=ORIGINAL_IMAGES_FOLDER, help="Asset library folder")
+    parser.add_argument("--output", default=DATA_BUNDLE_PATH, help="Bundle file to write")
+    args = parser.parse_args(argv)
+
+    bundle = build_data_bundle(args.operators, args.alternative_names, args.source)
+    save_data_bundle(bundle, args.output)
+    folders = bundle["image_catalog"][1]["folders"]
+    print(f"Bundled {bundle['table'].size} operators and {len(folders)} image folders -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
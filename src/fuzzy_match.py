@@ -0,0 +1,173 @@
+"""
+Typo-tolerant name matching for the Discord bot.
+Folds accents and punctuation away and resolves a guess to the closest known
+name with a BK-tree, so a bounded edit-distance search only visits a small
+part of the roster instead of comparing against every name.
+"""
+
+import os
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from constants import FUZZY_MATCH_MAX_DISTANCE, ENV_FUZZY_MATCH_MAX_DISTANCE
+
+
+def fold_name(name: str) -> str:
+    """
+    Fold a name for tolerant comparison: strip accents, lowercase and drop
+    everything that is not a letter or digit ("Ch'en" -> "chen", "Hvít" -> "hvit").
+
+    Args:
+        name: Name to fold
+
+    Returns:
+        Folded name
+    """
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    return "".join(char for char in decomposed.lower() if char.isalnum())
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Edit distance between two strings.
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Stop early once the distance is known to exceed this bound
+
+    Returns:
+        The distance, or max_distance + 1 if it exceeds the bound
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree over folded names using the Levenshtein metric."""
+
+    def __init__(self):
+        # Node: (term, {distance: child node})
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, term: str) -> None:
+        """Insert a term (duplicates are ignored)."""
+        if self._root is None:
+            self._root = (term, {})
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            distance = levenshtein(term, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (term, {})
+                self._size += 1
+                return
+            node = child
+
+    def search(self, term: str, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        Find every term within max_distance of the query.
+
+        Args:
+            term: Query term
+            max_distance: Maximum edit distance
+
+        Returns:
+            (distance, term) pairs sorted by distance, then term
+        """
+        if self._root is None:
+            return []
+        results = []
+        stack = [self._root]
+        while stack:
+            node_term, children = stack.pop()
+            distance = levenshtein(term, node_term)
+            if distance <= max_distance:
+                results.append((distance, node_term))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in children.items() if low <= d <= high)
+        return sorted(results)
+
+
+def configured_max_distance() -> int:
+    """Maximum edit distance from the environment, or the default."""
+    try:
+        return max(0, int(os.getenv(ENV_FUZZY_MATCH_MAX_DISTANCE, FUZZY_MATCH_MAX_DISTANCE)))
+    except ValueError:
+        return FUZZY_MATCH_MAX_DISTANCE
+
+
+class FuzzyMatcher:
+    """Resolves free-text guesses to known names."""
+
+    def __init__(self, names: Iterable[str], max_distance: Optional[int] = None):
+        """
+        Build the matcher.
+
+        Args:
+            names: Known names; the first name wins when two fold to the same key
+            max_distance: Maximum edit distance (defaults to the configured value)
+        """
+        self.max_distance = configured_max_distance() if max_distance is None else max_distance
+        self._by_folded: Dict[str, str] = {}
+        self._tree = BKTree()
+        for name in names:
+            folded = fold_name(name)
+            if folded and folded not in self._by_folded:
+                self._by_folded[folded] = name
+                self._tree.add(folded)
+
+    def __len__(self) -> int:
+        return len(self._by_folded)
+
+    def allowed_distance(self, folded: str) -> int:
+        """Edit budget for a guess: short names get fewer typos so "ace" does not become "ash"."""
+        return min(self.max_distance, len(folded) // 4)
+
+    def match(self, guess: str) -> Optional[str]:
+        """
+        Resolve a guess to the closest known name.
+
+        Args:
+            guess: User input
+
+        Returns:
+            The matching name as it was registered, or None if nothing is close enough
+        """
+        folded = fold_name(guess)
+        if not folded:
+            return None
+        exact = self._by_folded.get(folded)
+        if exact is not None:
+            return exact
+        budget = self.allowed_distance(folded)
+        if budget == 0:
+            return None
+        candidates = self._tree.search(folded, budget)
+        if not candidates:
+            return None
+        return self._by_folded[candidates[0][1]]
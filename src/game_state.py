@@ -1,19 +1,51 @@
 """
 Game state management for the Discord bot.
 Handles game rounds, user states, and game logic.
+
+Rounds live in one RoundStore per game, keyed by (guild, channel), and every
+state change is published as an event, so instrumentation and persistence
+hook into a single place instead of each command.
 """
 
-from typing import Dict, Optional, List, Set
+import heapq
+import math
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 
 from bot_types import GameRound, GameState, UserID
-from constants import ARKDLE_HINT_FIELDS, ARKDLE_BASE_POINTS
+from constants import (
+    ARKDLE_HINT_FIELDS, ARKDLE_BASE_POINTS, GUESS_WHO_SPEED_MAX_POINTS,
+    GUESS_WHO_SPEED_MIN_POINTS, GUESS_WHO_SPEED_HALF_LIFE_SECONDS
+)
 from exceptions import InvalidGameStateError
 from logging_utils import get_logger
+from observability import observability
+from round_store import RoundKey, RoundStore, is_daily_key
 
 logger = get_logger(__name__)
 
+GUESS_WHO = "guess_who"
+ARKDLE = "arkdle"
+
+# listener(event, game, key, data)
+GameEventListener = Callable[[str, str, RoundKey, Dict[str, Any]], None]
+
+
+def speed_points(elapsed: float) -> int:
+    """
+    Points of a correct competitive Guess Who answer.
+
+    Args:
+        elapsed: Seconds between the start of the round and the answer
+
+    Returns:
+        GUESS_WHO_SPEED_MAX_POINTS halved every half-life, never below the minimum
+    """
+    points = GUESS_WHO_SPEED_MAX_POINTS * 0.5 ** (max(elapsed, 0.0) / GUESS_WHO_SPEED_HALF_LIFE_SECONDS)
+    return max(GUESS_WHO_SPEED_MIN_POINTS, round(points))
+
 
 @dataclass
 class UserGameState:
@@ -27,266 +59,440 @@ class UserGameState:
 
 class GameStateManager:
     """Manages game states for all games."""
-    
+
     def __init__(self):
         """Initialize the game state manager."""
-        self._guess_who_round: Optional[GameRound] = None
-        self._arkdle_round: Optional[GameRound] = None
-        self._user_states: Dict[UserID, UserGameState] = {}
-        self._active_games: Set[str] = set()
-    
+        self._rounds: Dict[str, RoundStore[GameRound]] = {
+            GUESS_WHO: RoundStore(GUESS_WHO, on_evict=self._evicted(GUESS_WHO)),
+            # Daily rounds last the whole day, however quiet the guild
+            ARKDLE: RoundStore(ARKDLE, on_evict=self._evicted(ARKDLE), pinned=is_daily_key),
+        }
+        self._listeners: List[GameEventListener] = []
+
+    # Events
+
+    def subscribe(self, listener: GameEventListener) -> None:
+        """
+        Register a listener for round events ("round_started", "guess",
+        "guesses", "hint", "round_won", "round_ended").
+
+        Args:
+            listener: Called with (event, game, key, data); exceptions are logged
+        """
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, game: str, key: RoundKey, **data: Any) -> None:
+        """Publish an event to the metrics and every listener."""
+        observability.metrics.increment("game_events", {"game": game, "event": event})
+        for listener in self._listeners:
+            try:
+                listener(event, game, key, data)
+            except Exception as e:
+                observability.error_tracker.track_error(e, {'operation': 'game_event', 'event': event})
+
+    def _evicted(self, game: str) -> Callable[[RoundKey, GameRound], None]:
+        def on_evict(key: RoundKey, game_round: GameRound) -> None:
+            self._emit("round_ended", game, key, reason="evicted")
+        return on_evict
+
+    def _active_round(self, game: str, key: RoundKey) -> GameRound:
+        """The round in progress for a key, or InvalidGameStateError."""
+        game_round = self._rounds[game].get(key)
+        if not game_round or game_round.state != GameState.IN_PROGRESS:
+            raise InvalidGameStateError(f"No {game} round in progress")
+        return game_round
+
+    def _store_round(self, game: str, key: RoundKey, game_round: GameRound) -> None:
+        """Store a new round, refusing to replace one in progress."""
+        current = self._rounds[game].get(key)
+        if current and current.state == GameState.IN_PROGRESS:
+            raise InvalidGameStateError(f"A {game} round is already in progress")
+        self._rounds[game].set(key, game_round)
+
     # Guess Who Game Management
-    
-    def start_guess_who_round(self, operator_name: str, correct_answers: List[str]) -> str:
+
+    def start_guess_who_round(self, key: RoundKey, operator_name: str, correct_answers: List[str],
+                              answer_set: Optional[Iterable[str]] = None,
+                              image_ref: Optional[str] = None,
+                              competitive: bool = False,
+                              match_id: Optional[str] = None) -> str:
         """
         Start a new Guess Who round.
-        
+
         Args:
+            key: (guild, channel) of the round
             operator_name: Name of the operator
-            correct_answers: List of correct answer variations
-            
+            correct_answers: List of correct answer variations (the first one is displayed)
+            answer_set: Every accepted answer (defaults to correct_answers)
+            image_ref: Reference of the image shown to the players
+            competitive: Whether faster correct answers are worth more
+            match_id: Match the round belongs to, if any
+
         Returns:
             Round ID
-            
+
         Raises:
             InvalidGameStateError: If a round is already in progress
         """
-        if self._guess_who_round and self._guess_who_round.state == GameState.IN_PROGRESS:
-            raise InvalidGameStateError("A Guess Who round is already in progress")
-        
-        self._guess_who_round = GameRound(
+        game_round = GameRound(
             state=GameState.IN_PROGRESS,
             current_operator=operator_name,
             correct_answer=correct_answers,
-            start_time=datetime.now().isoformat()
+            start_time=datetime.now().isoformat(),
+            answer_set=frozenset(correct_answers if answer_set is None else answer_set),
+            image_ref=image_ref,
+            competitive=competitive,
+            match_id=match_id,
+            started_at=time.perf_counter(),
         )
-        
-        self._active_games.add("guess_who")
-        logger.info("Started Guess Who round: %s", operator_name)
-        return self._guess_who_round.round_id
-    
-    def submit_guess_who_answer(self, user_id: UserID, guess: str) -> bool:
+        self._store_round(GUESS_WHO, key, game_round)
+
+        logger.info("Started Guess Who round in %s: %s", key, operator_name)
+        self._emit("round_started", GUESS_WHO, key, round_id=game_round.round_id,
+                   operator=operator_name, correct_answer=correct_answers,
+                   answer_set=sorted(game_round.answer_set), image_ref=image_ref,
+                   competitive=competitive, match_id=match_id, start_time=game_round.start_time)
+        return game_round.round_id
+
+    def submit_guess_who_answer(self, key: RoundKey, user_id: UserID, guess: str) -> bool:
         """
         Submit a guess for the current Guess Who round.
-        
+
         Args:
+            key: (guild, channel) of the round
             user_id: User ID
             guess: User's guess
-            
+
         Returns:
             True if guess was accepted, False if already answered
-            
+
         Raises:
             InvalidGameStateError: If no round is in progress
         """
-        if not self._guess_who_round or self._guess_who_round.state != GameState.IN_PROGRESS:
-            raise InvalidGameStateError("No Guess Who round in progress")
-        
-        if user_id in self._guess_who_round.answers:
+        game_round = self._active_round(GUESS_WHO, key)
+
+        if user_id in game_round.answers:
             return False  # Already answered
-        
-        self._guess_who_round.answers[user_id] = guess.lower().strip()
+
+        guess = guess.lower().strip()
+        elapsed = self._record_answer(game_round, user_id, guess, time.perf_counter())
         logger.info("User %s submitted guess: %s", user_id, guess)
+        self._emit("guess", GUESS_WHO, key, user_id=user_id, guess=guess, elapsed=elapsed)
         return True
-    
-    def end_guess_who_round(self) -> Dict[str, List[str]]:
+
+    @staticmethod
+    def _record_answer(game_round: GameRound, user_id: UserID, guess: str, now: float) -> float:
+        """Record an accepted answer and its time; returns the seconds since the round started."""
+        elapsed = now - game_round.started_at
+        game_round.answers[user_id] = guess
+        if guess in game_round.answer_set:
+            game_round.winners.add(user_id)
+            game_round.correct_indices.append(len(game_round.guess_users))
+        game_round.guess_users.append(user_id)
+        game_round.guess_times.append(elapsed)
+        return elapsed
+
+    def submit_guess_who_answers(self, key: RoundKey,
+                                 guesses: Iterable[Tuple[Any, ...]]) -> List[bool]:
+        """
+        Submit a batch of guesses for the current Guess Who round, publishing
+        one "guesses" event for the whole batch.
+
+        Args:
+            key: (guild, channel) of the round
+            guesses: (user ID, guess) pairs in arrival order, optionally with the
+                time.perf_counter() of each guess's arrival as a third item;
+                guesses without one are timed at the moment of the call
+
+        Returns:
+            Whether each guess was accepted (False if the user already answered,
+            including earlier in the same batch)
+
+        Raises:
+            InvalidGameStateError: If no round is in progress
+        """
+        game_round = self._active_round(GUESS_WHO, key)
+
+        accepted, recorded = [], []
+        now = time.perf_counter()
+        for user_id, guess, *arrived_at in guesses:
+            if user_id in game_round.answers:
+                accepted.append(False)
+                continue
+            guess = guess.lower().strip()
+            elapsed = self._record_answer(game_round, user_id, guess, arrived_at[0] if arrived_at else now)
+            accepted.append(True)
+            recorded.append([user_id, guess, elapsed])
+        if recorded:
+            logger.info("Recorded %d Guess Who guesses in %s", len(recorded), key)
+            self._emit("guesses", GUESS_WHO, key, guesses=recorded)
+        return accepted
+
+    def has_answered(self, key: RoundKey, user_id: UserID) -> bool:
+        """Whether a user already answered the Guess Who round."""
+        game_round = self._rounds[GUESS_WHO].peek(key)
+        return game_round is not None and user_id in game_round.answers
+
+    def end_guess_who_round(self, key: RoundKey, top: Optional[int] = None) -> Dict[str, Any]:
         """
         End the current Guess Who round and return results.
-        
+
+        Args:
+            key: (guild, channel) of the round
+            top: Number of fastest correct answers to rank (all of them if omitted)
+
         Returns:
-            Dictionary with 'winners' and 'all_answers' lists
-            
+            Dictionary with 'winners' and 'all_answers' lists, the answer time of
+            each winner as 'winner_times' (same order as 'winners'), the fastest
+            correct answers as 'ranking' [(user ID, seconds)] and the ended 'round'
+
         Raises:
             InvalidGameStateError: If no round is in progress
         """
-        if not self._guess_who_round or self._guess_who_round.state != GameState.IN_PROGRESS:
-            raise InvalidGameStateError("No Guess Who round in progress")
-        
-        winners = []
-        all_answers = list(self._guess_who_round.answers.keys())
-        
-        if self._guess_who_round.correct_answer:
-            for user_id, guess in self._guess_who_round.answers.items():
-                if guess in self._guess_who_round.correct_answer:
-                    winners.append(user_id)
-        
-        self._guess_who_round.state = GameState.COMPLETED
-        self._active_games.discard("guess_who")
-        
-        logger.info("Ended Guess Who round. Winners: %d, Total answers: %d", 
+        game_round = self._active_round(GUESS_WHO, key)
+
+        times = game_round.guess_times
+        winners = [game_round.guess_users[index] for index in game_round.correct_indices]
+        winner_times = [times[index] for index in game_round.correct_indices]
+        all_answers = list(game_round.answers.keys())
+        # Partial sort: only the top correct answers are ordered
+        fastest = heapq.nsmallest(len(winners) if top is None else top,
+                                  game_round.correct_indices, key=times.__getitem__)
+        ranking = [(game_round.guess_users[index], times[index]) for index in fastest]
+
+        game_round.state = GameState.COMPLETED
+        self._rounds[GUESS_WHO].pop(key)
+
+        logger.info("Ended Guess Who round. Winners: %d, Total answers: %d",
                    len(winners), len(all_answers))
-        
+        self._emit("round_ended", GUESS_WHO, key, reason="revealed", winners=winners)
+
         return {
             "winners": winners,
-            "all_answers": all_answers
+            "winner_times": winner_times,
+            "all_answers": all_answers,
+            "ranking": ranking,
+            "round": game_round
         }
-    
-    def get_guess_who_round(self) -> Optional[GameRound]:
-        """Get the current Guess Who round."""
-        return self._guess_who_round
-    
+
+    def get_guess_who_round(self, key: RoundKey) -> Optional[GameRound]:
+        """Get the Guess Who round of a channel."""
+        return self._rounds[GUESS_WHO].get(key)
+
     # Arkdle Game Management
-    
-    def start_arkdle_round(self, operator_data: Dict[str, str]) -> str:
+
+    def start_arkdle_round(self, key: RoundKey, operator_data: Mapping[str, str],
+                           hint_fields: Optional[Iterable[str]] = None,
+                           match_id: Optional[str] = None) -> str:
         """
         Start a new Arkdle round.
-        
+
         Args:
+            key: (guild, channel) of the round
             operator_data: Operator data dictionary
-            
+            hint_fields: Order in which hints are revealed (defaults to ARKDLE_HINT_FIELDS)
+            match_id: Match the round belongs to, if any
+
         Returns:
             Round ID
-            
+
         Raises:
             InvalidGameStateError: If a round is already in progress
         """
-        if self._arkdle_round and self._arkdle_round.state == GameState.IN_PROGRESS:
-            raise InvalidGameStateError("An Arkdle round is already in progress")
-        
-        self._arkdle_round = GameRound(
+        game_round = GameRound(
             state=GameState.IN_PROGRESS,
             current_operator=operator_data.get("name"),
             correct_answer=[operator_data.get("name", "").lower()],
-            start_time=datetime.now().isoformat()
+            start_time=datetime.now().isoformat(),
+            operator_data=operator_data,
+            hint_fields=tuple(hint_fields or ARKDLE_HINT_FIELDS),
+            match_id=match_id,
         )
-        
-        # Store operator data for hints
-        self._arkdle_round.operator_data = operator_data
-        
-        self._active_games.add("arkdle")
-        logger.info("Started Arkdle round: %s", operator_data.get("name"))
-        return self._arkdle_round.round_id
-    
-    def get_user_arkdle_state(self, user_id: UserID) -> UserGameState:
+        game_round.answer_set = frozenset(game_round.correct_answer)
+        # Starting a new Arkdle round replaces the previous one, finished or not
+        if self._rounds[ARKDLE].pop(key) is not None:
+            self._emit("round_ended", ARKDLE, key, reason="replaced")
+        self._rounds[ARKDLE].set(key, game_round)
+
+        logger.info("Started Arkdle round in %s: %s", key, operator_data.get("name"))
+        self._emit("round_started", ARKDLE, key, round_id=game_round.round_id,
+                   operator=game_round.current_operator, hint_fields=list(game_round.hint_fields),
+                   operator_data=dict(operator_data), match_id=match_id,
+                   start_time=game_round.start_time)
+        return game_round.round_id
+
+    def get_user_arkdle_state(self, key: RoundKey, user_id: UserID) -> UserGameState:
         """
-        Get or create a user's Arkdle state.
-        
+        Get or create a user's state in an Arkdle round.
+
         Args:
+            key: (guild, channel) of the round
             user_id: User ID
-            
+
         Returns:
             User's game state
+
+        Raises:
+            InvalidGameStateError: If no round is in progress
         """
-        if user_id not in self._user_states:
-            self._user_states[user_id] = UserGameState(user_id=user_id)
-        return self._user_states[user_id]
-    
-    def submit_arkdle_guess(self, user_id: UserID, guess: str) -> Dict[str, any]:
+        game_round = self._active_round(ARKDLE, key)
+        if user_id not in game_round.user_states:
+            game_round.user_states[user_id] = UserGameState(user_id=user_id)
+        return game_round.user_states[user_id]
+
+    def has_won(self, key: RoundKey, user_id: UserID) -> bool:
+        """Whether a user already solved the Arkdle round."""
+        game_round = self._rounds[ARKDLE].peek(key)
+        return game_round is not None and user_id in game_round.winners
+
+    def submit_arkdle_guess(self, key: RoundKey, user_id: UserID, guess: str,
+                            known: bool = True) -> Dict[str, Any]:
         """
         Submit a guess for the current Arkdle round.
-        
+
         Args:
+            key: (guild, channel) of the round
             user_id: User ID
-            guess: User's guess
-            
+            guess: User's guess (normalized name)
+            known: Whether the guess is a known operator; unknown wrong guesses
+                do not cost a hint
+
         Returns:
-            Dictionary with result information
-            
+            Dictionary with result information ("status" is one of
+            "already_won", "correct", "unknown", "incorrect", "no_more_hints")
+
         Raises:
             InvalidGameStateError: If no round is in progress
         """
-        if not self._arkdle_round or self._arkdle_round.state != GameState.IN_PROGRESS:
-            raise InvalidGameStateError("No Arkdle round in progress")
-        
-        user_state = self.get_user_arkdle_state(user_id)
-        
-        if user_state.has_won:
+        game_round = self._active_round(ARKDLE, key)
+
+        if user_id in game_round.winners:
             return {"status": "already_won", "message": "You already won this round!"}
-        
+
+        user_state = self.get_user_arkdle_state(key, user_id)
         normalized_guess = guess.lower().strip()
-        correct_name = self._arkdle_round.correct_answer[0] if self._arkdle_round.correct_answer else ""
-        
-        if normalized_guess == correct_name:
+        user_state.last_guess = normalized_guess
+
+        if normalized_guess in game_round.answer_set:
             # Correct guess
             user_state.has_won = True
+            game_round.winners.add(user_id)
             hints_used = user_state.hint_index
-            points = max(1, ARKDLE_BASE_POINTS // hints_used)
-            
-            logger.info("User %s won Arkdle with %d hints, earned %d points", 
+            points = math.ceil(ARKDLE_BASE_POINTS / hints_used)
+
+            logger.info("User %s won Arkdle with %d hints, earned %d points",
                        user_id, hints_used, points)
-            
+            self._emit("round_won", ARKDLE, key, user_id=user_id, hints_used=hints_used, points=points)
+
             return {
                 "status": "correct",
                 "points": points,
                 "hints_used": hints_used,
-                "operator_name": self._arkdle_round.current_operator
+                "operator_name": game_round.current_operator
             }
-        else:
-            # Wrong guess, provide next hint
-            if user_state.hint_index < len(ARKDLE_HINT_FIELDS):
-                hint_field = ARKDLE_HINT_FIELDS[user_state.hint_index]
-                hint_value = self._arkdle_round.operator_data.get(hint_field, "Unknown")
-                user_state.hint_index += 1
-                
-                return {
-                    "status": "incorrect",
-                    "hint": f"{hint_field.capitalize()} is '{hint_value}'",
-                    "hint_index": user_state.hint_index
-                }
-            else:
-                return {
-                    "status": "no_more_hints",
-                    "message": "No more hints available!"
-                }
-    
-    def end_arkdle_round(self) -> None:
+        if not known:
+            return {"status": "unknown"}
+
+        # Wrong guess, provide next hint
+        self._emit("guess", ARKDLE, key, user_id=user_id, guess=normalized_guess)
+        if user_state.hint_index < len(game_round.hint_fields):
+            hint_field = game_round.hint_fields[user_state.hint_index]
+            hint_value = game_round.operator_data.get(hint_field, "Unknown")
+            user_state.hint_index += 1
+            self._emit("hint", ARKDLE, key, user_id=user_id, hint_index=user_state.hint_index)
+
+            return {
+                "status": "incorrect",
+                "hint_field": hint_field,
+                "hint_value": hint_value,
+                "hint_index": user_state.hint_index
+            }
+        return {
+            "status": "no_more_hints",
+            "message": "No more hints available!"
+        }
+
+    def end_arkdle_round(self, key: RoundKey) -> GameRound:
         """
         End the current Arkdle round.
-        
+
+        Args:
+            key: (guild, channel) of the round
+
+        Returns:
+            The ended round
+
         Raises:
             InvalidGameStateError: If no round is in progress
         """
-        if not self._arkdle_round or self._arkdle_round.state != GameState.IN_PROGRESS:
-            raise InvalidGameStateError("No Arkdle round in progress")
-        
-        self._arkdle_round.state = GameState.COMPLETED
-        self._active_games.discard("arkdle")
-        
-        # Reset user states for next round
-        self._user_states.clear()
-        
+        game_round = self._active_round(ARKDLE, key)
+        game_round.state = GameState.COMPLETED
+        self._rounds[ARKDLE].pop(key)
+
         logger.info("Ended Arkdle round")
-    
-    def get_arkdle_round(self) -> Optional[GameRound]:
-        """Get the current Arkdle round."""
-        return self._arkdle_round
-    
+        self._emit("round_ended", ARKDLE, key, reason="ended", winners=sorted(game_round.winners))
+        return game_round
+
+    def get_arkdle_round(self, key: RoundKey) -> Optional[GameRound]:
+        """Get the Arkdle round of a channel."""
+        return self._rounds[ARKDLE].get(key)
+
     # General Game Management
-    
+
     def get_active_games(self) -> Set[str]:
-        """Get set of currently active games."""
-        return self._active_games.copy()
-    
-    def cleanup_old_states(self, max_age_hours: int = 24) -> int:
+        """Get set of games with at least one round in progress."""
+        return {game for game, store in self._rounds.items() if len(store)}
+
+    def cleanup_old_states(self, max_age_hours: Optional[int] = None) -> int:
         """
-        Clean up old user states.
-        
+        Drop rounds nobody touched recently.
+
         Args:
-            max_age_hours: Maximum age in hours for user states
-            
+            max_age_hours: Maximum idle time in hours (defaults to each store's idle limit)
+
         Returns:
-            Number of states cleaned up
+            Number of rounds cleaned up
         """
-        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
-        old_states = [
-            user_id for user_id, state in self._user_states.items()
-            if state.join_time < cutoff_time
-        ]
-        
-        for user_id in old_states:
-            del self._user_states[user_id]
-        
-        if old_states:
-            logger.info("Cleaned up %d old user states", len(old_states))
-        
-        return len(old_states)
-    
+        cleaned = 0
+        for store in self._rounds.values():
+            if max_age_hours is None:
+                cleaned += store.evict_idle()
+            else:
+                # Evaluate idleness at the instant where "idle for idle_seconds" means "older than max_age"
+                max_age = timedelta(hours=max_age_hours).total_seconds()
+                cleaned += store.evict_idle(store.clock() - max_age + store.idle_seconds)
+
+        if cleaned:
+            logger.info("Cleaned up %d idle rounds", cleaned)
+
+        return cleaned
+
+    def iter_rounds(self) -> Iterator[Tuple[str, RoundKey, GameRound]]:
+        """Every round in progress as (game, key, round), without touching their idle timers."""
+        for game, store in self._rounds.items():
+            for key in store:
+                game_round = store.peek(key)
+                if game_round is not None and game_round.state == GameState.IN_PROGRESS:
+                    yield game, key, game_round
+
+    def restore_round(self, game: str, key: RoundKey, game_round: GameRound) -> None:
+        """
+        Put back a round saved before a restart. No event is published, since
+        the round was already recorded when it was first played.
+
+        Args:
+            game: GUESS_WHO or ARKDLE
+            key: (guild, channel) of the round
+            game_round: The round, in progress
+        """
+        self._rounds[game].set(key, game_round)
+
     def reset_all_games(self) -> None:
         """Reset all games and clear all states."""
-        self._guess_who_round = None
-        self._arkdle_round = None
-        self._user_states.clear()
-        self._active_games.clear()
+        for game, key, _ in list(self.iter_rounds()):
+            self._emit("round_ended", game, key, reason="reset")
+        for store in self._rounds.values():
+            store.clear()
         logger.info("Reset all game states")
 
 
@@ -0,0 +1,113 @@
+"""
+Micro-batched guess ingestion for the Discord bot.
+When a round opens in a big server, hundreds of guesses arrive within
+seconds. Instead of evaluating each one on its own, guesses are queued per
+round and evaluated together, either once a batch is full or after a short
+delay. Each caller awaits its own result, so every interaction is still
+answered individually, but evaluation, logging and events happen once per batch.
+Each guess carries the ID of the round it was made in, so a guess still queued
+when its round ends is never counted in the next one, and the time it arrived,
+so the wait in the queue does not count against the player.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from constants import GUESS_BATCH_MAX_SIZE, GUESS_BATCH_MAX_DELAY_SECONDS
+from observability import observability
+
+
+@dataclass(frozen=True)
+class QueuedGuess:
+    """A guess waiting for evaluation."""
+    user_id: Any
+    guess: str
+    round_id: Optional[str] = None  # Round the guess was made in
+    arrived_at: float = field(default_factory=time.perf_counter)  # When the guess was submitted
+
+
+# evaluate(key, [QueuedGuess, ...]) -> one result per guess, in order
+BatchEvaluator = Callable[[Hashable, Sequence[QueuedGuess]], Sequence[Any]]
+
+
+class GuessBatcher:
+    """Per-round queues of pending guesses, evaluated in micro-batches."""
+
+    def __init__(self, name: str, evaluate: BatchEvaluator,
+                 max_size: int = GUESS_BATCH_MAX_SIZE,
+                 max_delay: float = GUESS_BATCH_MAX_DELAY_SECONDS):
+        """
+        Initialize the batcher.
+
+        Args:
+            name: Name used in metrics and logs
+            evaluate: Evaluates a batch of a round; an exception fails the whole batch
+            max_size: Guesses that trigger an immediate evaluation
+            max_delay: Seconds the first guess of a batch waits for others
+        """
+        self.name = name
+        self.evaluate = evaluate
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._pending: Dict[Hashable, List[Tuple[QueuedGuess, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+
+    def pending(self, key: Hashable) -> int:
+        """Guesses of a round waiting for evaluation."""
+        return len(self._pending.get(key, ()))
+
+    async def submit(self, key: Hashable, user_id: Any, guess: str,
+                     round_id: Optional[str] = None) -> Any:
+        """
+        Queue a guess and wait for its result.
+
+        Args:
+            key: Round the guess belongs to
+            user_id: User ID
+            guess: Raw guess
+            round_id: ID of the round the guess was made in
+
+        Returns:
+            The evaluator's result for this guess
+
+        Raises:
+            Whatever the evaluator raised for the batch
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((QueuedGuess(user_id, guess, round_id, time.perf_counter()), future))
+        if len(batch) >= self.max_size:
+            self.flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_delay, self.flush, key)
+        return await future
+
+    def flush(self, key: Hashable) -> int:
+        """
+        Evaluate the queued guesses of a round now and resolve their callers.
+        Call it before ending a round, so guesses made in time are counted.
+
+        Returns:
+            Number of guesses evaluated
+        """
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return 0
+        try:
+            results = self.evaluate(key, [queued for queued, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        observability.metrics.histogram("guess_batch_size", len(batch), {"batcher": self.name})
+        return len(batch)
@@ -0,0 +1,109 @@
+"""
+Arkdle hint planning for the Discord bot.
+Uses the operator table's bitsets to count how many operators remain
+possible after each hint, and orders every operator's hints so the candidate
+pool shrinks along the same geometric curve whatever the target. Plans for the
+whole roster are computed once per table and looked up by name afterwards.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from logging_utils import get_logger
+from operator_table import OperatorTable, get_operator_table
+from utils import normalize_operator_name
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class HintPlan:
+    """Hint order for one operator."""
+    fields: Tuple[str, ...]
+    remaining: Tuple[int, ...]  # Operators still possible after each hint
+
+
+def plan_hints(table: OperatorTable, target: int) -> HintPlan:
+    """
+    Order the hints of one operator.
+
+    After k of F hints, the ideal pool size is N ** (1 - k / F): each hint
+    removes the same share of the remaining candidates, and the last one
+    leaves the target alone. At every step the hint whose resulting pool is
+    closest to that curve (in log scale) is picked; on ties, the hint that
+    reveals less on its own goes first, then the table's field order.
+
+    Args:
+        table: Operator table
+        target: Row index of the operator to plan for
+
+    Returns:
+        The hint plan
+    """
+    fields = list(table.fields)
+    value_bits = {
+        field: table.bitsets[field][table.codes[target, column]]
+        for column, field in enumerate(table.fields)
+    }
+    solo_counts = {field: table.count(value_bits[field]) for field in fields}
+    bits = table.all()
+    order, remaining = [], []
+    total = len(fields)
+    for step in range(1, total + 1):
+        ideal = math.log(max(table.size, 1)) * (1 - step / total)
+        best_field, best_bits, best_count, best_error = None, None, 0, None
+        for field in fields:
+            candidate = np.bitwise_and(bits, value_bits[field])
+            count = table.count(candidate)
+            error = (abs(math.log(max(count, 1)) - ideal), -solo_counts[field])
+            if best_error is None or error < best_error:
+                best_field, best_bits, best_count, best_error = field, candidate, count, error
+        fields.remove(best_field)
+        bits = best_bits
+        order.append(best_field)
+        remaining.append(best_count)
+    return HintPlan(tuple(order), tuple(remaining))
+
+
+def plan_all_hints(table: OperatorTable) -> Dict[str, HintPlan]:
+    """Plans for every operator of a table, keyed by normalized name."""
+    return {name: plan_hints(table, row) for name, row in table.index_by_name.items()}
+
+
+_plans: Dict[str, HintPlan] = {}
+_plans_table: Optional[OperatorTable] = None
+
+
+def get_hint_plans() -> Dict[str, HintPlan]:
+    """
+    Get the plans of the whole roster, planning it again after a data reload.
+
+    Returns:
+        Plans keyed by normalized operator name
+    """
+    global _plans, _plans_table
+    table = get_operator_table()
+    if table is not _plans_table:
+        _plans = plan_all_hints(table)
+        _plans_table = table
+        logger.info("Planned hints for %d operators", len(_plans))
+    return _plans
+
+
+def get_hint_plan(name: str) -> HintPlan:
+    """
+    Get the hint plan of an operator.
+
+    Args:
+        name: Operator name
+
+    Returns:
+        The plan (the table's field order if the operator is unknown)
+    """
+    plan = get_hint_plans().get(normalize_operator_name(name))
+    if plan is None:
+        return HintPlan(get_operator_table().fields, ())
+    return plan
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the image obscuring pipeline.
+Runs every stage of image_utils over a sample of the original images (or over
+synthetic images when the asset library is not available) and writes a JSON
+report with per-stage timings, peak memory and output sizes.
+
+Usage:
+    python image_benchmark.py --sample 20 --output report.json
+    python image_benchmark.py --synthetic --sample 10 --size 1024x1024
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from constants import ORIGINAL_IMAGES_FOLDER, SUPPORTED_IMAGE_EXTENSIONS
+from image_utils import (
+    decode_image,
+    build_mask,
+    find_large_contours,
+    fill_silhouette,
+    encode_image,
+)
+
+STAGES = ("decode", "mask", "contours", "fill", "encode")
+
+
+def collect_asset_images(base_path: str = ORIGINAL_IMAGES_FOLDER) -> List[str]:
+    """
+    List every supported image inside the operator folders of the asset library.
+
+    Args:
+        base_path: Folder containing one subfolder per operator
+
+    Returns:
+        List of image paths (empty if the folder does not exist)
+    """
+    if not os.path.isdir(base_path):
+        return []
+    paths = []
+    for folder in sorted(os.listdir(base_path)):
+        folder_path = os.path.join(base_path, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for name in sorted(os.listdir(folder_path)):
+            if name.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS):
+                paths.append(os.path.join(folder_path, name))
+    return paths
+
+
+def generate_synthetic_image(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generate an RGBA image resembling operator art: a few coloured blobs over a
+    white background, with some small specks that fall below the area threshold.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        rng: Random generator used for shapes and colours
+
+    Returns:
+        RGBA uint8 array of shape (height, width, 4)
+    """
+    img = np.full((height, width, 4), 255, dtype=np.uint8)
+    center = (width // 2, height // 2)
+    axes = (max(1, width // 4), max(1, height // 3))
+    color = tuple(int(c) for c in rng.integers(0, 200, size=3)) + (255,)
+    cv2.ellipse(img, center, axes, 0, 0, 360, color, thickness=-1)
+    for _ in range(int(rng.integers(2, 6))):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        radius = int(rng.integers(1, max(2, min(width, height) // 40)))
+        speck = tuple(int(c) for c in rng.integers(0, 200, size=3)) + (255,)
+        cv2.circle(img, (x, y), radius, speck, thickness=-1)
+    return img
+
+
+def _encode_png(img: np.ndarray) -> bytes:
+    """Encode a generated image as PNG, so its runs decode it like an asset file."""
+    buffer = io.BytesIO()
+    encode_image(img, buffer)
+    return buffer.getvalue()
+
+
+def _run_stages(source: Any, synthetic: bool) -> Tuple[Dict[str, float], int, int]:
+    """Run the pipeline once, returning stage timings, peak memory and output size."""
+    timings = {}
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        np_img = decode_image(io.BytesIO(source) if synthetic else source)
+        timings["decode"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mask = build_mask(np_img)
+        timings["mask"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        contours = find_large_contours(mask)
+        timings["contours"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = fill_silhouette(mask.shape, contours)
+        timings["fill"] = time.perf_counter() - start
+
+        buffer = io.BytesIO()
+        start = time.perf_counter()
+        encode_image(result, buffer)
+        timings["encode"] = time.perf_counter() - start
+
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return timings, peak, buffer.getbuffer().nbytes
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    """Summary statistics for a list of measurements."""
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    arr = np.asarray(values, dtype=np.float64)
+    return {
+        "count": int(arr.size),
+        "mean": float(arr.mean()),
+        "p50": float(np.percentile(arr, 50)),
+        "p95": float(np.percentile(arr, 95)),
+        "max": float(arr.max()),
+    }
+
+
+def run_benchmark(sample: int = 20,
+                  source_folder: str = ORIGINAL_IMAGES_FOLDER,
+                  synthetic_size: Tuple[int, int] = (1024, 1024),
+                  force_synthetic: bool = False,
+                  repeat: int = 1,
+                  seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Benchmark the obscuring pipeline.
+
+    Real assets are used when available; otherwise (or when force_synthetic is
+    set) `sample` synthetic images of `synthetic_size` are generated. Synthetic
+    images are encoded as PNG once, up front, and every run decodes those bytes.
+
+    Args:
+        sample: Number of images to benchmark
+        source_folder: Asset library folder
+        synthetic_size: (width, height) of generated images
+        force_synthetic: Ignore the asset library even if present
+        repeat: Number of runs per image
+        seed: Random seed for sampling and image generation
+
+    Returns:
+        JSON-serializable report dictionary
+    """
+    rng = np.random.default_rng(seed)
+    paths = [] if force_synthetic else collect_asset_images(source_folder)
+    synthetic = not paths
+    if synthetic:
+        width, height = synthetic_size
+        sources = [(f"synthetic_{i}", _encode_png(generate_synthetic_image(width, height, rng)))
+                   for i in range(sample)]
+    else:
+        chosen = random.Random(seed).sample(paths, min(sample, len(paths)))
+        sources = [(path, path) for path in chosen]
+
+    images = []
+    for name, source in sources:
+        for run in range(repeat):
+            timings, peak, output_bytes = _run_stages(source, synthetic)
+            images.append({
+                "image": name,
+                "run": run,
+                "stages": timings,
+                "total": sum(timings.values()),
+                "peak_memory_bytes": peak,
+                "output_bytes": output_bytes,
+            })
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "config": {
+            "mode": "synthetic" if synthetic else "assets",
+            "source_folder": None if synthetic else source_folder,
+            "sample": len(sources),
+            "repeat": repeat,
+            "synthetic_size": list(synthetic_size) if synthetic else None,
+            "seed": seed,
+        },
+        "summary": {
+            "stages": {stage: _summarize([i["stages"][stage] for i in images]) for stage in STAGES},
+            "total": _summarize([i["total"] for i in images]),
+            "peak_memory_bytes": max((i["peak_memory_bytes"] for i in images), default=0),
+            "output_bytes": _summarize([i["output_bytes"] for i in images]),
+        },
+        "images": images,
+    }
+
+
+def _parse_size(value: str) -> Tuple[int, int]:
+    """Parse a WIDTHxHEIGHT string."""
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size '{value}', expected WIDTHxHEIGHT")
+    return width, height
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the image obscuring pipeline.")
+    parser.add_argument("--source", default=ORIGINAL_IMAGES_FOLDER, help="Asset library folder")
+    parser.add_argument("--sample", type=int, default=20, help="Number of images to benchmark")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per image")
+    parser.add_argument("--size", type=_parse_size, default=(1024, 1024),
+                        help="Synthetic image size, e.g. 1024x1024")
+    parser.add_argument("--synthetic", action="store_true", help="Always use synthetic images")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        sample=args.sample,
+        source_folder=args.source,
+        synthetic_size=args.size,
+        force_synthetic=args.synthetic,
+        repeat=args.repeat,
+        seed=args.seed,
+    )
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+        summary = report["summary"]["total"]
+        print(f"Benchmarked {summary['count']} run(s), mean {summary['mean']:.4f}s -> {args.output}")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
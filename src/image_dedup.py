@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash deduplication of operator images.
+Hashes every image of the asset library in parallel, clusters near-duplicates
+(re-exports, the same pose at different sizes) inside each operator folder and
+records one representative per cluster, so Guess Who and the silhouette atlas
+only use distinct art.
+
+Usage:
+    python image_dedup.py [--method dhash] [--max-distance 6] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from constants import (
+    ORIGINAL_IMAGES_FOLDER, IMAGE_DEDUP_PATH, IMAGE_HASH_SIZE, IMAGE_DEDUP_MAX_DISTANCE, ERROR_MESSAGES
+)
+from exceptions import DataError
+from image_utils import decode_image
+from logging_utils import get_logger
+from utils import list_operator_images
+
+logger = get_logger(__name__)
+
+DEDUP_VERSION = 1
+HASH_METHODS = ("ahash", "dhash")
+# Hex digits of a stored hash (a hash has IMAGE_HASH_SIZE ** 2 bits)
+HASH_HEX_DIGITS = (IMAGE_HASH_SIZE ** 2 + 3) // 4
+
+# Loaded catalog per path, invalidated when the file's mtime changes
+_catalog_cache: Dict[str, tuple] = {}
+
+
+def _grayscale_on_white(path: str) -> Image.Image:
+    """Decode an image and flatten its alpha channel onto a white background."""
+    rgba = decode_image(path).astype(np.float32)
+    alpha = rgba[:, :, 3:4] / 255.0
+    rgb = rgba[:, :, :3] * alpha + 255.0 * (1.0 - alpha)
+    gray = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return Image.fromarray(gray.clip(0, 255).astype(np.uint8))
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    """Pack a boolean array into an integer, first element as the most significant bit."""
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def average_hash(path: str, size: int = IMAGE_HASH_SIZE) -> int:
+    """
+    Average hash: downscale to size x size and compare each pixel to the mean.
+
+    Args:
+        path: Image file
+        size: Hash side length (the hash has size**2 bits)
+
+    Returns:
+        Hash as an integer
+    """
+    small = np.asarray(_grayscale_on_white(path).resize((size, size), Image.LANCZOS), dtype=np.float32)
+    return _bits_to_int(small > small.mean())
+
+
+def difference_hash(path: str, size: int = IMAGE_HASH_SIZE) -> int:
+    """
+    Difference hash: downscale to (size + 1) x size and compare horizontal neighbours.
+
+    Args:
+        path: Image file
+        size: Hash side length (the hash has size**2 bits)
+
+    Returns:
+        Hash as an integer
+    """
+    small = np.asarray(_grayscale_on_white(path).resize((size + 1, size), Image.LANCZOS), dtype=np.int16)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+def _hash_image(job: Tuple[str, str, str, int]) -> Tuple[str, str, Optional[int], int]:
+    """Worker: hash one image, returning (operator, image, hash, pixel area)."""
+    operator, path, method, size = job
+    try:
+        with Image.open(path) as img:
+            area = img.size[0] * img.size[1]
+        hash_func = average_hash if method == "ahash" else difference_hash
+        return operator, os.path.basename(path), hash_func(path, size), area
+    except Exception:
+        return operator, os.path.basename(path), None, 0
+
+
+def hash_library(base_path: str = ORIGINAL_IMAGES_FOLDER, method: str = "dhash",
+                 size: int = IMAGE_HASH_SIZE,
+                 workers: Optional[int] = None) -> Dict[str, Dict[str, Tuple[int, int]]]:
+    """
+    Hash the round candidates of the asset library (E2 art and skins are
+    excluded, as in the rounds) using a process pool.
+
+    Args:
+        base_path: Folder containing one subfolder per operator
+        method: "ahash" or "dhash"
+        size: Hash side length
+        workers: Number of worker processes (None = CPU count)
+
+    Returns:
+        {operator: {image: (hash, pixel area)}}; unreadable images are skipped
+    """
+    if method not in HASH_METHODS:
+        raise ValueError(f"Unknown hash method: {method}")
+
+    jobs = []
+    if os.path.isdir(base_path):
+        for folder in sorted(os.listdir(base_path)):
+            folder_path = os.path.join(base_path, folder)
+            if not os.path.isdir(folder_path):
+                continue
+            for name in list_operator_images(folder_path):
+                jobs.append((folder, os.path.join(folder_path, name), method, size))
+
+    hashes: Dict[str, Dict[str, Tuple[int, int]]] = {}
+    if not jobs:
+        return hashes
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for operator, image, image_hash, area in pool.map(_hash_image, jobs, chunksize=16):
+            if image_hash is None:
+                logger.error("Could not hash %s/%s", operator, image)
+                continue
+            hashes.setdefault(operator, {})[image] = (image_hash, area)
+    return hashes
+
+
+def cluster_near_duplicates(hashes: Dict[str, Tuple[int, int]],
+                            max_distance: int = IMAGE_DEDUP_MAX_DISTANCE) -> List[List[str]]:
+    """
+    Group images whose hashes are within max_distance of each other (single linkage).
+
+    Args:
+        hashes: {image: (hash, pixel area)} for one operator
+        max_distance: Maximum Hamming distance for two images to be near-duplicates
+
+    Returns:
+        Clusters of image names, each sorted with its representative (largest image) first
+    """
+    names = sorted(hashes)
+    parent = list(range(len(names)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            if hamming_distance(hashes[names[i]][0], hashes[names[j]][0]) <= max_distance:
+                parent[find(j)] = find(i)
+
+    groups: Dict[int, List[str]] = {}
+    for i, name in enumerate(names):
+        groups.setdefault(find(i), []).append(name)
+    return [
+        sorted(group, key=lambda name: (-hashes[name][1], name))
+        for group in groups.values()
+    ]
+
+
+def build_dedup_catalog(base_path: str = ORIGINAL_IMAGES_FOLDER, method: str = "dhash",
+                        max_distance: int = IMAGE_DEDUP_MAX_DISTANCE,
+                        workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Hash and cluster the whole library.
+
+    Args:
+        base_path: Folder containing one subfolder per operator
+        method: "ahash" or "dhash"
+        max_distance: Maximum Hamming distance for near-duplicates
+        workers: Number of worker processes
+
+    Returns:
+        Catalog dictionary with clusters and representatives per operator
+    """
+    hashes = hash_library(base_path, method, workers=workers)
+    operators = {}
+    duplicates = 0
+    for operator, images in hashes.items():
+        clusters = cluster_near_duplicates(images, max_distance)
+        duplicates += len(images) - len(clusters)
+        operators[operator] = {
+            "hashes": {image: f"{value:0{HASH_HEX_DIGITS}x}" for image, (value, _) in images.items()},
+            "clusters": [cluster for cluster in clusters if len(cluster) > 1],
+            "representatives": sorted(cluster[0] for cluster in clusters),
+        }
+
+    logger.info("Hashed %d images, found %d near-duplicates",
+                sum(len(images) for images in hashes.values()), duplicates)
+    return {
+        "version": DEDUP_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "method": method,
+        "max_distance": max_distance,
+        "operators": operators,
+    }
+
+
+def save_dedup_catalog(catalog: Dict[str, Any], path: str = IMAGE_DEDUP_PATH) -> None:
+    """
+    Save the catalog to a JSON file.
+
+    Raises:
+        DataError: If the file cannot be written
+    """
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(catalog, f, ensure_ascii=False, indent=2)
+        _catalog_cache.pop(path, None)
+    except Exception as e:
+        error_msg = ERROR_MESSAGES["SAVE_ERROR"].format(e)
+        logger.error("%s", error_msg)
+        raise DataError(error_msg) from e
+
+
+def load_dedup_catalog(path: str = IMAGE_DEDUP_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Load the catalog, reusing the parsed copy until the file changes.
+
+    Returns:
+        Catalog dictionary, or None if it has not been built yet
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _catalog_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+    except json.JSONDecodeError as e:
+        logger.error("%s: %s", ERROR_MESSAGES["JSON_DECODE_ERROR"].format(path), e)
+        return None
+
+    if catalog.get("version") != DEDUP_VERSION:
+        logger.warning("Ignoring dedup catalog %s with unsupported version %s", path, catalog.get("version"))
+        return None
+
+    _catalog_cache[path] = (mtime, catalog)
+    return catalog
+
+
+def filter_duplicate_images(operator_folder: str, images: List[str],
+                            catalog: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Keep one image per near-duplicate cluster: the first of the cluster (the
+    largest) among the candidates. Candidates are filtered by quality first, so
+    a representative that fails the quality bar gives way to its best copy
+    instead of taking the whole cluster with it.
+
+    Images missing from the catalog (added after it was built) are kept, and
+    with no catalog at all every image is returned unchanged.
+
+    Args:
+        operator_folder: Operator folder name
+        images: Candidate image file names
+        catalog: Pre-loaded catalog (optional)
+
+    Returns:
+        Filtered list of image file names
+    """
+    if catalog is None:
+        catalog = load_dedup_catalog()
+    if not catalog:
+        return images
+
+    entry = catalog.get("operators", {}).get(operator_folder)
+    if not entry:
+        return images
+    candidates = set(images)
+    duplicates = set()
+    for cluster in entry.get("clusters", ()):
+        present = [image for image in cluster if image in candidates]
+        duplicates.update(present[1:])
+    return [image for image in images if image not in duplicates]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Find near-duplicate operator images.")
+    parser.add_argument("--source", default=ORIGINAL_IMAGES_FOLDER, help="Asset library folder")
+    parser.add_argument("--output", default=IMAGE_DEDUP_PATH, help="Catalog file to write")
+    parser.add_argument("--method", choices=HASH_METHODS, default="dhash", help="Perceptual hash")
+    parser.add_argument("--max-distance", type=int, default=IMAGE_DEDUP_MAX_DISTANCE,
+                        help="Maximum Hamming distance between near-duplicates")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args(argv)
+
+    catalog = build_dedup_catalog(args.source, args.method, args.max_distance, args.workers)
+    save_dedup_catalog(catalog, args.output)
+
+    clusters = sum(len(entry["clusters"]) for entry in catalog["operators"].values())
+    print(f"Found {clusters} near-duplicate cluster(s) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
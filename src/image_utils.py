@@ -1,30 +1,125 @@
 
+import io
+import os
+
 from PIL import Image
 import numpy as np
 import cv2
 
+from constants import IMAGE_PROCESSING_THRESHOLD
+
+
+def decode_image(original_path):
+	"""
+	Loads the original image and returns it as an RGBA numpy array.
+	"""
+	with Image.open(original_path) as img:
+		return np.array(img.convert("RGBA"))
+
+
+def build_mask(np_img):
+	"""
+	Returns a uint8 mask (0/255) marking every pixel that is not near-white.
+	"""
+	is_not_white = np.any(np_img[:, :, :3] < 245, axis=2)
+	return is_not_white.astype(np.uint8) * 255
+
+
+def find_large_contours(mask, threshold=IMAGE_PROCESSING_THRESHOLD):
+	"""
+	Returns the external contours of the mask whose area is above the given
+	fraction of the image area. An empty list means no usable silhouette.
+	"""
+	contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+	if not contours:
+		return []
+	height, width = mask.shape
+	min_area = (height * width) * threshold
+	return [c for c in contours if cv2.contourArea(c) > min_area]
+
+
+def fill_silhouette(shape, contours):
+	"""
+	Draws the given contours as a black silhouette over a white RGBA canvas.
+	"""
+	height, width = shape
+	result = np.ones((height, width, 4), dtype=np.uint8) * 255
+	if not contours:
+		return result
+	final_mask = np.zeros((height, width), dtype=np.uint8)
+	cv2.drawContours(final_mask, contours, -1, 255, thickness=cv2.FILLED)
+	result[final_mask == 255] = [0, 0, 0, 255]
+	return result
+
+
+def silhouette_mask(original_path, threshold=IMAGE_PROCESSING_THRESHOLD):
+	"""
+	Returns the silhouette of an image as a boolean array (True = character).
+	"""
+	mask = build_mask(decode_image(original_path))
+	contours = find_large_contours(mask, threshold)
+	final_mask = np.zeros_like(mask)
+	if contours:
+		cv2.drawContours(final_mask, contours, -1, 255, thickness=cv2.FILLED)
+	return final_mask == 255
+
+
+def encode_mask_png(mask):
+	"""
+	Encodes a boolean silhouette mask as a black-on-white grayscale PNG.
+	"""
+	buffer = io.BytesIO()
+	Image.fromarray(np.where(mask, 0, 255).astype(np.uint8)).save(buffer, format="PNG")
+	return buffer.getvalue()
+
+
+def encode_image(result, output):
+	"""
+	Saves the RGBA array. Paths keep the format implied by their extension,
+	binary file objects are written as PNG.
+	"""
+	image_format = None if isinstance(output, (str, os.PathLike)) else "PNG"
+	Image.fromarray(result).save(output, format=image_format)
+
+
 def obscure_image(original_path, output_path):
 	"""
 	Generates an obscured version of the original image and saves it to the output path.
 	The character is black, the background is white.
 	"""
-	with Image.open(original_path) as img:
-		img = img.convert("RGBA")
-		np_img = np.array(img)
-		height, width = img.size[1], img.size[0]
-		is_not_white = np.any(np_img[:, :, :3] < 245, axis=2)
-		mask = is_not_white.astype(np.uint8) * 255
-		contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-		if not contours:
-			Image.new("RGBA", img.size, (255, 255, 255, 255)).save(output_path)
-			return
-		min_area = (height * width) * 0.05
-		large_contours = [c for c in contours if cv2.contourArea(c) > min_area]
-		if not large_contours:
-			Image.new("RGBA", img.size, (255, 255, 255, 255)).save(output_path)
-			return
-		final_mask = np.zeros_like(mask)
-		cv2.drawContours(final_mask, large_contours, -1, 255, thickness=cv2.FILLED)
-		result = np.ones((height, width, 4), dtype=np.uint8) * 255
-		result[final_mask == 255] = [0, 0, 0, 255]
-		Image.fromarray(result).save(output_path)
+	np_img = decode_image(original_path)
+	mask = build_mask(np_img)
+	large_contours = find_large_contours(mask)
+	result = fill_silhouette(mask.shape, large_contours)
+	encode_image(result, output_path)
+
+
+def analyze_silhouette(original_path, threshold=IMAGE_PROCESSING_THRESHOLD):
+	"""
+	Measures how usable the silhouette of an image is, without rendering it.
+	Returns the image size, the number of raw and retained contours, the
+	fraction of the image covered by the retained contours and their joint
+	bounding box ([x, y, width, height], or None when nothing is retained).
+	"""
+	np_img = decode_image(original_path)
+	mask = build_mask(np_img)
+	height, width = mask.shape
+	contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+	min_area = (height * width) * threshold
+	large_contours = [c for c in contours if cv2.contourArea(c) > min_area]
+	bbox = None
+	foreground_ratio = 0.0
+	if large_contours:
+		silhouette = fill_silhouette(mask.shape, large_contours)
+		foreground = silhouette[:, :, 0] == 0
+		foreground_ratio = float(foreground.sum()) / float(height * width)
+		x, y, w, h = cv2.boundingRect(np.vstack(large_contours))
+		bbox = [int(x), int(y), int(w), int(h)]
+	return {
+		"width": int(width),
+		"height": int(height),
+		"contour_count": len(contours),
+		"large_contour_count": len(large_contours),
+		"foreground_ratio": foreground_ratio,
+		"bbox": bbox,
+	}
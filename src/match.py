@@ -0,0 +1,147 @@
+"""
+Multi-round matches for the Discord bot.
+A match is a fixed sequence of Guess Who and Arkdle rounds played in one
+channel. Points scored during the match go to a leaderboard held in memory;
+persistent scores are written once, when the match ends.
+"""
+
+import heapq
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from bot_types import UserID
+from exceptions import InvalidGameStateError
+from game_state import ARKDLE, GUESS_WHO
+from logging_utils import get_logger
+from observability import observability
+from round_store import RoundKey
+from scores import load_scores, save_scores
+
+logger = get_logger(__name__)
+
+MIXED = "mixed"
+
+
+def plan_games(rounds: int, mode: str = MIXED) -> Tuple[str, ...]:
+    """
+    Game of each round of a match.
+
+    Args:
+        rounds: Number of rounds
+        mode: GUESS_WHO, ARKDLE, or MIXED (alternating, starting with Guess Who)
+
+    Returns:
+        One game per round
+    """
+    if mode == MIXED:
+        return tuple(GUESS_WHO if index % 2 == 0 else ARKDLE for index in range(rounds))
+    return (mode,) * rounds
+
+
+@dataclass
+class Match:
+    """State of a match in progress."""
+    key: RoundKey
+    games: Tuple[str, ...]
+    round_seconds: float
+    competitive: bool = False
+    match_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    index: int = -1  # Round being played (-1 before the first one)
+    leaderboard: Dict[UserID, int] = field(default_factory=dict)
+    names: Dict[UserID, str] = field(default_factory=dict)
+    upcoming: Any = None  # Content selected ahead of time for the next round
+    upcoming_index: int = -1  # Round the upcoming content was selected for
+
+    @property
+    def current_game(self) -> Optional[str]:
+        return self.games[self.index] if 0 <= self.index < len(self.games) else None
+
+    @property
+    def next_game(self) -> Optional[str]:
+        return self.games[self.index + 1] if self.index + 1 < len(self.games) else None
+
+    def advance(self) -> Optional[str]:
+        """Move to the next round; returns its game, or None when the match is over."""
+        self.index += 1
+        return self.current_game
+
+    def stage(self, index: int, content: Any) -> None:
+        """Keep content selected for round `index`, unless the match already got there."""
+        if index > self.index:
+            self.upcoming, self.upcoming_index = content, index
+
+    def take_upcoming(self) -> Any:
+        """Content selected for the current round, or None if there is none or it is stale."""
+        content, index = self.upcoming, self.upcoming_index
+        self.upcoming, self.upcoming_index = None, -1
+        return content if index == self.index else None
+
+    def award(self, user_id: UserID, points: int, name: Optional[str] = None) -> None:
+        """Add points to the match leaderboard."""
+        self.leaderboard[user_id] = self.leaderboard.get(user_id, 0) + points
+        if name:
+            self.names[user_id] = name
+
+    def standings(self, top: Optional[int] = None) -> List[Tuple[UserID, int]]:
+        """Leaderboard entries by points, best first (only the top ones if given)."""
+        if top is None:
+            return sorted(self.leaderboard.items(), key=lambda entry: -entry[1])
+        return heapq.nlargest(top, self.leaderboard.items(), key=lambda entry: entry[1])
+
+
+class MatchManager:
+    """Matches in progress, one per channel at most."""
+
+    def __init__(self):
+        self._matches: Dict[RoundKey, Match] = {}
+
+    def start(self, key: RoundKey, games: Tuple[str, ...], round_seconds: float,
+              competitive: bool = False) -> Match:
+        """
+        Create a match in a channel.
+
+        Raises:
+            InvalidGameStateError: If the channel already has a match
+        """
+        if key in self._matches:
+            raise InvalidGameStateError("A match is already in progress")
+        match = Match(key, games, round_seconds, competitive)
+        self._matches[key] = match
+        observability.metrics.increment("matches_started")
+        logger.info("Started %d-round match in %s", len(games), key)
+        return match
+
+    def get(self, key: RoundKey) -> Optional[Match]:
+        """The match of a channel, if any."""
+        return self._matches.get(key)
+
+    def remove(self, key: RoundKey) -> Optional[Match]:
+        """Drop the match of a channel without touching the scores."""
+        return self._matches.pop(key, None)
+
+    def finish(self, key: RoundKey) -> Optional[Match]:
+        """
+        End the match of a channel and commit its leaderboard to the persistent
+        scores in a single write.
+
+        Returns:
+            The finished match, or None if there was none
+        """
+        match = self._matches.pop(key, None)
+        if match is None or not match.leaderboard:
+            return match
+        scores = load_scores()
+        for user_id, points in match.leaderboard.items():
+            entry = scores.setdefault(user_id, {"username": match.names.get(user_id, user_id), "pontos": 0})
+            entry["pontos"] += points
+            if user_id in match.names:
+                entry["username"] = match.names[user_id]
+        save_scores(scores)
+        observability.metrics.increment("matches_finished")
+        logger.info("Finished match in %s, %d players scored", key, len(match.leaderboard))
+        return match
+
+
+# Global match manager instance
+match_manager = MatchManager()
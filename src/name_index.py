@@ -0,0 +1,230 @@
+"""
+Prefix index over operator names and aliases for the Discord bot.
+Backs the autocomplete of the guess options: every trie node keeps its own
+ranked list of suggestions, so a lookup only walks the typed prefix and never
+touches the disk. Also owns the shared fuzzy matcher used to resolve guesses.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from constants import AUTOCOMPLETE_MAX_CHOICES
+from logging_utils import get_logger
+from fuzzy_match import FuzzyMatcher
+from alias_index import alias_index
+from operator_repository import operator_repository
+from utils import normalize_operator_name
+
+logger = get_logger(__name__)
+
+# (starts at a later word, is an alias, name length, lowercase name)
+RankKey = Tuple[bool, bool, int, str]
+
+
+class _TrieNode:
+    """Trie node holding the best suggestions for its prefix."""
+
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.top: List[Tuple[RankKey, str]] = []
+
+
+class PrefixIndex:
+    """Trie of names with precomputed, ranked suggestions per prefix."""
+
+    def __init__(self, max_results: int = AUTOCOMPLETE_MAX_CHOICES):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_results: Number of suggestions kept per prefix
+        """
+        self.max_results = max_results
+        self._root = _TrieNode()
+        self._names: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, is_alias: bool = False) -> None:
+        """
+        Add a name. Besides its full form it is reachable from the start of each
+        of its words ("holungday" finds "Ch'en the Holungday"), ranked lower.
+
+        Args:
+            name: Name to suggest
+            is_alias: Aliases rank after canonical operator names
+        """
+        key = normalize_operator_name(name)
+        if not key:
+            return
+        if key in self._names:
+            if is_alias:
+                return
+            self._remove_from_tops(key)
+        self._names[key] = name.strip()
+
+        starts = [0] + [i + 1 for i, char in enumerate(key) if char == " "]
+        for start in starts:
+            rank = (start > 0, is_alias, len(key), key)
+            self._insert(key[start:], rank, self._names[key])
+
+    def _insert(self, term: str, rank: RankKey, name: str) -> None:
+        """Walk the term, offering the name to the suggestion list of every prefix."""
+        node = self._root
+        self._offer(node, rank, name)
+        for char in term:
+            node = node.children.setdefault(char, _TrieNode())
+            self._offer(node, rank, name)
+
+    def _offer(self, node: _TrieNode, rank: RankKey, name: str) -> None:
+        """Insert a suggestion into a node's ranked list, keeping the best entry per name."""
+        for i, (existing_rank, existing) in enumerate(node.top):
+            if existing == name:
+                if existing_rank <= rank:
+                    return
+                del node.top[i]
+                break
+        node.top.append((rank, name))
+        node.top.sort()
+        del node.top[self.max_results:]
+
+    def _remove_from_tops(self, key: str) -> None:
+        """Drop every suggestion of a name (used when an alias is promoted to a canonical name)."""
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.top = [(rank, name) for rank, name in node.top if rank[3] != key]
+            stack.extend(node.children.values())
+
+    def suggest(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Suggestions for a typed prefix, best first.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of suggestions (defaults to max_results)
+
+        Returns:
+            Matching names; with an empty prefix, the best-ranked names overall
+        """
+        limit = self.max_results if limit is None else min(limit, self.max_results)
+        key = normalize_operator_name(prefix)
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [name for _, name in node.top[:limit]]
+
+
+def build_name_index(operator_names: Iterable[str],
+                     alternative_names: Mapping[str, List[str]]) -> PrefixIndex:
+    """
+    Build the index from operator names and the alternative names mapping.
+
+    Args:
+        operator_names: Canonical operator names
+        alternative_names: Raw alternative names mapping ({"Main Name": ["alias", ...]})
+
+    Returns:
+        The populated index
+    """
+    index = PrefixIndex()
+    for name in operator_names:
+        index.add(name)
+    for main_name, alternatives in alternative_names.items():
+        index.add(main_name, is_alias=True)
+        for alternative in alternatives if isinstance(alternatives, list) else ():
+            if isinstance(alternative, str):
+                index.add(alternative, is_alias=True)
+    return index
+
+
+_indexes: Dict[bool, PrefixIndex] = {}
+_matchers: Dict[bool, FuzzyMatcher] = {}
+_index_operator_version = -1
+_index_alias_version = -1
+
+
+def _all_names(include_aliases: bool) -> List[str]:
+    """Operator names followed, optionally, by every alternative name."""
+    names = operator_repository.names()
+    if include_aliases:
+        for main_name, alternatives in alias_index.raw().items():
+            names.append(main_name)
+            if isinstance(alternatives, list):
+                names.extend(alt for alt in alternatives if isinstance(alt, str))
+    return names
+
+
+def _refresh_sources() -> None:
+    """Drop the cached indexes when the operator or alias data changed."""
+    global _index_operator_version, _index_alias_version
+    alias_version = alias_index.version
+    if alias_version != _index_alias_version:
+        _indexes.pop(True, None)
+        _matchers.pop(True, None)
+        _index_alias_version = alias_version
+
+    version = operator_repository.version
+    if version != _index_operator_version:
+        _indexes.clear()
+        _matchers.clear()
+        _index_operator_version = version
+
+
+def get_name_index(include_aliases: bool = True) -> PrefixIndex:
+    """
+    Get a shared prefix index, rebuilt when the operator or alias data changes.
+
+    Args:
+        include_aliases: Also suggest alternative names (Guess Who accepts them,
+            Arkdle only knows canonical operator names)
+
+    Returns:
+        The name index
+    """
+    _refresh_sources()
+    index = _indexes.get(include_aliases)
+    if index is None:
+        aliases = alias_index.raw() if include_aliases else {}
+        index = build_name_index(operator_repository.names(), aliases)
+        _indexes[include_aliases] = index
+        logger.info("Built name index with %d names", len(index))
+    return index
+
+
+def get_name_matcher(include_aliases: bool = True) -> FuzzyMatcher:
+    """
+    Get a shared typo-tolerant matcher, rebuilt when the operator or alias data changes.
+
+    Args:
+        include_aliases: Also resolve alternative names
+
+    Returns:
+        The fuzzy matcher
+    """
+    _refresh_sources()
+    matcher = _matchers.get(include_aliases)
+    if matcher is None:
+        matcher = FuzzyMatcher(_all_names(include_aliases))
+        _matchers[include_aliases] = matcher
+        logger.info("Built fuzzy name matcher with %d names", len(matcher))
+    return matcher
+
+
+def resolve_guess(guess: str, include_aliases: bool = True) -> str:
+    """
+    Resolve a guess to a known name, tolerating accents, punctuation and typos.
+
+    Args:
+        guess: User input
+        include_aliases: Also resolve alternative names
+
+    Returns:
+        The normalized known name, or the normalized guess if nothing is close enough
+    """
+    match = get_name_matcher(include_aliases).match(guess)
+    return normalize_operator_name(match if match is not None else guess)
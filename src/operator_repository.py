@@ -0,0 +1,123 @@
+"""
+Operator repository for the Discord bot.
+Loads the operator data once, serves immutable records from memory and
+hot-reloads them only when the JSON file's content changes.
+"""
+
+import json
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from constants import OPERATORS_JSON_PATH, ERROR_MESSAGES, DATA_RELOAD_CHECK_INTERVAL
+from logging_utils import get_logger
+from observability import observability
+from utils import WatchedFile, normalize_operator_name
+
+logger = get_logger(__name__)
+
+OperatorRecord = Mapping[str, str]
+
+
+class OperatorRepository:
+    """In-memory, read-only view over the operator data file."""
+
+    def __init__(self, path: str = OPERATORS_JSON_PATH,
+                 check_interval: float = DATA_RELOAD_CHECK_INTERVAL):
+        """
+        Initialize the repository. The file is read on first access.
+
+        Args:
+            path: Path to the operators JSON file
+            check_interval: Minimum seconds between checks for a changed file
+        """
+        self.path = path
+        self._watcher = WatchedFile(path, check_interval)
+        self._operators: Tuple[OperatorRecord, ...] = ()
+        self._by_name: Dict[str, OperatorRecord] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Number of times the data was (re)loaded; lets dependents rebuild their caches."""
+        self._refresh()
+        return self._version
+
+    def _refresh(self, force: bool = False) -> None:
+        """Reload the data if the file content changed since the last load."""
+        try:
+            content = self._watcher.poll(force)
+        except OSError as e:
+            logger.error("%s", ERROR_MESSAGES["LOAD_ERROR"].format(e))
+            observability.error_tracker.track_error(e, {'file': self.path})
+            return
+        if content is None:
+            if self._version == 0 and self._watcher.signature is None:
+                logger.error("%s", ERROR_MESSAGES["FILE_NOT_FOUND"].format(self.path))
+            return
+
+        try:
+            data = json.loads(content.decode("utf-8"))
+            raw_operators = data["operators"]
+        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError) as e:
+            logger.error("%s", ERROR_MESSAGES["JSON_DECODE_ERROR"].format(self.path))
+            observability.error_tracker.track_error(e, {'file': self.path})
+            return
+
+        self._install(tuple(
+            MappingProxyType(dict(op)) for op in raw_operators
+            if isinstance(op, dict) and op.get("name")
+        ))
+
+    def _install(self, operators: Tuple[OperatorRecord, ...]) -> None:
+        """Swap in a new set of records."""
+        self._operators = operators
+        self._by_name = {normalize_operator_name(op["name"]): op for op in operators}
+        self._version += 1
+        logger.info("Loaded %d operators from %s (version %d)", len(operators), self.path, self._version)
+
+    def seed(self, operators: Tuple[OperatorRecord, ...], signature: Tuple[int, int], digest: str) -> None:
+        """
+        Install records compiled ahead of time instead of parsing the file.
+
+        Args:
+            operators: Read-only operator records
+            signature: Signature of the file the records were compiled from
+            digest: SHA-256 hex digest of that file's content
+        """
+        self._install(operators)
+        self._watcher.prime(signature, digest)
+
+    def reload(self) -> None:
+        """Check the file for changes immediately, ignoring the check interval."""
+        self._refresh(force=True)
+
+    def get_operators(self) -> Tuple[OperatorRecord, ...]:
+        """
+        Get all operators.
+
+        Returns:
+            Tuple of read-only operator records (empty if the data could not be loaded)
+        """
+        self._refresh()
+        return self._operators
+
+    def get(self, name: str) -> Optional[OperatorRecord]:
+        """
+        Find an operator by name (case-insensitive).
+
+        Args:
+            name: Operator name
+
+        Returns:
+            The operator record, or None if unknown
+        """
+        self._refresh()
+        return self._by_name.get(normalize_operator_name(name))
+
+    def names(self) -> List[str]:
+        """Get the names of all operators."""
+        return [op["name"] for op in self.get_operators()]
+
+
+# Global operator repository instance
+operator_repository = OperatorRepository()
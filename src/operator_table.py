@@ -0,0 +1,224 @@
+"""
+Columnar operator table for the Discord bot.
+Dictionary-encodes every hint attribute into NumPy code columns and keeps a
+packed bitset per attribute value, so filtered selections and candidate counts
+are vectorized bitwise operations instead of scans over the operator dicts.
+"""
+
+import re
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from constants import ARKDLE_HINT_FIELDS
+from logging_utils import get_logger
+from operator_repository import OperatorRecord, operator_repository
+from utils import normalize_operator_name
+
+logger = get_logger(__name__)
+
+# Number of set bits for every byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+Criterion = Union[str, Iterable[str]]
+
+
+def parse_rarity(value: Optional[str]) -> int:
+    """
+    Extract the star count from a rarity label such as "6 estrelas".
+
+    Returns:
+        Number of stars, or 0 if the label has no number
+    """
+    match = re.search(r"\d+", value or "")
+    return int(match.group()) if match else 0
+
+
+class OperatorTable:
+    """Immutable, dictionary-encoded table of operator attributes."""
+
+    def __init__(self, records: Sequence[OperatorRecord], fields: Sequence[str] = ARKDLE_HINT_FIELDS):
+        """
+        Build the table.
+
+        Args:
+            records: Operator records (e.g. from the operator repository)
+            fields: Attributes to encode
+        """
+        self.records: Tuple[OperatorRecord, ...] = tuple(records)
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self.size = len(self.records)
+        self.names: Tuple[str, ...] = tuple(op["name"] for op in self.records)
+        self.index_by_name: Dict[str, int] = {
+            normalize_operator_name(name): i for i, name in enumerate(self.names)
+        }
+
+        self.vocabularies: Dict[str, List[str]] = {}
+        self._value_codes: Dict[str, Dict[str, int]] = {}
+        self.codes = np.zeros((self.size, len(self.fields)), dtype=np.int16)
+        self.bitsets: Dict[str, np.ndarray] = {}
+
+        for column, field in enumerate(self.fields):
+            vocabulary: List[str] = []
+            lookup: Dict[str, int] = {}
+            for row, op in enumerate(self.records):
+                value = op.get(field) or "Unknown"
+                key = value.strip().lower()
+                if key not in lookup:
+                    lookup[key] = len(vocabulary)
+                    vocabulary.append(value)
+                self.codes[row, column] = lookup[key]
+            self.vocabularies[field] = vocabulary
+            self._value_codes[field] = lookup
+            one_hot = self.codes[:, column][None, :] == np.arange(len(vocabulary))[:, None]
+            self.bitsets[field] = np.packbits(one_hot, axis=1)
+
+        self.rarity = np.array([parse_rarity(op.get("rarity")) for op in self.records], dtype=np.int8)
+        self._all = np.packbits(np.ones(self.size, dtype=bool))
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state["records"] = tuple(dict(op) for op in self.records)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        state["records"] = tuple(MappingProxyType(op) for op in state["records"])
+        self.__dict__.update(state)
+
+    def column(self, field: str) -> np.ndarray:
+        """Code column of an attribute (codes index into vocabularies[field])."""
+        return self.codes[:, self.fields.index(field)]
+
+    def code_of(self, field: str, value: str) -> Optional[int]:
+        """Code of an attribute value (case-insensitive), or None if no operator has it."""
+        return self._value_codes[field].get(value.strip().lower())
+
+    def all(self) -> np.ndarray:
+        """Bitset containing every operator."""
+        return self._all.copy()
+
+    def bitset(self, field: str, value: str) -> np.ndarray:
+        """
+        Bitset of the operators with the given attribute value.
+
+        Args:
+            field: Attribute name
+            value: Attribute value (case-insensitive)
+
+        Returns:
+            Packed bitset (empty if no operator has the value)
+        """
+        code = self.code_of(field, value)
+        if code is None:
+            return np.zeros_like(self._all)
+        return self.bitsets[field][code]
+
+    def select(self, criteria: Optional[Mapping[str, Criterion]] = None,
+               min_rarity: Optional[int] = None,
+               max_rarity: Optional[int] = None) -> np.ndarray:
+        """
+        Bitset of the operators matching every criterion.
+
+        Args:
+            criteria: {field: value or iterable of accepted values}; values of
+                one field are OR'ed, fields are AND'ed
+            min_rarity: Minimum star count (inclusive)
+            max_rarity: Maximum star count (inclusive)
+
+        Returns:
+            Packed bitset of the matching operators
+        """
+        bits = self.all()
+        for field, accepted in (criteria or {}).items():
+            values = [accepted] if isinstance(accepted, str) else list(accepted)
+            field_bits = np.zeros_like(bits)
+            for value in values:
+                field_bits |= self.bitset(field, value)
+            bits &= field_bits
+        if min_rarity is not None or max_rarity is not None:
+            in_range = np.ones(self.size, dtype=bool)
+            if min_rarity is not None:
+                in_range &= self.rarity >= min_rarity
+            if max_rarity is not None:
+                in_range &= self.rarity <= max_rarity
+            bits &= np.packbits(in_range)
+        return bits
+
+    @staticmethod
+    def count(bits: np.ndarray) -> int:
+        """Number of operators in a bitset."""
+        return int(_POPCOUNT[bits].sum())
+
+    def indices(self, bits: np.ndarray) -> np.ndarray:
+        """Row indices of the operators in a bitset."""
+        return np.flatnonzero(np.unpackbits(bits, count=self.size))
+
+    def names_for(self, bits: np.ndarray) -> List[str]:
+        """Names of the operators in a bitset."""
+        return [self.names[i] for i in self.indices(bits)]
+
+    def sample(self, bits: np.ndarray, rng: Optional[np.random.Generator] = None) -> Optional[OperatorRecord]:
+        """
+        Pick a random operator from a bitset.
+
+        Returns:
+            The operator record, or None if the bitset is empty
+        """
+        candidates = self.indices(bits)
+        if candidates.size == 0:
+            return None
+        rng = rng or np.random.default_rng()
+        return self.records[int(rng.choice(candidates))]
+
+    def compare(self, guess: int, target: int) -> Tuple[np.ndarray, int]:
+        """
+        Compare two operators attribute by attribute, Wordle style.
+
+        Args:
+            guess: Row index of the guessed operator
+            target: Row index of the operator to find
+
+        Returns:
+            (boolean match per field in self.fields order,
+             sign of target rarity minus guessed rarity: 1 = target is rarer, -1 = less rare)
+        """
+        matches = self.codes[guess] == self.codes[target]
+        direction = int(np.sign(int(self.rarity[target]) - int(self.rarity[guess])))
+        return matches, direction
+
+    def find(self, name: str) -> Optional[int]:
+        """Row index of an operator by name (case-insensitive)."""
+        return self.index_by_name.get(normalize_operator_name(name))
+
+
+_table: Optional[OperatorTable] = None
+_table_version = -1
+
+
+def get_operator_table() -> OperatorTable:
+    """
+    Get the table for the current operator data, rebuilding it after a reload.
+
+    Returns:
+        The shared operator table
+    """
+    global _table, _table_version
+    version = operator_repository.version
+    if _table is None or version != _table_version:
+        _table = OperatorTable(operator_repository.get_operators())
+        _table_version = version
+        logger.info("Built operator table with %d operators", _table.size)
+    return _table
+
+
+def seed_operator_table(table: OperatorTable) -> None:
+    """
+    Use a table compiled ahead of time for the current operator data.
+
+    Args:
+        table: Table built from the records the repository currently serves
+    """
+    global _table, _table_version
+    _table = table
+    _table_version = operator_repository.version
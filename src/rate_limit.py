@@ -0,0 +1,184 @@
+"""
+Rate limiting for the Discord bot's guess commands.
+Each user has a token bucket shared by the guess commands, and each guild has
+one per command, so a busy Guess Who round does not use up the budget of the
+Arkdle commands: a burst of guesses is allowed, and tokens come back at a
+steady rate. A bucket only stores its token count
+and the time it was last touched; buckets that had time to refill completely
+are dropped, since a missing bucket behaves exactly like a full one.
+"""
+
+import functools
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+from constants import (
+    GUESS_RATE_LIMIT_USER, GUESS_RATE_LIMIT_GUILD, RATE_LIMIT_MAX_BUCKETS,
+    ENV_GUESS_RATE_LIMIT_USER, ENV_GUESS_RATE_LIMIT_GUILD
+)
+from logging_utils import get_logger
+from observability import observability
+
+logger = get_logger(__name__)
+
+
+def parse_limit(text: str) -> Tuple[float, float]:
+    """
+    Parse a "<count>/<seconds>" limit.
+
+    Args:
+        text: Limit such as "5/10" (a burst of 5, refilled over 10 seconds)
+
+    Returns:
+        (burst, tokens per second)
+
+    Raises:
+        ValueError: If the text is not a valid limit
+    """
+    count, _, seconds = text.partition("/")
+    burst, period = float(count), float(seconds)
+    if burst <= 0 or period <= 0:
+        raise ValueError(f"Invalid rate limit: {text!r}")
+    return burst, burst / period
+
+
+def configured_limit(env_var: str, default: str) -> Tuple[float, float]:
+    """Limit from the environment, or the default if it is unset or invalid."""
+    try:
+        return parse_limit(os.getenv(env_var, default))
+    except ValueError:
+        logger.warning("Invalid %s, using %s", env_var, default)
+        return parse_limit(default)
+
+
+class TokenBuckets:
+    """Token buckets keyed by user or guild, expiring once they are full again."""
+
+    def __init__(self, burst: float, rate: float, max_buckets: int = RATE_LIMIT_MAX_BUCKETS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the buckets.
+
+        Args:
+            burst: Bucket capacity
+            rate: Tokens added per second
+            max_buckets: Buckets kept before the least recently used are dropped
+            clock: Time source (mainly for tests)
+        """
+        self.burst = burst
+        self.rate = rate
+        self.max_buckets = max_buckets
+        self.clock = clock
+        self.refill_seconds = burst / rate
+        # key -> (tokens, last update), least recently updated first
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _tokens(self, key: Hashable, now: float) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return self.burst
+        tokens, updated = entry
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def retry_after(self, key: Hashable, cost: float = 1.0, now: Optional[float] = None) -> float:
+        """Seconds until the key can spend cost tokens (0 if it can now)."""
+        now = self.clock() if now is None else now
+        missing = cost - self._tokens(key, now)
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, key: Hashable, cost: float = 1.0, now: Optional[float] = None) -> None:
+        """Spend tokens of a key (callers check retry_after first)."""
+        now = self.clock() if now is None else now
+        self._buckets[key] = (self._tokens(key, now) - cost, now)
+        self._buckets.move_to_end(key)
+        self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        """Drop buckets that are full again; only the stale prefix of the order is visited."""
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if now - updated < self.refill_seconds and len(self._buckets) <= self.max_buckets:
+                break
+            del self._buckets[key]
+
+
+class RateLimiter:
+    """Per-user and per-guild limits for one family of commands."""
+
+    def __init__(self, name: str, user_limit: Optional[Tuple[float, float]] = None,
+                 guild_limit: Optional[Tuple[float, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Name used in metrics and logs
+            user_limit: (burst, tokens per second) per user (defaults to the configuration)
+            guild_limit: (burst, tokens per second) per guild (same defaults)
+            clock: Time source (mainly for tests)
+        """
+        self.name = name
+        self.clock = clock
+        user_limit = user_limit or configured_limit(ENV_GUESS_RATE_LIMIT_USER, GUESS_RATE_LIMIT_USER)
+        guild_limit = guild_limit or configured_limit(ENV_GUESS_RATE_LIMIT_GUILD, GUESS_RATE_LIMIT_GUILD)
+        self.users = TokenBuckets(*user_limit, clock=clock)
+        self.guilds = TokenBuckets(*guild_limit, clock=clock)
+
+    def check(self, user_id: Hashable, guild_id: Optional[Hashable] = None,
+              command: Optional[str] = None) -> float:
+        """
+        Spend one token of the user and of the guild, if both have one.
+
+        Args:
+            user_id: User ID
+            guild_id: Guild ID (None in DMs, where only the user is limited)
+            command: Command name; each command has its own guild bucket
+
+        Returns:
+            0 if the call is allowed, else the seconds to wait before retrying
+        """
+        now = self.clock()
+        guild_key = (guild_id, command)
+        user_wait = self.users.retry_after(user_id, now=now)
+        guild_wait = self.guilds.retry_after(guild_key, now=now) if guild_id is not None else 0.0
+        if user_wait or guild_wait:
+            scope = "user" if user_wait >= guild_wait else "guild"
+            observability.metrics.increment("rate_limited", {"limiter": self.name, "scope": scope})
+            return max(user_wait, guild_wait)
+        self.users.take(user_id, now=now)
+        if guild_id is not None:
+            self.guilds.take(guild_key, now=now)
+        return 0.0
+
+
+# Shared limiter of the guess commands
+guess_limiter = RateLimiter("guess")
+
+
+def rate_limited(command_name: str, limiter: Optional[RateLimiter] = None):
+    """Decorator that answers over-limit calls with an ephemeral message instead of running them."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            ctx = next((arg for arg in args if hasattr(arg, 'author')), None)
+            if ctx is None:
+                return await func(*args, **kwargs)
+            wait = (limiter or guess_limiter).check(
+                str(ctx.author.id), str(ctx.guild.id) if ctx.guild else None, command_name
+            )
+            if wait:
+                logger.debug("Rate limited %s for user %s", command_name, ctx.author.id)
+                await ctx.send(
+                    f"Você está enviando palpites rápido demais. Tente novamente em {math.ceil(wait)}s.",
+                    ephemeral=True,
+                )
+                return None
+            return await func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,358 @@
+"""
+Crash-safe persistence of game rounds for the Discord bot.
+Every round event published by the GameStateManager is appended to a JSON
+Lines journal; events are buffered and written in batches, so a guess costs a
+list append. Once enough events pile up, the rounds in progress are written
+to a snapshot and the journal starts over. On boot, the snapshot is loaded
+and the journal entries after it are replayed, so rounds survive restarts.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from bot_types import GameRound, GameState
+from constants import (
+    ROUND_JOURNAL_PATH, ROUND_SNAPSHOT_PATH, ROUND_JOURNAL_FLUSH_EVENTS,
+    ROUND_JOURNAL_SNAPSHOT_EVENTS, ERROR_MESSAGES
+)
+from game_state import ARKDLE, GameStateManager, UserGameState
+from logging_utils import get_logger
+from observability import observability
+from round_store import RoundKey
+
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Serialized rounds keyed by (game, guild, channel)
+RoundRecords = Dict[Tuple[str, Optional[str], str], Dict[str, Any]]
+
+
+def round_to_record(game: str, key: RoundKey, game_round: GameRound) -> Dict[str, Any]:
+    """Serialize a round in progress to a JSON-compatible dict."""
+    return {
+        "game": game,
+        "key": list(key),
+        "round_id": game_round.round_id,
+        "operator": game_round.current_operator,
+        "correct_answer": list(game_round.correct_answer or []),
+        "answer_set": sorted(game_round.answer_set),
+        "image_ref": game_round.image_ref,
+        "start_time": game_round.start_time,
+        "operator_data": dict(game_round.operator_data) if game_round.operator_data is not None else None,
+        "hint_fields": list(game_round.hint_fields),
+        "answers": [
+            [user_id, game_round.answers[user_id], elapsed]
+            for user_id, elapsed in zip(game_round.guess_users, game_round.guess_times)
+        ],
+        "competitive": game_round.competitive,
+        "match_id": game_round.match_id,
+        "winners": list(game_round.winners),
+        "users": [
+            [user_id, state.hint_index, state.last_guess]
+            for user_id, state in game_round.user_states.items()
+        ],
+    }
+
+
+def round_from_record(record: Dict[str, Any]) -> Tuple[str, RoundKey, GameRound]:
+    """Rebuild (game, key, round) from a serialized round."""
+    operator = record.get("operator")
+    correct_answer = record.get("correct_answer") or [(operator or "").lower()]
+    game_round = GameRound(
+        round_id=record["round_id"],
+        state=GameState.IN_PROGRESS,
+        current_operator=operator,
+        correct_answer=correct_answer,
+        start_time=record.get("start_time"),
+        answer_set=frozenset(record.get("answer_set") or correct_answer),
+        operator_data=record.get("operator_data"),
+        hint_fields=tuple(record.get("hint_fields") or ()),
+        image_ref=record.get("image_ref"),
+        competitive=record.get("competitive", False),
+        match_id=record.get("match_id"),
+    )
+    if game_round.start_time:
+        # perf_counter() restarts with the process: shift the origin by the wall-clock time elapsed
+        elapsed = (datetime.now() - datetime.fromisoformat(game_round.start_time)).total_seconds()
+        game_round.started_at = time.perf_counter() - elapsed
+    for user_id, guess, *elapsed in record.get("answers", []):
+        if guess in game_round.answer_set:
+            game_round.correct_indices.append(len(game_round.guess_users))
+        game_round.answers[user_id] = guess
+        game_round.guess_users.append(user_id)
+        game_round.guess_times.append(elapsed[0] if elapsed else 0.0)
+    game_round.winners = set(record.get("winners", []))
+    for user_id, hint_index, last_guess in record.get("users", []):
+        game_round.user_states[user_id] = UserGameState(
+            user_id=user_id,
+            hint_index=hint_index,
+            has_won=user_id in game_round.winners,
+            last_guess=last_guess,
+        )
+    guild_id, channel_id = record["key"]
+    return record["game"], (guild_id, channel_id), game_round
+
+
+def _user(record: Dict[str, Any], user_id: Any) -> List[Any]:
+    """[user_id, hint_index, last_guess] entry of a serialized Arkdle round."""
+    for user in record["users"]:
+        if user[0] == user_id:
+            return user
+    user = [user_id, 1, None]
+    record["users"].append(user)
+    return user
+
+
+def _answer(record: Dict[str, Any], user_id: Any, guess: str, elapsed: float) -> None:
+    """Record a Guess Who answer in a serialized round."""
+    record["answers"].append([user_id, guess, elapsed])
+    accepted = record.get("answer_set") or record.get("correct_answer") or []
+    if guess in accepted:
+        record["winners"].append(user_id)
+
+
+def apply_event(records: RoundRecords, entry: Dict[str, Any]) -> None:
+    """
+    Replay one journal entry on serialized rounds.
+
+    Args:
+        records: Rounds being rebuilt, updated in place
+        entry: Journal entry ({"seq", "event", "game", "key", "data"})
+    """
+    game, event, data = entry["game"], entry["event"], entry["data"]
+    guild_id, channel_id = entry["key"]
+    slot = (game, guild_id, channel_id)
+    if event == "round_started":
+        records[slot] = {
+            "game": game,
+            "key": [guild_id, channel_id],
+            "round_id": data["round_id"],
+            "operator": data.get("operator"),
+            "correct_answer": data.get("correct_answer"),
+            "answer_set": data.get("answer_set"),
+            "image_ref": data.get("image_ref"),
+            "competitive": data.get("competitive", False),
+            "match_id": data.get("match_id"),
+            "start_time": data.get("start_time"),
+            "operator_data": data.get("operator_data"),
+            "hint_fields": data.get("hint_fields") or [],
+            "answers": [],
+            "winners": [],
+            "users": [],
+        }
+        return
+    if event == "round_ended":
+        records.pop(slot, None)
+        return
+    record = records.get(slot)
+    if record is None:
+        return
+    user_id = data.get("user_id")
+    if event == "guess":
+        if game == ARKDLE:
+            _user(record, user_id)[2] = data["guess"]
+        else:
+            _answer(record, user_id, data["guess"], data.get("elapsed", 0.0))
+    elif event == "guesses":
+        for user_id, guess, *elapsed in data["guesses"]:
+            _answer(record, user_id, guess, elapsed[0] if elapsed else 0.0)
+    elif event == "hint":
+        _user(record, user_id)[1] = data["hint_index"]
+    elif event == "round_won":
+        _user(record, user_id)[1] = data["hints_used"]
+        if user_id not in record["winners"]:
+            record["winners"].append(user_id)
+
+
+class RoundJournal:
+    """Append-only event journal plus periodic snapshot of the rounds in progress."""
+
+    def __init__(self, path: str = ROUND_JOURNAL_PATH, snapshot_path: str = ROUND_SNAPSHOT_PATH,
+                 flush_events: int = ROUND_JOURNAL_FLUSH_EVENTS,
+                 snapshot_events: int = ROUND_JOURNAL_SNAPSHOT_EVENTS):
+        """
+        Initialize the journal. Nothing is read or written until attach().
+
+        Args:
+            path: JSON Lines file receiving the events
+            snapshot_path: JSON file holding the last snapshot
+            flush_events: Buffered events that trigger a write (flush() also runs on a timer)
+            snapshot_events: Journaled events that trigger a new snapshot
+        """
+        self.path = Path(path)
+        self.snapshot_path = Path(snapshot_path)
+        self.flush_events = flush_events
+        self.snapshot_events = snapshot_events
+        self.manager: Optional[GameStateManager] = None
+        self._buffer: List[Dict[str, Any]] = []
+        self._seq = 0
+        self._since_snapshot = 0
+        self._lock = threading.Lock()
+
+    def attach(self, manager: GameStateManager) -> int:
+        """
+        Restore the saved rounds into a manager and start journaling its events.
+
+        Args:
+            manager: Game state manager
+
+        Returns:
+            Number of rounds restored
+        """
+        self.manager = manager
+        restored = self.restore(manager)
+        manager.subscribe(self.record)
+        atexit.register(self.flush)
+        return restored
+
+    # Writing
+
+    def record(self, event: str, game: str, key: RoundKey, data: Dict[str, Any]) -> None:
+        """Buffer an event (GameStateManager listener); writes once the batch is full."""
+        with self._lock:
+            self._seq += 1
+            self._buffer.append({"seq": self._seq, "event": event, "game": game,
+                                 "key": list(key), "data": data})
+            full = len(self._buffer) >= self.flush_events
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write the buffered events in one append, then snapshot if the journal grew enough.
+
+        Returns:
+            Number of events written
+        """
+        with self._lock:
+            if not self._buffer:
+                return 0
+            entries, self._buffer = self._buffer, []
+            try:
+                lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except (OSError, TypeError, ValueError) as e:
+                logger.error("%s", ERROR_MESSAGES["SAVE_ERROR"].format(e))
+                observability.error_tracker.track_error(e, {'file': str(self.path)})
+                return 0
+            observability.metrics.increment("round_journal_writes")
+            self._since_snapshot += len(entries)
+            if self._since_snapshot >= self.snapshot_events:
+                self._snapshot()
+        return len(entries)
+
+    def snapshot(self) -> None:
+        """Write the buffered events and a snapshot of every round in progress."""
+        self.flush()
+        with self._lock:
+            self._snapshot()
+
+    def _snapshot(self) -> None:
+        """Snapshot the manager's rounds and empty the journal (caller holds the lock)."""
+        if self.manager is None:
+            return
+        rounds = [round_to_record(game, key, game_round)
+                  for game, key, game_round in self.manager.iter_rounds()]
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": SNAPSHOT_VERSION, "seq": self._seq, "rounds": rounds},
+                          f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.snapshot_path)
+            # Entries up to seq are in the snapshot; if this truncation is lost, restore skips them
+            with open(self.path, "w", encoding="utf-8"):
+                pass
+        except (OSError, TypeError, ValueError) as e:
+            logger.error("%s", ERROR_MESSAGES["SAVE_ERROR"].format(e))
+            observability.error_tracker.track_error(e, {'file': str(self.snapshot_path)})
+            return
+        self._since_snapshot = 0
+        logger.info("Snapshotted %d rounds at journal entry %d", len(rounds), self._seq)
+
+    # Reading
+
+    def _load_snapshot(self) -> Tuple[int, RoundRecords]:
+        """Sequence number and rounds of the snapshot (empty if missing or invalid)."""
+        if not self.snapshot_path.exists():
+            return 0, {}
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                logger.warning("Ignoring round snapshot %s with unsupported version", self.snapshot_path)
+                return 0, {}
+            records = {
+                (record["game"], record["key"][0], record["key"][1]): record
+                for record in snapshot["rounds"]
+            }
+            return snapshot["seq"], records
+        except (OSError, json.JSONDecodeError, AttributeError, KeyError, IndexError, TypeError) as e:
+            logger.error("%s", ERROR_MESSAGES["LOAD_ERROR"].format(e))
+            return 0, {}
+
+    def _replay(self, seq: int, records: RoundRecords) -> int:
+        """Apply the journal entries after seq; returns the last sequence number seen."""
+        if not self.path.exists():
+            return seq
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for number, line in enumerate(f, 1):
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-write can leave a torn last line
+                        logger.warning("Skipping unreadable round journal line %d", number)
+                        continue
+                    if entry["seq"] <= seq:
+                        continue
+                    apply_event(records, entry)
+                    seq = entry["seq"]
+        except (OSError, KeyError, IndexError, TypeError, ValueError) as e:
+            logger.error("%s", ERROR_MESSAGES["LOAD_ERROR"].format(e))
+        return seq
+
+    def restore(self, manager: GameStateManager) -> int:
+        """
+        Load the snapshot, replay the journal after it and hand the rounds to a manager.
+
+        Args:
+            manager: Game state manager receiving the rounds
+
+        Returns:
+            Number of rounds restored
+        """
+        started = time.perf_counter()
+        with self._lock:
+            seq, records = self._load_snapshot()
+            self._seq = self._replay(seq, records)
+        restored = 0
+        for record in records.values():
+            try:
+                game, key, game_round = round_from_record(record)
+                manager.restore_round(game, key, game_round)
+                restored += 1
+            except (KeyError, TypeError, ValueError) as e:
+                observability.error_tracker.track_error(e, {'operation': 'restore_round'})
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        observability.metrics.gauge("round_journal_restore_ms", elapsed_ms)
+        if restored:
+            logger.info("Restored %d rounds in %.1f ms", restored, elapsed_ms)
+        return restored
+
+
+# Global round journal instance
+round_journal = RoundJournal()
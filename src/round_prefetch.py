@@ -0,0 +1,112 @@
+"""
+Background preparation of upcoming game rounds.
+Keeps a small per-guild queue of rounds that were already selected and
+rendered, refilled by worker tasks on the event loop, so starting a round only
+has to pop a ready item.
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+from constants import ROUND_PREFETCH_DEPTH, ROUND_PREFETCH_MAX_GUILDS
+from logging_utils import get_logger
+from observability import observability
+
+logger = get_logger(__name__)
+
+
+class RoundPrefetcher:
+    """Per-guild queue of pre-built rounds, refilled in worker threads."""
+
+    def __init__(self, name: str, prepare: Callable[[Hashable], Any],
+                 depth: int = ROUND_PREFETCH_DEPTH,
+                 max_guilds: int = ROUND_PREFETCH_MAX_GUILDS):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            name: Name used in metrics and logs (e.g. "guess_who")
+            prepare: Blocking function building one round for a guild; run with asyncio.to_thread
+            depth: Number of ready rounds to keep per guild
+            max_guilds: Maximum number of guild queues kept (least recently used are dropped)
+        """
+        self.name = name
+        self.prepare = prepare
+        self.depth = depth
+        self.max_guilds = max_guilds
+        self._queues: "OrderedDict[Hashable, Deque[Any]]" = OrderedDict()
+        self._workers: Dict[Hashable, asyncio.Task] = {}
+
+    def pop(self, guild_id: Hashable) -> Optional[Any]:
+        """
+        Take a ready round for a guild.
+
+        Args:
+            guild_id: Guild the round is for
+
+        Returns:
+            A prepared round, or None if the queue is empty
+        """
+        queue = self._queues.get(guild_id)
+        if queue:
+            self._queues.move_to_end(guild_id)
+            observability.metrics.increment("round_prefetch_hit", {"game": self.name})
+            return queue.popleft()
+        observability.metrics.increment("round_prefetch_miss", {"game": self.name})
+        return None
+
+    def pending(self, guild_id: Hashable) -> int:
+        """Number of ready rounds queued for a guild."""
+        return len(self._queues.get(guild_id, ()))
+
+    def refill(self, guild_id: Hashable) -> Optional[asyncio.Task]:
+        """
+        Start a worker that tops the guild's queue up to the configured depth.
+
+        Must be called from the event loop. Does nothing if a worker for this
+        guild is already running or the queue is full.
+
+        Args:
+            guild_id: Guild to refill
+
+        Returns:
+            The worker task, if one was started
+        """
+        worker = self._workers.get(guild_id)
+        if worker and not worker.done():
+            return worker
+        if self.pending(guild_id) >= self.depth:
+            return None
+        task = asyncio.get_running_loop().create_task(self._fill(guild_id))
+        self._workers[guild_id] = task
+        return task
+
+    async def _fill(self, guild_id: Hashable) -> None:
+        """Worker body: prepare rounds off the event loop until the queue is full."""
+        try:
+            while self.pending(guild_id) < self.depth:
+                prepared = await asyncio.to_thread(self.prepare, guild_id)
+                if prepared is None:
+                    break
+                queue = self._queues.setdefault(guild_id, deque())
+                queue.append(prepared)
+                self._queues.move_to_end(guild_id)
+                logger.debug("Prefetched %s round for guild %s (%d ready)", self.name, guild_id, len(queue))
+                while len(self._queues) > self.max_guilds:
+                    self._queues.popitem(last=False)
+        except Exception as e:
+            observability.error_tracker.track_error(e, {
+                'operation': 'round_prefetch',
+                'game': self.name,
+                'guild_id': str(guild_id)
+            })
+        finally:
+            self._workers.pop(guild_id, None)
+
+    def clear(self, guild_id: Optional[Hashable] = None) -> None:
+        """Drop the queued rounds of one guild, or of every guild."""
+        if guild_id is None:
+            self._queues.clear()
+        else:
+            self._queues.pop(guild_id, None)
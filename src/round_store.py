@@ -0,0 +1,179 @@
+"""
+In-memory store of game rounds for the Discord bot.
+Rounds are keyed by (guild, channel), so every channel of every server can
+run its own game. Lookups are dictionary hits; the store keeps entries in
+least-recently-used order, which bounds its size and lets idle rounds be
+evicted from the front without scanning the rest. Pinned rounds (the daily
+rounds, which must last the whole day) are kept apart and never evicted.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+from constants import ROUND_STORE_MAX_ROUNDS, ROUND_STORE_IDLE_SECONDS
+from logging_utils import get_logger
+from observability import observability
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# (guild ID or None in DMs, channel ID)
+RoundKey = Tuple[Optional[str], str]
+
+
+def round_key(ctx: Any) -> RoundKey:
+    """
+    Key of the round a command belongs to.
+
+    Args:
+        ctx: Interaction context
+
+    Returns:
+        (guild ID, channel ID)
+    """
+    return (str(ctx.guild.id) if ctx.guild else None, str(ctx.channel_id))
+
+
+DAILY_ROUND_PREFIX = "daily:"
+
+
+def daily_round_key(guild_id: Optional[str], day: date) -> RoundKey:
+    """
+    Key of a guild's daily round, which belongs to no channel.
+
+    Args:
+        guild_id: Guild ID (None in DMs)
+        day: Day of the round
+
+    Returns:
+        (guild ID, "daily:<ISO date>")
+    """
+    return (guild_id, f"{DAILY_ROUND_PREFIX}{day.isoformat()}")
+
+
+def is_daily_key(key: RoundKey) -> bool:
+    """Whether a key is a daily round's rather than a channel's."""
+    return key[1].startswith(DAILY_ROUND_PREFIX)
+
+
+class RoundStore(Generic[T]):
+    """Bounded, idle-evicting map of round key to round state."""
+
+    def __init__(self, name: str, max_rounds: int = ROUND_STORE_MAX_ROUNDS,
+                 idle_seconds: float = ROUND_STORE_IDLE_SECONDS,
+                 on_evict: Optional[Callable[[Hashable, T], None]] = None,
+                 pinned: Optional[Callable[[Hashable], bool]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the store.
+
+        Args:
+            name: Game name used in metrics and logs
+            max_rounds: Maximum number of rounds kept (least recently used are dropped)
+            idle_seconds: Rounds untouched for this long are dropped
+            on_evict: Called with (key, round) when a round is dropped for size or idleness
+            pinned: Whether a key's round is exempt from idle and capacity eviction
+            clock: Time source (mainly for tests)
+        """
+        self.name = name
+        self.max_rounds = max_rounds
+        self.idle_seconds = idle_seconds
+        self.on_evict = on_evict
+        self.pinned = pinned
+        self.clock = clock
+        self._rounds: "OrderedDict[Hashable, Tuple[T, float]]" = OrderedDict()
+        self._pinned: Dict[Hashable, T] = {}
+
+    def __len__(self) -> int:
+        return len(self._rounds) + len(self._pinned)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._rounds) + list(self._pinned))
+
+    def _is_pinned(self, key: Hashable) -> bool:
+        return self.pinned is not None and self.pinned(key)
+
+    def _expired(self, last_used: float, now: float) -> bool:
+        return now - last_used >= self.idle_seconds
+
+    def _evict(self, key: Hashable, reason: str) -> None:
+        value, _ = self._rounds.pop(key)
+        observability.metrics.increment("round_store_evictions", {"game": self.name, "reason": reason})
+        logger.info("Evicted %s round %s (%s)", self.name, key, reason)
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def get(self, key: Hashable) -> Optional[T]:
+        """
+        Get a round and mark it as used.
+
+        Returns:
+            The round, or None if there is none or it went idle
+        """
+        if key in self._pinned:
+            return self._pinned[key]
+        entry = self._rounds.get(key)
+        if entry is None:
+            return None
+        now = self.clock()
+        if self._expired(entry[1], now):
+            self._evict(key, "idle")
+            return None
+        self._rounds[key] = (entry[0], now)
+        self._rounds.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key: Hashable) -> Optional[T]:
+        """Get a round without marking it as used or evicting it."""
+        if key in self._pinned:
+            return self._pinned[key]
+        entry = self._rounds.get(key)
+        return entry[0] if entry else None
+
+    def set(self, key: Hashable, value: T) -> None:
+        """Store a round, evicting idle rounds and, if still full, the least recently used ones."""
+        if self._is_pinned(key):
+            self._pinned[key] = value
+            return
+        now = self.clock()
+        self._rounds[key] = (value, now)
+        self._rounds.move_to_end(key)
+        self.evict_idle(now)
+        while len(self._rounds) > self.max_rounds:
+            self._evict(next(iter(self._rounds)), "capacity")
+        observability.metrics.gauge("round_store_size", len(self._rounds), {"game": self.name})
+
+    def pop(self, key: Hashable) -> Optional[T]:
+        """Remove a round (e.g. when it ends) and return it."""
+        if key in self._pinned:
+            return self._pinned.pop(key)
+        entry = self._rounds.pop(key, None)
+        return entry[0] if entry else None
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Drop every idle round. Only the expired prefix of the LRU order is visited.
+
+        Returns:
+            Number of rounds dropped
+        """
+        now = self.clock() if now is None else now
+        evicted = 0
+        while self._rounds:
+            key, (_, last_used) = next(iter(self._rounds.items()))
+            if not self._expired(last_used, now):
+                break
+            self._evict(key, "idle")
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        """Drop every round."""
+        self._rounds.clear()
+        self._pinned.clear()
@@ -0,0 +1,217 @@
+"""
+Shuffle-bag operator selection for the Discord bot.
+Each guild draws from a persisted, shuffled deck per pool, so every operator
+comes up once per cycle before any repeats. Draws are a cursor increment;
+weighted decks are ordered with Efraimidis-Spirakis keys so heavier operators
+tend to come earlier in the cycle without ever appearing twice. Decks changed
+by draws are written in batches: after a number of draws and on a timer.
+"""
+
+import json
+import os
+import random
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from constants import SELECTION_STATE_PATH, SELECTION_FLUSH_DRAWS, ERROR_MESSAGES
+from logging_utils import get_logger
+from observability import observability
+
+logger = get_logger(__name__)
+
+STATE_VERSION = 1
+
+Weight = Callable[[str], float]
+
+
+def weighted_order(items: Sequence[str], weight: Optional[Weight] = None,
+                   rng: Optional[random.Random] = None) -> List[str]:
+    """
+    Random permutation of the items, biased by weight.
+
+    Each item gets the key u ** (1 / w) for a uniform u, and sorting by key
+    yields a weighted sample without replacement (Efraimidis-Spirakis).
+
+    Args:
+        items: Items to order
+        weight: Positive weight per item (uniform shuffle if omitted)
+        rng: Random source
+
+    Returns:
+        The items in drawing order
+    """
+    rng = rng or random
+    order = list(items)
+    if weight is None:
+        rng.shuffle(order)
+        return order
+    keys = {item: rng.random() ** (1.0 / max(weight(item), 1e-6)) for item in order}
+    order.sort(key=keys.__getitem__, reverse=True)
+    return order
+
+
+class SelectionScheduler:
+    """Per-guild shuffle bags that survive restarts."""
+
+    def __init__(self, path: str = SELECTION_STATE_PATH, rng: Optional[random.Random] = None,
+                 flush_draws: int = SELECTION_FLUSH_DRAWS):
+        """
+        Initialize the scheduler. The state file is read on first use.
+
+        Args:
+            path: JSON file holding the decks
+            rng: Random source (mainly for tests)
+            flush_draws: Unsaved draws that trigger a write (flush() also runs on a timer)
+        """
+        self.path = Path(path)
+        self.rng = rng or random.Random()
+        self.flush_draws = flush_draws
+        self._decks: Optional[Dict[str, Dict[str, Any]]] = None
+        self._pools: Dict[str, tuple] = {}
+        self._dirty = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def _key(scope: Hashable, pool: str) -> str:
+        return f"{scope}|{pool}"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Decks from the state file (empty if it is missing or invalid)."""
+        if self._decks is not None:
+            return self._decks
+        self._decks = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                if state.get("version") == STATE_VERSION:
+                    self._decks = state.get("decks", {})
+                else:
+                    logger.warning("Ignoring selection state %s with unsupported version", self.path)
+            except (OSError, json.JSONDecodeError, AttributeError) as e:
+                logger.error("%s", ERROR_MESSAGES["LOAD_ERROR"].format(e))
+        return self._decks
+
+    def flush(self) -> None:
+        """
+        Write the decks atomically if any changed since the last write. The
+        state is serialized under the draw lock but written outside it, so
+        draws never wait on the disk. Failures are logged, not raised
+        (selection still works).
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = json.dumps({"version": STATE_VERSION, "decks": self._decks}, ensure_ascii=False)
+                self._dirty = 0
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_name(self.path.name + ".tmp")
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.error("%s", ERROR_MESSAGES["SAVE_ERROR"].format(e))
+                observability.error_tracker.track_error(e, {'file': str(self.path)})
+
+    def _reconcile(self, deck: Dict[str, Any], items: Sequence[str], weight: Optional[Weight]) -> None:
+        """Align the undrawn part of a deck with a pool that changed since it was dealt."""
+        if not deck["order"]:
+            return
+        pool = set(items)
+        order, position = deck["order"], deck["position"]
+        remaining = [item for item in order[position:] if item in pool]
+        dealt = set(order)
+        for item in weighted_order([item for item in items if item not in dealt], weight, self.rng):
+            remaining.insert(self.rng.randint(0, len(remaining)), item)
+        deck["order"] = order[:position] + remaining
+
+    def _deal(self, deck: Dict[str, Any], items: Sequence[str], weight: Optional[Weight]) -> None:
+        """Start a new cycle, never opening with the item that closed the previous one."""
+        last = deck["order"][deck["position"] - 1] if deck.get("position") else None
+        order = weighted_order(items, weight, self.rng)
+        if len(order) > 1 and order[0] == last:
+            swap = self.rng.randint(1, len(order) - 1)
+            order[0], order[swap] = order[swap], order[0]
+        deck["order"] = order
+        deck["position"] = 0
+        deck["cycle"] = deck.get("cycle", 0) + 1
+
+    def _next(self, key: str, items: Sequence[str], weight: Optional[Weight],
+              version: Optional[Hashable]) -> str:
+        """Advance a deck by one item (the caller holds the lock)."""
+        decks = self._load()
+        deck = decks.get(key)
+        if deck is None:
+            deck = decks[key] = {"order": [], "position": 0, "cycle": 0}
+        fingerprint = tuple(items) if version is None else version
+        if self._pools.get(key) != fingerprint:
+            self._reconcile(deck, items, weight)
+            self._pools[key] = fingerprint
+        if deck["position"] >= len(deck["order"]):
+            self._deal(deck, items, weight)
+        candidate = deck["order"][deck["position"]]
+        deck["position"] += 1
+        self._dirty += 1
+        return candidate
+
+    def draw(self, scope: Hashable, pool: str, items: Sequence[str],
+             weight: Optional[Weight] = None,
+             accept: Optional[Callable[[str], bool]] = None,
+             version: Optional[Hashable] = None) -> Optional[str]:
+        """
+        Draw the next item of a deck.
+
+        Args:
+            scope: Deck owner, usually the guild ID
+            pool: Name of the pool (e.g. "guess_who" or a filtered Arkdle pool);
+                each pool has its own deck
+            items: Current members of the pool
+            weight: Optional weight per item
+            accept: Optional check, run outside the lock; rejected items are
+                skipped for this cycle
+            version: Token that changes whenever the pool's items do (e.g. the
+                data version), so a draw is O(1); without one the items are
+                compared on every draw
+
+        Returns:
+            The drawn item, or None if the pool is empty or nothing is accepted
+        """
+        if not items:
+            return None
+        key = self._key(scope, pool)
+        drawn = None
+        for _ in range(len(items) + 1):
+            with self._lock:
+                candidate = self._next(key, items, weight, version)
+                flush = self._dirty >= self.flush_draws
+            if flush:
+                self.flush()
+            if accept is None or accept(candidate):
+                drawn = candidate
+                break
+        return drawn
+
+    def remaining(self, scope: Hashable, pool: str) -> int:
+        """Number of items left before the deck is reshuffled."""
+        with self._lock:
+            deck = self._load().get(self._key(scope, pool))
+            return len(deck["order"]) - deck["position"] if deck else 0
+
+    def reset(self, scope: Optional[Hashable] = None) -> None:
+        """Discard the decks of one scope, or every deck."""
+        with self._lock:
+            decks = self._load()
+            prefix = None if scope is None else f"{scope}|"
+            for key in [key for key in decks if prefix is None or key.startswith(prefix)]:
+                del decks[key]
+                self._pools.pop(key, None)
+            self._dirty += 1
+        self.flush()
+
+
+# Global selection scheduler instance
+selection_scheduler = SelectionScheduler()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Silhouette atlas for the Guess Who game.
+A build step renders every playable image once and packs the bit-packed
+silhouette masks into a single binary file, with a JSON offset index by
+operator and image. At runtime the atlas is memory-mapped, so any silhouette
+can be sliced out and encoded without opening or decoding a per-image file.
+
+Usage:
+    python silhouette_atlas.py [--source "Imagens Originais"]
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from constants import (
+    ORIGINAL_IMAGES_FOLDER, SILHOUETTE_ATLAS_PATH, SILHOUETTE_ATLAS_INDEX_PATH, ERROR_MESSAGES
+)
+from exceptions import DataError
+from image_dedup import filter_duplicate_images, load_dedup_catalog
+from image_utils import silhouette_mask, encode_mask_png
+from logging_utils import get_logger
+from silhouette_index import filter_quality_images, load_silhouette_index
+from utils import list_operator_images
+
+logger = get_logger(__name__)
+
+ATLAS_VERSION = 1
+
+
+def build_silhouette_atlas(base_path: str = ORIGINAL_IMAGES_FOLDER,
+                           atlas_path: str = SILHOUETTE_ATLAS_PATH,
+                           index_path: str = SILHOUETTE_ATLAS_INDEX_PATH) -> Dict[str, Any]:
+    """
+    Render every playable image and pack the silhouettes into the atlas.
+
+    Images rejected by the silhouette quality index and near-duplicates that are
+    not their cluster's representative are skipped. Each entry is
+    stored as np.packbits of the flattened boolean mask.
+
+    Args:
+        base_path: Folder containing one subfolder per operator
+        atlas_path: Binary atlas file to write
+        index_path: JSON offset index to write
+
+    Returns:
+        The offset index that was written
+
+    Raises:
+        DataError: If the atlas cannot be written
+    """
+    quality_index = load_silhouette_index()
+    dedup_catalog = load_dedup_catalog()
+    entries: Dict[str, Dict[str, List[int]]] = {}
+    offset = 0
+    tmp_path = f"{atlas_path}.tmp"
+
+    try:
+        Path(atlas_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as atlas:
+            folders = sorted(os.listdir(base_path)) if os.path.isdir(base_path) else []
+            for folder in folders:
+                folder_path = os.path.join(base_path, folder)
+                if not os.path.isdir(folder_path):
+                    continue
+                images = filter_quality_images(folder, list_operator_images(folder_path), quality_index)
+                images = filter_duplicate_images(folder, images, dedup_catalog)
+                for image in images:
+                    try:
+                        mask = silhouette_mask(os.path.join(folder_path, image))
+                    except Exception as e:
+                        logger.error("Could not render %s/%s: %s", folder, image, e)
+                        continue
+                    packed = np.packbits(mask, axis=None)
+                    atlas.write(packed.tobytes())
+                    height, width = mask.shape
+                    entries.setdefault(folder, {})[image] = [offset, int(packed.size), int(height), int(width)]
+                    offset += int(packed.size)
+
+        index = {
+            "version": ATLAS_VERSION,
+            "generated_at": datetime.now().isoformat(),
+            "size": offset,
+            "entries": entries,
+        }
+        os.replace(tmp_path, atlas_path)
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+    except Exception as e:
+        error_msg = ERROR_MESSAGES["SAVE_ERROR"].format(e)
+        logger.error("%s", error_msg)
+        raise DataError(error_msg) from e
+
+    count = sum(len(images) for images in entries.values())
+    logger.info("Packed %d silhouettes (%d bytes) into %s", count, offset, atlas_path)
+    return index
+
+
+class SilhouetteAtlas:
+    """Read-only, memory-mapped view over a built silhouette atlas."""
+
+    def __init__(self, atlas_path: str = SILHOUETTE_ATLAS_PATH,
+                 index_path: str = SILHOUETTE_ATLAS_INDEX_PATH):
+        """
+        Open the atlas.
+
+        Args:
+            atlas_path: Binary atlas file
+            index_path: JSON offset index
+
+        Raises:
+            DataError: If the atlas is missing, corrupt or from another version
+        """
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            atlas_size = os.path.getsize(atlas_path)
+        except (OSError, json.JSONDecodeError) as e:
+            raise DataError(ERROR_MESSAGES["LOAD_ERROR"].format(e)) from e
+
+        if index.get("version") != ATLAS_VERSION:
+            raise DataError(f"Unsupported silhouette atlas version: {index.get('version')}")
+        if atlas_size != index["size"]:
+            raise DataError(f"Silhouette atlas {atlas_path} does not match its index")
+
+        self.atlas_path = atlas_path
+        self.index_path = index_path
+        self.mtime = os.stat(index_path).st_mtime_ns
+        self._entries: Dict[str, Dict[str, List[int]]] = index["entries"]
+        self._data = np.memmap(atlas_path, dtype=np.uint8, mode="r") if index["size"] else np.zeros(0, np.uint8)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        operator, image = key
+        return image in self._entries.get(operator, {})
+
+    def __len__(self) -> int:
+        return sum(len(images) for images in self._entries.values())
+
+    def operators(self) -> List[str]:
+        """Operators with at least one silhouette in the atlas."""
+        return list(self._entries)
+
+    def images(self, operator: str) -> List[str]:
+        """Images of an operator stored in the atlas."""
+        return list(self._entries.get(operator, {}))
+
+    def get_mask(self, operator: str, image: str) -> np.ndarray:
+        """
+        Slice a silhouette out of the atlas.
+
+        Args:
+            operator: Operator folder name
+            image: Image file name
+
+        Returns:
+            Boolean mask (True = character)
+
+        Raises:
+            KeyError: If the silhouette is not in the atlas
+        """
+        offset, size, height, width = self._entries[operator][image]
+        packed = self._data[offset:offset + size]
+        return np.unpackbits(packed, count=height * width).reshape(height, width).astype(bool)
+
+    def encode_png(self, operator: str, image: str) -> bytes:
+        """Encode a silhouette as a PNG ready to upload."""
+        return encode_mask_png(self.get_mask(operator, image))
+
+
+_atlas: Optional[SilhouetteAtlas] = None
+_failed_mtime: Optional[int] = None
+
+
+def get_silhouette_atlas() -> Optional[SilhouetteAtlas]:
+    """
+    Get the shared atlas, reopening it when a new build replaces the index.
+
+    Returns:
+        The atlas, or None if it has not been built (callers fall back to rendering)
+    """
+    global _atlas, _failed_mtime
+    try:
+        mtime = os.stat(SILHOUETTE_ATLAS_INDEX_PATH).st_mtime_ns
+    except OSError:
+        _atlas = None
+        return None
+
+    if (_atlas is None or _atlas.mtime != mtime) and mtime != _failed_mtime:
+        try:
+            _atlas = SilhouetteAtlas()
+            logger.info("Loaded silhouette atlas with %d entries", len(_atlas))
+        except DataError as e:
+            logger.error("Could not open silhouette atlas: %s", e)
+            _atlas = None
+            _failed_mtime = mtime
+    return _atlas
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Pack all silhouettes into a memory-mapped atlas.")
+    parser.add_argument("--source", default=ORIGINAL_IMAGES_FOLDER, help="Asset library folder")
+    parser.add_argument("--atlas", default=SILHOUETTE_ATLAS_PATH, help="Binary atlas file to write")
+    parser.add_argument("--index", default=SILHOUETTE_ATLAS_INDEX_PATH, help="Offset index file to write")
+    args = parser.parse_args(argv)
+
+    index = build_silhouette_atlas(args.source, args.atlas, args.index)
+    count = sum(len(images) for images in index["entries"].values())
+    print(f"Packed {count} silhouettes ({index['size']} bytes) -> {args.atlas}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Silhouette quality index for the Guess Who game.
+An offline pass measures every original image (foreground area ratio, contour
+count and bounding box) so rounds only sample images that produce a usable
+silhouette.
+
+Usage:
+    python silhouette_index.py [--source "Imagens Originais"] [--output data/silhouette_index.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from constants import (
+    ORIGINAL_IMAGES_FOLDER, SILHOUETTE_INDEX_PATH, SUPPORTED_IMAGE_EXTENSIONS,
+    SILHOUETTE_MIN_FOREGROUND_RATIO, SILHOUETTE_MAX_FOREGROUND_RATIO, ERROR_MESSAGES
+)
+from exceptions import DataError
+from image_utils import analyze_silhouette
+from logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_VERSION = 1
+
+# Loaded index per path, invalidated when the file's mtime changes
+_index_cache: Dict[str, tuple] = {}
+
+
+def build_silhouette_index(base_path: str = ORIGINAL_IMAGES_FOLDER) -> Dict[str, Any]:
+    """
+    Analyze every image in the asset library.
+
+    Args:
+        base_path: Folder containing one subfolder per operator
+
+    Returns:
+        Index dictionary: {"version", "generated_at", "operators": {folder: {image: stats}}}
+    """
+    operators: Dict[str, Dict[str, Any]] = {}
+    if not os.path.isdir(base_path):
+        logger.warning("Image folder %s does not exist. Building an empty index.", base_path)
+    else:
+        for folder in sorted(os.listdir(base_path)):
+            folder_path = os.path.join(base_path, folder)
+            if not os.path.isdir(folder_path):
+                continue
+            entries = {}
+            for name in sorted(os.listdir(folder_path)):
+                if not name.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS):
+                    continue
+                try:
+                    entries[name] = analyze_silhouette(os.path.join(folder_path, name))
+                except Exception as e:
+                    logger.error("Could not analyze %s/%s: %s", folder, name, e)
+            operators[folder] = entries
+
+    total = sum(len(entries) for entries in operators.values())
+    logger.info("Analyzed %d images from %d operator folders", total, len(operators))
+    return {
+        "version": INDEX_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "operators": operators,
+    }
+
+
+def save_silhouette_index(index: Dict[str, Any], path: str = SILHOUETTE_INDEX_PATH) -> None:
+    """
+    Save the index to a JSON file.
+
+    Args:
+        index: Index built by build_silhouette_index
+        path: Destination file
+
+    Raises:
+        DataError: If the file cannot be written
+    """
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        _index_cache.pop(path, None)
+    except Exception as e:
+        error_msg = ERROR_MESSAGES["SAVE_ERROR"].format(e)
+        logger.error("%s", error_msg)
+        raise DataError(error_msg) from e
+
+
+def load_silhouette_index(path: str = SILHOUETTE_INDEX_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Load the index, reusing the parsed copy until the file changes.
+
+    Args:
+        path: Index file
+
+    Returns:
+        Index dictionary, or None if no index has been built yet
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _index_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except json.JSONDecodeError as e:
+        logger.error("%s: %s", ERROR_MESSAGES["JSON_DECODE_ERROR"].format(path), e)
+        return None
+
+    if index.get("version") != INDEX_VERSION:
+        logger.warning("Ignoring silhouette index %s with unsupported version %s", path, index.get("version"))
+        return None
+
+    _index_cache[path] = (mtime, index)
+    return index
+
+
+def is_quality_silhouette(stats: Dict[str, Any],
+                          min_ratio: float = SILHOUETTE_MIN_FOREGROUND_RATIO,
+                          max_ratio: float = SILHOUETTE_MAX_FOREGROUND_RATIO) -> bool:
+    """
+    Check whether an analyzed image is worth a round.
+
+    Args:
+        stats: Entry produced by image_utils.analyze_silhouette
+        min_ratio: Minimum fraction of the image covered by the silhouette
+        max_ratio: Maximum fraction (a full-frame silhouette means a non-white background)
+
+    Returns:
+        True if the silhouette is neither blank nor a solid block
+    """
+    if not stats.get("large_contour_count"):
+        return False
+    return min_ratio <= stats.get("foreground_ratio", 0.0) <= max_ratio
+
+
+def filter_quality_images(operator_folder: str, images: List[str],
+                          index: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Keep only the images of an operator that pass the quality bar.
+
+    Images missing from the index (added after it was built) are kept, and with
+    no index at all every image is returned unchanged.
+
+    Args:
+        operator_folder: Operator folder name
+        images: Candidate image file names
+        index: Pre-loaded index (optional)
+
+    Returns:
+        Filtered list of image file names
+    """
+    if index is None:
+        index = load_silhouette_index()
+    if not index:
+        return images
+
+    entries = index.get("operators", {}).get(operator_folder, {})
+    return [
+        image for image in images
+        if image not in entries or is_quality_silhouette(entries[image])
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Build the silhouette quality index.")
+    parser.add_argument("--source", default=ORIGINAL_IMAGES_FOLDER, help="Asset library folder")
+    parser.add_argument("--output", default=SILHOUETTE_INDEX_PATH, help="Index file to write")
+    args = parser.parse_args(argv)
+
+    index = build_silhouette_index(args.source)
+    save_silhouette_index(index, args.output)
+
+    entries = [stats for images in index["operators"].values() for stats in images.values()]
+    rejected = sum(1 for stats in entries if not is_quality_silhouette(stats))
+    print(f"Indexed {len(entries)} images, {rejected} below the quality bar -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Hashed timer wheel for the Discord bot.
+Round deadlines, auto-reveals and cooldowns are timers hashed into a ring of
+slots by their expiry tick; inserting or cancelling one is a set operation,
+and each tick only visits the timers of one slot, so thousands of concurrent
+rounds never need a full scan. The wheel ticks on the asyncio loop.
+"""
+
+import asyncio
+import inspect
+import math
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+
+from constants import TIMER_WHEEL_TICK_SECONDS, TIMER_WHEEL_SLOTS
+from logging_utils import get_logger
+from observability import observability
+
+logger = get_logger(__name__)
+
+
+class TimerHandle:
+    """A scheduled callback; cancel() removes it from its wheel."""
+
+    __slots__ = ("wheel", "callback", "args", "deadline", "slot", "rounds", "cancelled")
+
+    def __init__(self, wheel: "TimerWheel", callback: Callable[..., Any], args: tuple,
+                 deadline: float, slot: int, rounds: int):
+        self.wheel = wheel
+        self.callback = callback
+        self.args = args
+        self.deadline = deadline
+        self.slot = slot
+        self.rounds = rounds  # Full turns of the wheel left before it fires
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Cancel the timer (no-op if it already fired)."""
+        if not self.cancelled:
+            self.cancelled = True
+            self.wheel._slots[self.slot].discard(self)
+
+
+class TimerWheel:
+    """Hashed timer wheel with O(1) schedule and cancel."""
+
+    def __init__(self, tick: float = TIMER_WHEEL_TICK_SECONDS, slots: int = TIMER_WHEEL_SLOTS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the wheel.
+
+        Args:
+            tick: Seconds per tick (timer resolution)
+            slots: Number of slots; timers further than slots * tick away wait extra turns
+            clock: Time source (mainly for tests)
+        """
+        self.tick = tick
+        self.clock = clock
+        self._slots: List[Set[TimerHandle]] = [set() for _ in range(slots)]
+        self._origin = clock()
+        self._next_tick = 0  # Index of the next tick to process
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return sum(len(slot) for slot in self._slots)
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """
+        Call callback(*args) after delay seconds (coroutines are run as tasks).
+
+        Args:
+            delay: Seconds from now (rounded up to the next tick)
+            callback: Function or coroutine function to call
+
+        Returns:
+            Handle to cancel the timer
+        """
+        deadline = self.clock() + delay
+        # Tick i is processed once the clock reaches origin + (i + 1) * tick
+        target = max(math.ceil((deadline - self._origin) / self.tick) - 1, self._next_tick)
+        slot = target % len(self._slots)
+        handle = TimerHandle(self, callback, args, deadline, slot,
+                             (target - self._next_tick) // len(self._slots))
+        self._slots[slot].add(handle)
+        return handle
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """
+        Process every tick that elapsed up to now.
+
+        Returns:
+            Number of timers fired
+        """
+        now = self.clock() if now is None else now
+        fired = 0
+        while self._origin + (self._next_tick + 1) * self.tick <= now:
+            slot = self._slots[self._next_tick % len(self._slots)]
+            self._next_tick += 1
+            due = []
+            for handle in slot:
+                if handle.rounds:
+                    handle.rounds -= 1
+                else:
+                    due.append(handle)
+            for handle in due:
+                slot.discard(handle)
+                handle.cancelled = True
+                self._fire(handle)
+                fired += 1
+        if fired:
+            observability.metrics.increment("timer_wheel_fired", value=fired)
+        return fired
+
+    def _fire(self, handle: TimerHandle) -> None:
+        try:
+            result = handle.callback(*handle.args)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(self._await(result))
+        except Exception as e:
+            observability.error_tracker.track_error(e, {'operation': 'timer_callback'})
+
+    @staticmethod
+    async def _await(result: Any) -> None:
+        try:
+            await result
+        except Exception as e:
+            observability.error_tracker.track_error(e, {'operation': 'timer_callback'})
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            self.advance()
+
+    def start(self) -> None:
+        """Start ticking on the running event loop (no-op if already running)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info("Timer wheel started (%d slots of %.1fs)", len(self._slots), self.tick)
+
+    def stop(self) -> None:
+        """Stop ticking; pending timers are kept."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class KeyedTimers:
+    """At most one timer per key (e.g. one deadline per round); rescheduling replaces it."""
+
+    def __init__(self, wheel: TimerWheel):
+        self.wheel = wheel
+        self._timers: Dict[Hashable, TimerHandle] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[..., Any], *args: Any) -> None:
+        """Call callback(*args) after delay seconds, replacing the key's pending timer."""
+        self.cancel(key)
+        self._timers[key] = self.wheel.schedule(delay, self._fire, key, callback, args)
+
+    def _fire(self, key: Hashable, callback: Callable[..., Any], args: tuple) -> Any:
+        self._timers.pop(key, None)
+        return callback(*args)
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel the key's pending timer; returns whether there was one."""
+        handle = self._timers.pop(key, None)
+        if handle is None:
+            return False
+        handle.cancel()
+        return True
+
+    def remaining(self, key: Hashable) -> float:
+        """Seconds until the key's timer fires (0 if there is none)."""
+        handle = self._timers.get(key)
+        if handle is None:
+            return 0.0
+        return max(handle.deadline - self.wheel.clock(), 0.0)
+
+
+def _released() -> None:
+    pass
+
+
+class Cooldowns(KeyedTimers):
+    """Keys that are cooling down, each released by a timer instead of a scan."""
+
+    def start(self, key: Hashable, seconds: float) -> None:
+        """Start (or restart) the cooldown of a key."""
+        self.schedule(key, seconds, _released)
+
+    def active(self, key: Hashable) -> bool:
+        """Whether a key is cooling down."""
+        # The deadline is checked too, so a stopped wheel never locks anyone out
+        return self.remaining(key) > 0
+
+
+# Global timer wheel instance
+timer_wheel = TimerWheel()
@@ -0,0 +1,122 @@
+"""
+User resolution for the Discord bot.
+Reveals need the name and mention of every winner. Players are remembered
+from their own guess interactions, so most winners are already known; the
+rest are fetched from Discord concurrently, a few at a time, and everything
+is kept in a small TTL cache.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from constants import USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE, USER_FETCH_CONCURRENCY
+from logging_utils import get_logger
+from observability import observability
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class UserInfo:
+    """What a reveal needs to know about a user."""
+    name: Optional[str]  # None if the user could not be fetched
+    mention: str
+
+
+class UserCache:
+    """TTL cache of user names and mentions, filled from interactions and fetches."""
+
+    def __init__(self, ttl: float = USER_CACHE_TTL_SECONDS, max_size: int = USER_CACHE_MAX_SIZE,
+                 concurrency: int = USER_FETCH_CONCURRENCY,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+            max_size: Entries kept before the least recently stored are dropped
+            concurrency: Maximum Discord fetches in flight at once
+            clock: Time source (mainly for tests)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.concurrency = concurrency
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[UserInfo, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, user_id: Any, info: UserInfo) -> None:
+        """Store a user's info."""
+        key = str(user_id)
+        self._entries[key] = (info, self.clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def remember(self, user: Any) -> None:
+        """Store a user object seen in an interaction (e.g. ctx.author)."""
+        self.put(user.id, UserInfo(str(user), user.mention))
+
+    def get(self, user_id: Any) -> Optional[UserInfo]:
+        """A user's info, or None if unknown or expired."""
+        key = str(user_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= self.clock():
+            del self._entries[key]
+            return None
+        return entry[0]
+
+    async def resolve(self, client: Any, user_ids: Iterable[Any]) -> Dict[str, UserInfo]:
+        """
+        Info of several users: cached ones at once, the others fetched concurrently.
+
+        Args:
+            client: Discord client (for fetch_user)
+            user_ids: User IDs
+
+        Returns:
+            Info keyed by user ID (as str); users that could not be fetched get
+            a bare mention and no name
+        """
+        resolved: Dict[str, UserInfo] = {}
+        missing = []
+        for user_id in user_ids:
+            info = self.get(user_id)
+            if info is None:
+                missing.append(str(user_id))
+            else:
+                resolved[str(user_id)] = info
+        observability.metrics.increment("user_cache_hits", value=len(resolved))
+        if not missing:
+            return resolved
+
+        observability.metrics.increment("user_cache_misses", value=len(missing))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(user_id: str) -> UserInfo:
+            async with semaphore:
+                try:
+                    user = await client.fetch_user(int(user_id))
+                except Exception as e:
+                    observability.error_tracker.track_error(e, {'operation': 'fetch_user', 'user_id': user_id})
+                    user = None
+            if user is None:
+                return UserInfo(None, f"<@{user_id}>")
+            info = UserInfo(str(user), user.mention)
+            self.put(user_id, info)
+            return info
+
+        for user_id, info in zip(missing, await asyncio.gather(*(fetch(user_id) for user_id in missing))):
+            resolved[user_id] = info
+        return resolved
+
+
+# Global user cache instance
+user_cache = UserCache()
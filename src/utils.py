@@ -2,11 +2,17 @@
 Utility functions for the Discord bot.
 """
 
+import hashlib
 import json
-from typing import Dict, List, Optional
+import os
+import time
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
-from constants import ALTERNATIVE_NAMES_PATH, ERROR_MESSAGES
+from constants import (
+    ALTERNATIVE_NAMES_PATH, ERROR_MESSAGES, SUPPORTED_IMAGE_EXTENSIONS, EXCLUDED_IMAGE_PATTERNS,
+    DATA_RELOAD_CHECK_INTERVAL
+)
 from exceptions import DataError
 from logging_utils import get_logger
 
@@ -40,18 +46,7 @@ def load_alternative_names(path: str = ALTERNATIVE_NAMES_PATH) -> Dict[str, List
         with open(file_path, "r", encoding="utf-8") as f:
             data = json.load(f)
         
-        for key, alternatives in data.items():
-            if isinstance(alternatives, list):
-                # Normalize all names to lowercase and strip whitespace
-                normalized_alternatives = [
-                    alt.strip().lower() 
-                    for alt in alternatives 
-                    if isinstance(alt, str) and alt.strip()
-                ]
-                names[key.lower()] = normalized_alternatives
-            else:
-                logger.warning("Invalid alternative names format for key '%s': expected list", key)
-        
+        names = parse_alternative_names(data)
         logger.info("Loaded %d alternative name mappings from %s", len(names), path)
         return names
         
@@ -65,6 +60,31 @@ def load_alternative_names(path: str = ALTERNATIVE_NAMES_PATH) -> Dict[str, List
         raise DataError(error_msg) from e
 
 
+def parse_alternative_names(data: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Normalize a raw alternative names mapping.
+    
+    Args:
+        data: Parsed JSON content ({"MainName": ["alternative1", ...], ...})
+        
+    Returns:
+        Dictionary mapping lowercase main names to lists of lowercase alternatives
+    """
+    names = {}
+    for key, alternatives in data.items():
+        if isinstance(alternatives, list):
+            # Normalize all names to lowercase and strip whitespace
+            normalized_alternatives = [
+                alt.strip().lower() 
+                for alt in alternatives 
+                if isinstance(alt, str) and alt.strip()
+            ]
+            names[key.lower()] = normalized_alternatives
+        else:
+            logger.warning("Invalid alternative names format for key '%s': expected list", key)
+    return names
+
+
 def normalize_operator_name(name: str) -> str:
     """
     Normalize an operator name for comparison.
@@ -85,16 +105,18 @@ def find_operator_alternatives(operator_name: str,
     
     Args:
         operator_name: The operator name to find alternatives for
-        alternative_names: Pre-loaded alternative names dict (optional)
+        alternative_names: Pre-loaded alternative names dict (optional; when
+            omitted the shared alias index answers without touching the disk)
         
     Returns:
         List of all alternative names including the original
     """
-    if alternative_names is None:
-        alternative_names = load_alternative_names()
-    
     normalized_name = normalize_operator_name(operator_name)
     
+    if alternative_names is None:
+        from alias_index import alias_index
+        return alias_index.alternatives_for(normalized_name)
+    
     # Start with the original name
     alternatives = [normalized_name]
     
@@ -129,4 +151,104 @@ def is_valid_operator_name(name: str) -> bool:
         return False
     
     normalized = normalize_operator_name(name)
-    return len(normalized) > 0 and len(normalized) <= 50  # Reasonable length limit
\ No newline at end of file
+    return len(normalized) > 0 and len(normalized) <= 50  # Reasonable length limit
+
+
+def list_operator_images(folder_path: str) -> List[str]:
+    """
+    List the images of an operator folder that can be used in a round.
+    
+    Args:
+        folder_path: Path to the operator's image folder
+        
+    Returns:
+        Sorted list of image file names with a supported extension and no
+        excluded pattern (E2 art, skins)
+    """
+    return sorted(
+        f for f in os.listdir(folder_path)
+        if f.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
+        and not any(pattern in f.lower() for pattern in EXCLUDED_IMAGE_PATTERNS)
+    )
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Get a cheap change signature for a file.
+    
+    Args:
+        path: File path
+        
+    Returns:
+        (mtime in nanoseconds, size in bytes), or None if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WatchedFile:
+    """Tracks a data file and reports when its content actually changes."""
+    
+    def __init__(self, path: str, check_interval: float = DATA_RELOAD_CHECK_INTERVAL):
+        """
+        Initialize the watcher. Nothing is read until the first poll.
+        
+        Args:
+            path: File to watch
+            check_interval: Minimum seconds between two stat calls
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.signature: Optional[Tuple[int, int]] = None
+        self.digest: Optional[str] = None
+        self._last_check: Optional[float] = None
+    
+    def poll(self, force: bool = False) -> Optional[bytes]:
+        """
+        Check the file for changes.
+        
+        The file is only stat'ed once per check interval, and only read when its
+        mtime or size changed; a rewrite with identical content is not reported.
+        
+        Args:
+            force: Ignore the check interval
+            
+        Returns:
+            The new file content if it changed since the last poll, None otherwise
+            
+        Raises:
+            OSError: If the file changed but cannot be read
+        """
+        now = time.monotonic()
+        if not force and self._last_check is not None and now - self._last_check < self.check_interval:
+            return None
+        self._last_check = now
+        
+        signature = file_signature(self.path)
+        if signature is None or signature == self.signature:
+            return None
+        
+        with open(self.path, "rb") as f:
+            content = f.read()
+        self.signature = signature
+        digest = hashlib.sha256(content).hexdigest()
+        if digest == self.digest:
+            return None
+        self.digest = digest
+        return content
+    
+    def prime(self, signature: Tuple[int, int], digest: str) -> None:
+        """
+        Mark a version of the file as already loaded (e.g. from a prebuilt
+        bundle), so polls only report content that differs from it.
+        
+        Args:
+            signature: File signature the loaded data was built from
+            digest: SHA-256 hex digest of that content
+        """
+        self.signature = signature
+        self.digest = digest
+        self._last_check = time.monotonic()
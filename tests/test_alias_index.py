@@ -0,0 +1,53 @@
+import json
+
+from alias_index import AliasIndex
+from utils import find_operator_alternatives
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_lookups_match_linear_scan(tmp_path):
+    path = tmp_path / "alternative_names.json"
+    data = {
+        "Amiya": ["amiya", "coelha"],
+        "Amiya Guard": ["amiya", "amiya espada"],
+        "Texas": [],
+    }
+    _write(path, data)
+    index = AliasIndex(str(path), check_interval=0)
+    mapping = {key.lower(): values for key, values in data.items()}
+
+    for name in ["amiya", "Coelha", "amiya espada", "texas", "unknown"]:
+        assert index.alternatives_for(name) == find_operator_alternatives(name, mapping)
+    assert index.canonicals_for("AMIYA") == {"amiya", "amiya guard"}
+    assert index.canonicals_for("unknown") == frozenset()
+
+
+def test_answer_set_accepts_canonical_and_aliases(tmp_path):
+    path = tmp_path / "alternative_names.json"
+    _write(path, {"Ch'en": ["chen", "ch'en the holungday"]})
+    index = AliasIndex(str(path), check_interval=0)
+
+    assert index.aliases_for("CH'EN")[0] == "chen"
+    assert index.answer_set("Ch'en") == {"ch'en", "chen", "ch'en the holungday"}
+    assert index.answer_set("Texas") == {"texas"}
+    assert index.raw() == {"Ch'en": ["chen", "ch'en the holungday"]}
+
+
+def test_reloads_only_when_content_changes(tmp_path):
+    path = tmp_path / "alternative_names.json"
+    _write(path, {"Texas": ["tex"]})
+    index = AliasIndex(str(path), check_interval=0)
+    assert index.version == 1
+
+    _write(path, {"Texas": ["tex"]})
+    assert index.version == 1
+
+    _write(path, {"Texas": ["tex", "texas the omertosa"]})
+    assert "texas the omertosa" in index.answer_set("texas")
+    assert index.version == 2
+
+    path.write_text("not json", encoding="utf-8")
+    assert index.answer_set("texas") == {"texas", "tex", "texas the omertosa"}
@@ -0,0 +1,54 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+# The command extensions live in src/commands, which the top-level commands/ package would shadow
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import commands.arkdle_daily as arkdle_daily  # noqa: E402
+from game_state import GameStateManager  # noqa: E402
+from round_store import daily_round_key  # noqa: E402
+
+
+def test_daily_points_are_paid_once_per_day(monkeypatch):
+    scores = {}
+    monkeypatch.setattr(arkdle_daily, "load_scores", lambda: scores)
+    monkeypatch.setattr(arkdle_daily, "save_scores", lambda data: None)
+    today = date(2024, 5, 1)
+
+    assert arkdle_daily.add_points("1", "amiya", 3, today)
+    assert not arkdle_daily.add_points("1", "amiya", 3, today)
+    assert arkdle_daily.add_points("1", "amiya", 1, today + timedelta(days=1))
+    assert scores["1"]["pontos"] == 4
+
+
+def test_daily_round_lives_in_the_game_state(monkeypatch):
+    manager = GameStateManager()
+    monkeypatch.setattr(arkdle_daily, "game_state", manager)
+    today = arkdle_daily.daily_schedule.today()
+    yesterday = today - timedelta(days=1)
+
+    old = arkdle_daily.get_daily_round("guild", yesterday)
+    daily = arkdle_daily.get_daily_round("guild", today)
+    if daily is None:
+        pytest.skip("No operator data in this checkout")
+    key = daily_round_key("guild", today)
+    manager.submit_arkdle_guess(key, "1", daily.current_operator.lower())
+    assert manager.has_won(key, "1")
+    assert arkdle_daily.get_daily_round("guild", today) is daily
+
+    assert old is not None and arkdle_daily.rollover_daily_rounds() == 1
+    assert manager.get_arkdle_round(daily_round_key("guild", yesterday)) is None
+    assert manager.get_arkdle_round(key) is daily
+
+
+def test_rollover_is_scheduled_for_midnight(monkeypatch):
+    monkeypatch.setattr(arkdle_daily, "game_state", GameStateManager())
+    arkdle_daily.run_rollover()
+    try:
+        remaining = arkdle_daily.rollover_timers.remaining("rollover")
+        assert abs(remaining - arkdle_daily.daily_schedule.seconds_until_rollover()) < 5
+    finally:
+        arkdle_daily.rollover_timers.cancel("rollover")
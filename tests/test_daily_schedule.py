@@ -0,0 +1,41 @@
+from datetime import date, datetime, timezone
+
+from daily_schedule import DailySchedule, schedule_cycles
+
+NAMES = [f"op{i}" for i in range(20)]
+
+
+def test_no_repeats_within_window():
+    days = schedule_cycles(NAMES, "seed", "guild", cycles=6, window=8)
+    assert len(days) == 120
+    for i in range(len(days)):
+        assert days[i] not in days[max(0, i - 8):i]
+    for cycle in range(6):
+        assert sorted(days[cycle * 20:(cycle + 1) * 20]) == sorted(NAMES)
+
+
+def test_schedule_is_deterministic_per_seed_and_guild():
+    first = schedule_cycles(NAMES, "seed", "guild", cycles=3, window=5)
+    assert first == schedule_cycles(list(reversed(NAMES)), "seed", "guild", cycles=3, window=5)
+    assert first != schedule_cycles(NAMES, "seed", "other guild", cycles=3, window=5)
+    assert first != schedule_cycles(NAMES, "other seed", "guild", cycles=3, window=5)
+
+
+def test_lookup_matches_precomputed_schedule():
+    schedule = DailySchedule(seed="seed", timezone="UTC", epoch="2024-01-01", days_ahead=10, window=5)
+    days = schedule_cycles(NAMES, "seed", "guild", cycles=30, window=5)
+
+    assert schedule.operator_for("guild", NAMES, date(2024, 1, 1)) == days[0]
+    assert schedule.operator_for("guild", NAMES, date(2024, 12, 31)) == days[365]
+    assert schedule.operator_for("guild", NAMES, date(2023, 12, 31)) is None
+    assert schedule.operator_for("guild", [], date(2024, 1, 1)) is None
+    assert [name for _, name in schedule.upcoming("guild", NAMES, 3, date(2024, 1, 2))] == days[1:4]
+
+
+def test_rollover_follows_timezone():
+    schedule = DailySchedule(timezone="America/Sao_Paulo")
+    now = datetime(2024, 6, 1, 2, 30, tzinfo=timezone.utc)  # 23:30 of May 31st in Sao Paulo
+    assert schedule.today(now) == date(2024, 5, 31)
+    assert schedule.seconds_until_rollover(now) == 30 * 60
+
+    assert DailySchedule(timezone="Not/AZone").timezone.key == "UTC"
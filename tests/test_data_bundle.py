@@ -0,0 +1,81 @@
+import json
+import os
+
+from data_bundle import (
+    build_data_bundle, catalog_folders, catalog_images, load_data_bundle, save_data_bundle,
+    _image_catalog,
+)
+
+
+def _sources(tmp_path):
+    operators = tmp_path / "operators.json"
+    operators.write_text(json.dumps({"operators": [
+        {"name": "Amiya", "class": "Caster", "rarity": "5 estrelas"},
+        {"name": "Texas", "class": "Vanguard", "rarity": "5 estrelas"},
+    ]}), encoding="utf-8")
+    aliases = tmp_path / "alternative_names.json"
+    aliases.write_text(json.dumps({"Texas": ["tex"]}), encoding="utf-8")
+    images = tmp_path / "images"
+    (images / "Amiya").mkdir(parents=True)
+    (images / "Amiya" / "amiya_1.png").write_bytes(b"")
+    (images / "Amiya" / "amiya_skin.png").write_bytes(b"")
+    return str(operators), str(aliases), str(images)
+
+
+def test_round_trip(tmp_path):
+    operators, aliases, images = _sources(tmp_path)
+    path = str(tmp_path / "bundle.pkl")
+    save_data_bundle(build_data_bundle(operators, aliases, images), path)
+
+    bundle = load_data_bundle(path)
+    table = bundle["table"]
+    assert table.names == ("Amiya", "Texas")
+    assert table.find("texas") == 1
+    assert table.records[0]["class"] == "Caster"
+    assert table.count(table.select({"class": "Caster"})) == 1
+    assert bundle["alias_lookups"][1]["tex"] == {"texas"}
+    assert bundle["image_catalog"][1]["folders"]["Amiya"][1] == ["amiya_1.png"]
+
+
+def test_stale_when_a_source_changes(tmp_path):
+    operators, aliases, images = _sources(tmp_path)
+    path = str(tmp_path / "bundle.pkl")
+    save_data_bundle(build_data_bundle(operators, aliases, images), path)
+
+    with open(aliases, "w", encoding="utf-8") as f:
+        json.dump({"Texas": ["tex", "texas the omertosa"]}, f)
+    assert load_data_bundle(path) is None
+
+
+def test_stale_when_the_code_changes(tmp_path):
+    operators, aliases, images = _sources(tmp_path)
+    path = str(tmp_path / "bundle.pkl")
+    bundle = build_data_bundle(operators, aliases, images)
+    bundle["code"] = "0" * 64
+    save_data_bundle(bundle, path)
+    assert load_data_bundle(path) is None
+
+
+def test_missing_or_corrupt_bundle(tmp_path):
+    assert load_data_bundle(str(tmp_path / "missing.pkl")) is None
+    corrupt = tmp_path / "bundle.pkl"
+    corrupt.write_bytes(b"not a pickle")
+    assert load_data_bundle(str(corrupt)) is None
+
+
+def test_image_catalog_falls_back_when_folder_changes(tmp_path):
+    operators, aliases, images = _sources(tmp_path)
+    bundle = build_data_bundle(operators, aliases, images)
+    catalog = bundle["image_catalog"][1]
+    _image_catalog[images] = (catalog["mtime"], catalog["folders"])
+    try:
+        assert catalog_folders(images) == ["Amiya"]
+        assert catalog_images(images, "Amiya") == ["amiya_1.png"]
+
+        folder = os.path.join(images, "Amiya")
+        (tmp_path / "images" / "Amiya" / "amiya_2.png").write_bytes(b"")
+        os.utime(folder, ns=(0, catalog["folders"]["Amiya"][0] + 1))
+        assert catalog_images(images, "Amiya") is None
+        assert catalog_images(images, "Texas") is None
+    finally:
+        _image_catalog.pop(images, None)
@@ -0,0 +1,34 @@
+from fuzzy_match import BKTree, FuzzyMatcher, fold_name, levenshtein
+
+NAMES = ["Ch'en", "Eyjafjalla", "Eyjafjalla the Hvít Aska", "Ash", "Ace", "Amiya", "Texas"]
+
+
+def test_fold_name():
+    assert fold_name("Ch'en") == "chen"
+    assert fold_name("  Eyjafjalla the Hvít Aska ") == "eyjafjallathehvitaska"
+
+
+def test_levenshtein_bound():
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("kitten", "sitting", max_distance=1) == 2
+    assert levenshtein("", "abc") == 3
+
+
+def test_bk_tree_search_matches_brute_force():
+    tree = BKTree()
+    terms = [fold_name(name) for name in NAMES]
+    for term in terms:
+        tree.add(term)
+    expected = sorted((levenshtein("eyjafjala", t), t) for t in terms if levenshtein("eyjafjala", t) <= 2)
+    assert tree.search("eyjafjala", 2) == expected
+
+
+def test_matcher_tolerates_typos_and_punctuation():
+    matcher = FuzzyMatcher(NAMES, max_distance=2)
+    assert matcher.match("eyjafjala") == "Eyjafjalla"
+    assert matcher.match("chen") == "Ch'en"
+    assert matcher.match("CH EN") == "Ch'en"
+    assert matcher.match("eyjafjalla the hvit aska") == "Eyjafjalla the Hvít Aska"
+    assert matcher.match("asx") is None
+    assert matcher.match("surtr") is None
+    assert FuzzyMatcher(NAMES, max_distance=0).match("eyjafjala") is None
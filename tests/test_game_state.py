@@ -0,0 +1,105 @@
+import pytest
+
+from exceptions import InvalidGameStateError
+from game_state import GameStateManager, speed_points
+
+KEY = ("guild", "channel")
+OPERATOR = {"name": "Amiya", "gender": "Mulher", "class": "Caster", "faction": "Rhodes Island"}
+
+
+def test_guess_who_round_lifecycle():
+    events = []
+    manager = GameStateManager()
+    manager.subscribe(lambda event, game, key, data: events.append((event, game, key)))
+
+    manager.start_guess_who_round(KEY, "amiya", ["amiya", "coelha"])
+    with pytest.raises(InvalidGameStateError):
+        manager.start_guess_who_round(KEY, "texas", ["texas"])
+
+    assert manager.submit_guess_who_answer(KEY, "1", " Coelha ")
+    assert manager.submit_guess_who_answer(KEY, "2", "texas")
+    assert not manager.submit_guess_who_answer(KEY, "1", "amiya")
+    assert manager.has_answered(KEY, "1")
+
+    results = manager.end_guess_who_round(KEY)
+    assert results["winners"] == ["1"]
+    assert results["all_answers"] == ["1", "2"]
+    assert manager.get_guess_who_round(KEY) is None
+    assert [event for event, _, _ in events] == ["round_started", "guess", "guess", "round_ended"]
+
+
+def test_rounds_are_independent_per_channel():
+    manager = GameStateManager()
+    manager.start_guess_who_round(KEY, "amiya", ["amiya"])
+    manager.start_guess_who_round(("guild", "other"), "texas", ["texas"])
+    with pytest.raises(InvalidGameStateError):
+        manager.submit_guess_who_answer(("other guild", "channel"), "1", "amiya")
+    assert manager.get_active_games() == {"guess_who"}
+
+
+def test_arkdle_hints_and_winner_set():
+    manager = GameStateManager()
+    manager.start_arkdle_round(KEY, OPERATOR, ["gender", "class", "faction"])
+
+    assert manager.submit_arkdle_guess(KEY, "1", "unknown", known=False) == {"status": "unknown"}
+    result = manager.submit_arkdle_guess(KEY, "1", "texas")
+    assert result["status"] == "incorrect"
+    assert (result["hint_field"], result["hint_value"]) == ("class", "Caster")
+    assert manager.submit_arkdle_guess(KEY, "1", "texas")["status"] == "incorrect"
+    assert manager.submit_arkdle_guess(KEY, "1", "texas")["status"] == "no_more_hints"
+
+    result = manager.submit_arkdle_guess(KEY, "1", "Amiya")
+    assert result["status"] == "correct"
+    assert (result["hints_used"], result["points"]) == (3, 10)
+    assert manager.has_won(KEY, "1")
+    assert manager.submit_arkdle_guess(KEY, "1", "amiya")["status"] == "already_won"
+
+    manager.start_arkdle_round(KEY, OPERATOR)
+    assert not manager.has_won(KEY, "1")
+
+
+def test_listener_errors_do_not_break_rounds():
+    manager = GameStateManager()
+
+    def failing(*args):
+        raise RuntimeError("listener failed")
+
+    manager.subscribe(failing)
+    manager.start_arkdle_round(KEY, OPERATOR)
+    assert manager.end_arkdle_round(KEY).current_operator == "Amiya"
+
+
+def test_guess_who_batch_submission():
+    events = []
+    manager = GameStateManager()
+    manager.subscribe(lambda event, game, key, data: events.append((event, data)))
+    manager.start_guess_who_round(KEY, "amiya", ["amiya"])
+
+    accepted = manager.submit_guess_who_answers(KEY, [("1", "Amiya"), ("2", "texas"), ("1", "texas")])
+    assert accepted == [True, True, False]
+    assert manager.end_guess_who_round(KEY)["winners"] == ["1"]
+    assert events[1][0] == "guesses"
+    assert [guess[:2] for guess in events[1][1]["guesses"]] == [["1", "amiya"], ["2", "texas"]]
+
+
+def test_competitive_ranking_is_by_answer_time(monkeypatch):
+    clock = iter([0.0, 5.0, 1.0, 9.0, 3.0])
+    monkeypatch.setattr("game_state.time.perf_counter", lambda: next(clock))
+    manager = GameStateManager()
+    manager.start_guess_who_round(KEY, "amiya", ["amiya"], competitive=True)  # Starts at 0
+    manager.submit_guess_who_answer(KEY, "slow", "amiya")  # 5s
+    manager.submit_guess_who_answer(KEY, "wrong", "texas")  # 1s
+    # Batched guesses keep the time they arrived, not the time the batch ran (9s)
+    manager.submit_guess_who_answers(KEY, [("fast", "amiya", 2.0), ("late", "amiya", 7.0)])
+    manager.submit_guess_who_answer(KEY, "middle", "amiya")  # 3s
+
+    results = manager.end_guess_who_round(KEY, top=2)
+    assert results["ranking"] == [("fast", 2.0), ("middle", 3.0)]
+    assert results["winners"] == ["slow", "fast", "late", "middle"]
+    assert results["winner_times"] == [5.0, 2.0, 7.0, 3.0]
+
+
+def test_speed_points_decay():
+    assert speed_points(0) == 20
+    assert speed_points(30) == 10
+    assert speed_points(600) == 2
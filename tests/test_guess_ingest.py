@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import pytest
+
+from guess_ingest import GuessBatcher
+
+
+def test_guesses_are_evaluated_in_batches():
+    batches = []
+
+    def evaluate(key, guesses):
+        batches.append((key, list(guesses)))
+        return [queued.guess.upper() for queued in guesses]
+
+    batcher = GuessBatcher("test", evaluate, max_size=3, max_delay=0.01)
+
+    async def run():
+        first = await asyncio.gather(*(batcher.submit("round", user, f"g{user}") for user in range(4)))
+        second = await batcher.submit("other", 9, "x")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == ["G0", "G1", "G2", "G3"]
+    assert second == "X"
+    # Three guesses fill a batch at once; the fourth waits for the delay
+    assert [len(guesses) for _, guesses in batches] == [3, 1, 1]
+
+
+def test_guesses_carry_their_round():
+    batcher = GuessBatcher("test", lambda key, guesses: list(guesses), max_delay=10)
+
+    async def run():
+        pending = asyncio.ensure_future(batcher.submit("round", 1, "a", round_id="r1"))
+        await asyncio.sleep(0)
+        flushed_at = time.perf_counter()
+        assert batcher.flush("round") == 1  # Evaluated at once, without waiting for the delay
+        return await pending, flushed_at
+
+    queued, flushed_at = asyncio.run(run())
+    assert queued.round_id == "r1"
+    assert queued.arrived_at <= flushed_at
+
+
+def test_evaluation_errors_reach_every_caller():
+    def evaluate(key, guesses):
+        raise ValueError("round ended")
+
+    batcher = GuessBatcher("test", evaluate, max_delay=0.01)
+
+    async def run():
+        return await asyncio.gather(batcher.submit("round", 1, "a"), batcher.submit("round", 2, "b"),
+                                    return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert batcher.pending("round") == 0
+
+
+def test_flush_without_pending_guesses():
+    batcher = GuessBatcher("test", lambda key, guesses: pytest.fail("nothing to evaluate"))
+    assert batcher.flush("round") == 0
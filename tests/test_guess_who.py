@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# The command extensions live in src/commands, which the top-level commands/ package would shadow
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import commands.guess_who as guess_who  # noqa: E402
+from game_state import game_state, speed_points  # noqa: E402
+from user_cache import UserInfo  # noqa: E402
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content)
+
+
+class FakeClient:
+    def __init__(self):
+        self.channel = FakeChannel()
+
+    async def fetch_channel(self, channel_id):
+        return self.channel
+
+    async def fetch_user(self, user_id):
+        return SimpleNamespace(id=user_id, mention=f"<@{user_id}>", __str__=lambda self: f"user{user_id}")
+
+
+def ctx_for(key, user_id):
+    sent = []
+
+    async def send(content=None, **kwargs):
+        sent.append(content)
+
+    author = SimpleNamespace(id=user_id, mention=f"<@{user_id}>")
+    ctx = SimpleNamespace(guild=SimpleNamespace(id=int(key[0])), channel_id=int(key[1]), author=author, send=send)
+    return ctx, sent
+
+
+def test_queued_guesses_are_counted_before_the_reveal(monkeypatch):
+    monkeypatch.setattr(guess_who, "load_scores", lambda: {})
+    monkeypatch.setattr(guess_who, "save_scores", lambda scores: None)
+    key = ("101", "201")
+    guess_who.update_round_state(key, "Amiya", "ref")
+    client = FakeClient()
+
+    async def run():
+        ctx, sent = ctx_for(key, 1)
+        pending = asyncio.ensure_future(guess_who.register_answer(ctx, "amiya"))
+        await asyncio.sleep(0)
+        assert guess_who.guess_batcher.pending(key) == 1
+        await guess_who.auto_reveal(client, key)
+        await pending
+        return sent
+
+    assert asyncio.run(run()) == ["Palpite registrado com sucesso!"]
+    assert "<@1>" in client.channel.sent[0]
+
+
+def test_guesses_from_an_ended_round_are_not_recorded_in_the_next():
+    key = ("102", "202")
+    guess_who.update_round_state(key, "Amiya", "ref")
+
+    async def run():
+        ctx, sent = ctx_for(key, 1)
+        pending = asyncio.ensure_future(guess_who.register_answer(ctx, "amiya"))
+        await asyncio.sleep(0)
+        # The round ends (and the next starts) while the guess is still queued
+        game_state.end_guess_who_round(key)
+        guess_who.update_round_state(key, "Amiya", "ref")
+        guess_who.guess_batcher.flush(key)
+        await pending
+        return sent
+
+    assert asyncio.run(run()) == ["A rodada terminou antes do seu palpite ser registrado."]
+    assert not game_state.has_answered(key, "1")
+    game_state.end_guess_who_round(key)
+
+
+def test_every_competitive_winner_scores_by_speed():
+    winners = [str(user) for user in range(12)]
+    times = [float(user) for user in range(12)]
+    results = {
+        "winners": winners,
+        "winner_times": times,
+        "ranking": list(zip(winners, times))[:2],
+        "round": SimpleNamespace(correct_answer=["amiya"], competitive=True),
+    }
+    users = {user_id: UserInfo(user_id, f"<@{user_id}>") for user_id in winners}
+    points, msg = guess_who.score_results(results, users)
+    assert points == {user_id: speed_points(elapsed) for user_id, elapsed in zip(winners, times)}
+    assert "<@2>" not in msg and "Mais 10 acerto(s)" in msg
+
+
+def test_fallback_render_stays_in_memory(tmp_path, monkeypatch):
+    from PIL import Image
+
+    (tmp_path / "Amiya").mkdir()
+    Image.new("RGBA", (32, 32), (20, 20, 20, 255)).save(tmp_path / "Amiya" / "amiya.png")
+    monkeypatch.setattr(guess_who, "ORIGINAL_IMAGES_FOLDER", str(tmp_path))
+    monkeypatch.setattr(guess_who, "get_silhouette_atlas", lambda: None)
+
+    image_bytes, file_name, image_ref = guess_who.render_round_image("Amiya", "amiya.png", "abc.png")
+    assert image_bytes.startswith(b"\x89PNG")
+    assert file_name == "abc.png"
+    assert image_ref == str(tmp_path / "Amiya" / "amiya.png")
+    assert sorted(os.listdir(tmp_path / "Amiya")) == ["amiya.png"]
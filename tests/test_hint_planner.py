@@ -0,0 +1,34 @@
+from hint_planner import plan_all_hints, plan_hints
+from operator_table import OperatorTable
+
+
+def _operator(name, gender, faction, cls):
+    return {"name": name, "gender": gender, "faction": faction, "class": cls}
+
+
+def _table():
+    records = [_operator(f"Op{i}", "F" if i % 2 else "M", f"Faction{i % 4}", f"Class{i % 8}") for i in range(16)]
+    records.append(_operator("Unique", "F", "Loner", "Class0"))
+    return OperatorTable(records, fields=["gender", "faction", "class"])
+
+
+def test_plan_covers_every_field_and_ends_on_target():
+    table = _table()
+    for row in range(table.size):
+        plan = plan_hints(table, row)
+        assert sorted(plan.fields) == sorted(table.fields)
+        assert list(plan.remaining) == sorted(plan.remaining, reverse=True)
+        assert plan.remaining[-1] >= 1
+
+
+def test_giveaway_hint_is_saved_for_last():
+    table = _table()
+    plan = plan_hints(table, table.find("Unique"))
+    # The faction alone identifies the operator, so it must not come first
+    assert plan.fields[-1] == "faction"
+    assert plan.remaining[0] > 1
+
+
+def test_plans_keyed_by_normalized_name():
+    plans = plan_all_hints(_table())
+    assert set(plans) == {f"op{i}" for i in range(16)} | {"unique"}
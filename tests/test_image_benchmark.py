@@ -0,0 +1,21 @@
+import json
+
+from image_benchmark import STAGES, main, run_benchmark
+
+
+def test_run_benchmark_synthetic():
+    report = run_benchmark(sample=2, synthetic_size=(64, 48), force_synthetic=True, seed=1)
+    assert report["config"]["mode"] == "synthetic"
+    assert len(report["images"]) == 2
+    for stage in STAGES:
+        assert report["summary"]["stages"][stage]["count"] == 2
+    assert report["summary"]["stages"]["decode"]["max"] > 0
+    assert report["summary"]["peak_memory_bytes"] > 0
+    assert all(i["output_bytes"] > 0 for i in report["images"])
+
+
+def test_benchmark_cli_writes_report(tmp_path):
+    output = tmp_path / "report.json"
+    assert main(["--synthetic", "--sample", "1", "--size", "32x32", "--output", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["config"]["synthetic_size"] == [32, 32]
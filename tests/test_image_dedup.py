@@ -0,0 +1,42 @@
+from PIL import Image, ImageDraw
+
+from image_dedup import (
+    build_dedup_catalog,
+    difference_hash,
+    filter_duplicate_images,
+    hamming_distance,
+)
+
+
+def _draw(path, size, shape):
+    img = Image.new("RGBA", size, (255, 255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    w, h = size
+    if shape == "ellipse":
+        draw.ellipse((w * 0.2, h * 0.1, w * 0.7, h * 0.9), fill=(30, 30, 30, 255))
+    else:
+        draw.rectangle((w * 0.5, h * 0.5, w * 0.95, h * 0.95), fill=(30, 30, 30, 255))
+    img.save(path)
+
+
+def test_resized_copy_is_near_duplicate(tmp_path):
+    folder = tmp_path / "Amiya"
+    folder.mkdir()
+    _draw(folder / "a.png", (64, 64), "ellipse")
+    _draw(folder / "a_big.png", (256, 256), "ellipse")
+    _draw(folder / "b.png", (64, 64), "rectangle")
+    _draw(folder / "a_e2.png", (64, 64), "rectangle")
+
+    near = hamming_distance(difference_hash(str(folder / "a.png")), difference_hash(str(folder / "a_big.png")))
+    far = hamming_distance(difference_hash(str(folder / "a.png")), difference_hash(str(folder / "b.png")))
+    assert near < far
+
+    catalog = build_dedup_catalog(str(tmp_path), workers=1)
+    entry = catalog["operators"]["Amiya"]
+    assert entry["clusters"] == [["a_big.png", "a.png"]]
+    assert "a_e2.png" not in entry["hashes"]
+    images = ["a.png", "a_big.png", "b.png", "new.png"]
+    assert filter_duplicate_images("Amiya", images, catalog) == ["a_big.png", "b.png", "new.png"]
+    # With the representative filtered out (e.g. by quality), its copy takes its place
+    assert filter_duplicate_images("Amiya", ["a.png", "b.png"], catalog) == ["a.png", "b.png"]
+    assert all(len(value) == 16 for value in entry["hashes"].values())
@@ -0,0 +1,54 @@
+import pytest
+
+import match as match_module
+from exceptions import InvalidGameStateError
+from match import MIXED, MatchManager, plan_games
+
+KEY = ("guild", "channel")
+
+
+def test_plan_games():
+    assert plan_games(3) == ("guess_who", "arkdle", "guess_who")
+    assert plan_games(2, "arkdle") == ("arkdle", "arkdle")
+
+
+def test_match_rounds_and_standings():
+    manager = MatchManager()
+    match = manager.start(KEY, plan_games(2, MIXED), 60)
+    with pytest.raises(InvalidGameStateError):
+        manager.start(KEY, plan_games(1), 60)
+
+    assert match.next_game == "guess_who"
+    assert match.advance() == "guess_who"
+    match.award("1", 10, "amiya")
+    match.award("2", 15)
+    match.award("1", 10)
+    assert match.advance() == "arkdle"
+    assert match.next_game is None
+    assert match.advance() is None
+    assert match.standings() == [("1", 20), ("2", 15)]
+    assert match.standings(1) == [("1", 20)]
+
+
+def test_scores_are_committed_once_at_the_end(monkeypatch):
+    stored = {"1": {"username": "old", "pontos": 5}}
+    saves = []
+    monkeypatch.setattr(match_module, "load_scores", lambda: stored)
+    monkeypatch.setattr(match_module, "save_scores", saves.append)
+
+    manager = MatchManager()
+    match = manager.start(KEY, plan_games(1), 60)
+    match.award("1", 10, "amiya")
+    match.award("2", 4, "texas")
+    assert not saves
+
+    assert manager.finish(KEY) is match
+    assert saves == [{"1": {"username": "amiya", "pontos": 15}, "2": {"username": "texas", "pontos": 4}}]
+    assert manager.get(KEY) is None
+
+
+def test_cancelled_matches_leave_scores_alone(monkeypatch):
+    monkeypatch.setattr(match_module, "save_scores", lambda scores: pytest.fail("scores written"))
+    manager = MatchManager()
+    manager.start(KEY, plan_games(1), 60).award("1", 10)
+    assert manager.remove(KEY) is not None
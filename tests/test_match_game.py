@@ -0,0 +1,86 @@
+import asyncio
+import os
+import sys
+
+# The command extensions live in src/commands, which the top-level commands/ package would shadow
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import commands.match as match_game  # noqa: E402
+import match as match_module  # noqa: E402
+from game_state import game_state  # noqa: E402
+from match import match_manager, plan_games  # noqa: E402
+
+OPERATOR = {"name": "Amiya", "gender": "Mulher", "class": "Caster", "faction": "Rhodes Island"}
+
+
+class FailingChannel:
+    def __init__(self):
+        self.attempts = 0
+
+    async def send(self, content=None, **kwargs):
+        self.attempts += 1
+        raise RuntimeError("Missing Permissions")
+
+
+class FakeClient:
+    def __init__(self, channel=None):
+        self.channel = channel
+
+    async def fetch_channel(self, channel_id):
+        if self.channel is None:
+            raise RuntimeError("Unknown Channel")
+        return self.channel
+
+
+def test_failed_round_start_ends_the_round_and_the_match():
+    key = ("301", "401")
+    match = match_manager.start(key, plan_games(2, "arkdle"), 60)
+    match.stage(0, OPERATOR)
+    channel = FailingChannel()
+
+    asyncio.run(match_game.play_next_round(FakeClient(channel), key))
+    assert channel.attempts == 2  # The round announcement and the error notice
+    assert match_manager.get(key) is None
+    assert game_state.get_arkdle_round(key) is None
+    assert key not in match_game.round_timers
+
+
+def test_failed_round_end_commits_the_match(monkeypatch):
+    saves = []
+    monkeypatch.setattr(match_module, "load_scores", lambda: {})
+    monkeypatch.setattr(match_module, "save_scores", saves.append)
+    key = ("302", "402")
+    match = match_manager.start(key, plan_games(2, "arkdle"), 60)
+    match.advance()
+    game_state.start_arkdle_round(key, OPERATOR)
+    match.award("1", 10, "amiya")
+
+    asyncio.run(match_game.end_match_round(FakeClient(), key))
+    assert match_manager.get(key) is None
+    assert game_state.get_arkdle_round(key) is None
+    assert saves == [{"1": {"username": "amiya", "pontos": 10}}]
+
+
+def test_stale_upcoming_content_is_ignored():
+    match = match_manager.start(("303", "403"), plan_games(3), 60)
+    match.stage(0, "guess who round")
+    match.advance()
+    assert match.take_upcoming() == "guess who round"
+
+    # Content for round 1 that arrives after the match reached it must not land on round 2
+    match.advance()
+    match.stage(1, "guess who round")
+    match.advance()
+    assert match.take_upcoming() is None
+    match_manager.remove(match.key)
+
+
+def test_rounds_of_matches_lost_in_a_restart_are_ended():
+    key, standalone = ("304", "404"), ("304", "405")
+    game_state.start_arkdle_round(key, OPERATOR, match_id="lost")
+    game_state.start_arkdle_round(standalone, OPERATOR)
+
+    assert asyncio.run(match_game.end_orphaned_rounds(FakeClient())) == 1
+    assert game_state.get_arkdle_round(key) is None
+    assert game_state.get_arkdle_round(standalone) is not None
+    game_state.end_arkdle_round(standalone)
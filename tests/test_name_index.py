@@ -0,0 +1,22 @@
+from name_index import PrefixIndex, build_name_index
+
+
+def test_suggestions_are_ranked_and_capped():
+    names = ["Amiya", "Amiya Guard", "Ambriel", "Ch'en", "Texas"] + [f"Am{i:02d}" for i in range(30)]
+    index = build_name_index(names, {"Ch'en Alter": ["Ch'en Alter", "Ch'en the Holungday"]})
+
+    assert index.suggest("amiya") == ["Amiya", "Amiya Guard"]
+    assert len(index.suggest("am")) == 25
+    assert index.suggest("am")[0] == "Am00"
+    assert index.suggest("CH'") == ["Ch'en", "Ch'en Alter", "Ch'en the Holungday"]
+    assert index.suggest("holung") == ["Ch'en the Holungday"]
+    assert index.suggest("xyz") == []
+    assert index.suggest("", limit=3) == ["Am00", "Am01", "Am02"]
+
+
+def test_canonical_name_outranks_alias():
+    index = PrefixIndex()
+    index.add("Amiya Caster", is_alias=True)
+    index.add("Amiya")
+    index.add("amiya", is_alias=True)
+    assert index.suggest("ami") == ["Amiya", "Amiya Caster"]
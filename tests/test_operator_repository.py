@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from operator_repository import OperatorRepository
+
+
+def _write(path, names):
+    data = {"operators": [{"name": name, "class": "Caster"} for name in names]}
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_records_are_immutable_and_cached(tmp_path):
+    path = tmp_path / "operators.json"
+    _write(path, ["Amiya", "Ch'en"])
+    repo = OperatorRepository(str(path), check_interval=0)
+
+    assert repo.names() == ["Amiya", "Ch'en"]
+    assert repo.get("  ch'EN ")["name"] == "Ch'en"
+    with pytest.raises(TypeError):
+        repo.get("amiya")["class"] = "Guard"
+    assert repo.get_operators() is repo.get_operators()
+    assert repo.version == 1
+
+
+def test_reloads_only_when_content_changes(tmp_path):
+    path = tmp_path / "operators.json"
+    _write(path, ["Amiya"])
+    repo = OperatorRepository(str(path), check_interval=0)
+    assert repo.version == 1
+
+    _write(path, ["Amiya"])
+    assert repo.version == 1
+
+    _write(path, ["Amiya", "Texas"])
+    assert repo.get("texas") is not None
+    assert repo.version == 2
+
+
+def test_invalid_file_keeps_previous_data(tmp_path):
+    path = tmp_path / "operators.json"
+    _write(path, ["Amiya"])
+    repo = OperatorRepository(str(path), check_interval=0)
+    assert repo.names() == ["Amiya"]
+    path.write_text("{not json", encoding="utf-8")
+    assert repo.names() == ["Amiya"]
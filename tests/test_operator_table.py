@@ -0,0 +1,52 @@
+import numpy as np
+
+from operator_table import OperatorTable, parse_rarity
+
+OPERATORS = [
+    {"name": "Absinthe", "gender": "Mulher", "faction": "Ursus", "rarity": "5 estrelas",
+     "class": "Caster", "subclass": "Core", "nationality": "Ursus", "infection_status": "Não Infectado"},
+    {"name": "Amiya", "gender": "Mulher", "faction": "Rhodes Island", "rarity": "5 estrelas",
+     "class": "Caster", "subclass": "Core", "nationality": "Desconhecido", "infection_status": "Infectado"},
+    {"name": "Gummy", "gender": "Mulher", "faction": "Ursus", "rarity": "4 estrelas",
+     "class": "Defender", "subclass": "Guardian", "nationality": "Ursus", "infection_status": "Não Infectado"},
+    {"name": "12F", "gender": "Homem", "faction": "Rhodes Island", "rarity": "2 estrelas",
+     "class": "Caster", "subclass": "Splash", "nationality": "Desconhecido", "infection_status": "Não Infectado"},
+]
+
+
+def test_parse_rarity():
+    assert parse_rarity("6 estrelas") == 6
+    assert parse_rarity("1 estrela") == 1
+    assert parse_rarity(None) == 0
+
+
+def test_select_combines_fields_and_values():
+    table = OperatorTable(OPERATORS)
+    bits = table.select({"class": "caster", "faction": "Ursus"})
+    assert table.names_for(bits) == ["Absinthe"]
+    bits = table.select({"faction": ["Ursus", "Rhodes Island"]}, min_rarity=4)
+    assert table.count(bits) == 3
+    assert table.count(table.select({"faction": "Kazimierz"})) == 0
+    assert table.count(table.all()) == 4
+
+
+def test_columns_and_sampling():
+    table = OperatorTable(OPERATORS)
+    column = table.column("class")
+    assert [table.vocabularies["class"][code] for code in column] == ["Caster", "Caster", "Defender", "Caster"]
+    assert table.find("GUMMY") == 2
+    bits = table.select(max_rarity=2)
+    assert table.sample(bits, np.random.default_rng(0))["name"] == "12F"
+    assert table.sample(table.select({"class": "Medic"})) is None
+
+
+def test_compare_reports_matches_and_rarity_direction():
+    table = OperatorTable(OPERATORS)
+    matches, direction = table.compare(table.find("Gummy"), table.find("Absinthe"))
+    assert dict(zip(table.fields, matches.tolist())) == {
+        "gender": True, "faction": True, "rarity": False, "class": False,
+        "subclass": False, "nationality": True, "infection_status": True,
+    }
+    assert direction == 1
+    _, direction = table.compare(table.find("Amiya"), table.find("12F"))
+    assert direction == -1
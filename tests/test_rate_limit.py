@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from rate_limit import RateLimiter, TokenBuckets, parse_limit, rate_limited
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_limit():
+    assert parse_limit("5/10") == (5.0, 0.5)
+    for text in ("5", "0/10", "abc/1"):
+        with pytest.raises(ValueError):
+            parse_limit(text)
+
+
+def test_bucket_allows_a_burst_then_refills():
+    clock = FakeClock()
+    buckets = TokenBuckets(burst=2, rate=0.5, clock=clock)
+    for _ in range(2):
+        assert buckets.retry_after("user") == 0
+        buckets.take("user")
+    assert buckets.retry_after("user") == pytest.approx(2.0)
+    clock.now = 2.0
+    assert buckets.retry_after("user") == 0
+
+
+def test_full_buckets_expire():
+    clock = FakeClock()
+    buckets = TokenBuckets(burst=2, rate=1, clock=clock)
+    buckets.take("a")
+    clock.now = 1.0
+    buckets.take("b")
+    assert len(buckets) == 2
+    clock.now = 2.5
+    buckets.take("c")
+    assert len(buckets) == 2  # "a" was full again and dropped
+
+
+def test_guild_limit_applies_across_users():
+    clock = FakeClock()
+    limiter = RateLimiter("test", user_limit=(2, 1), guild_limit=(3, 1), clock=clock)
+    assert [limiter.check(user, "guild") for user in ("1", "2", "3")] == [0, 0, 0]
+    assert limiter.check("4", "guild") == pytest.approx(1.0)
+    assert limiter.check("4", "other guild") == 0
+    assert limiter.check("4", "guild", "other command") == 0
+
+
+def test_decorator_answers_limited_calls():
+    limiter = RateLimiter("test", user_limit=(1, 0.1), guild_limit=(10, 1))
+    calls, sent = [], []
+
+    @rate_limited("guess", limiter)
+    async def command(ctx):
+        calls.append(ctx)
+
+    async def send(message, **kwargs):
+        sent.append(message)
+
+    ctx = SimpleNamespace(author=SimpleNamespace(id=1), guild=None, send=send)
+    asyncio.run(command(ctx))
+    asyncio.run(command(ctx))
+    assert len(calls) == 1
+    assert "10s" in sent[0]
@@ -0,0 +1,84 @@
+from game_state import GameStateManager
+from round_journal import RoundJournal
+
+KEY = ("guild", "channel")
+OPERATOR = {"name": "Amiya", "gender": "Mulher", "class": "Caster", "faction": "Rhodes Island"}
+
+
+def make_journal(tmp_path, **kwargs):
+    return RoundJournal(str(tmp_path / "journal.jsonl"), str(tmp_path / "snapshot.json"), **kwargs)
+
+
+def play(manager):
+    manager.start_guess_who_round(KEY, "amiya", ["amiya", "coelha"])
+    manager.submit_guess_who_answer(KEY, "1", "coelha")
+    manager.submit_guess_who_answers(KEY, [("2", "texas"), ("1", "amiya")])
+    manager.start_arkdle_round(KEY, OPERATOR, ["gender", "class", "faction"])
+    manager.submit_arkdle_guess(KEY, "1", "texas")
+    manager.submit_arkdle_guess(KEY, "2", "amiya")
+
+
+def assert_restored(manager):
+    guess_who = manager.get_guess_who_round(KEY)
+    assert guess_who.answers == {"1": "coelha", "2": "texas"}
+    assert guess_who.winners == {"1"}
+    assert manager.has_answered(KEY, "2")
+    assert manager.has_won(KEY, "2")
+    result = manager.submit_arkdle_guess(KEY, "1", "texas")
+    assert (result["hint_field"], result["hint_index"]) == ("faction", 3)
+    assert manager.end_guess_who_round(KEY)["winners"] == ["1"]
+
+
+def test_rounds_are_replayed_from_the_journal(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.attach(GameStateManager())
+    play(journal.manager)
+    assert not (tmp_path / "journal.jsonl").exists()  # Still buffered
+    journal.flush()
+
+    restored = GameStateManager()
+    assert make_journal(tmp_path).attach(restored) == 2
+    assert_restored(restored)
+
+
+def test_snapshot_plus_journal_tail(tmp_path):
+    journal = make_journal(tmp_path, flush_events=1, snapshot_events=3)
+    journal.attach(GameStateManager())
+    play(journal.manager)
+    assert (tmp_path / "snapshot.json").exists()
+
+    restored = GameStateManager()
+    make_journal(tmp_path).attach(restored)
+    assert_restored(restored)
+
+
+def test_ended_rounds_stay_ended_and_torn_lines_are_skipped(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.attach(GameStateManager())
+    journal.manager.start_guess_who_round(KEY, "amiya", ["amiya"])
+    journal.manager.end_guess_who_round(KEY)
+    journal.manager.start_arkdle_round(KEY, OPERATOR)
+    journal.flush()
+    with open(tmp_path / "journal.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"seq": 99, "event": "gu')
+
+    restored = GameStateManager()
+    assert make_journal(tmp_path).attach(restored) == 1
+    assert restored.get_guess_who_round(KEY) is None
+    assert restored.get_arkdle_round(KEY).operator_data == OPERATOR
+
+
+def test_match_rounds_keep_their_match(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.attach(GameStateManager())
+    journal.manager.start_guess_who_round(KEY, "amiya", ["amiya"], match_id="m1")
+    journal.manager.start_arkdle_round(KEY, OPERATOR, match_id="m2")
+    journal.snapshot()
+    journal.manager.end_guess_who_round(KEY)
+    journal.manager.start_guess_who_round(KEY, "texas", ["texas"], match_id="m3")
+    journal.flush()
+
+    restored = GameStateManager()
+    make_journal(tmp_path).attach(restored)
+    assert restored.get_guess_who_round(KEY).match_id == "m3"
+    assert restored.get_arkdle_round(KEY).match_id == "m2"
@@ -0,0 +1,46 @@
+import asyncio
+import itertools
+
+from round_prefetch import RoundPrefetcher
+
+
+def test_refill_keeps_queue_at_depth():
+    counter = itertools.count()
+    prefetcher = RoundPrefetcher("test", lambda guild_id: next(counter), depth=2)
+
+    async def scenario():
+        assert prefetcher.pop("guild") is None
+        await prefetcher.refill("guild")
+        assert prefetcher.pending("guild") == 2
+        first = prefetcher.pop("guild")
+        await prefetcher.refill("guild")
+        return first, prefetcher.pop("guild"), prefetcher.pending("guild")
+
+    first, second, pending = asyncio.run(scenario())
+    assert (first, second, pending) == (0, 1, 1)
+
+
+def test_failing_prepare_does_not_raise():
+    def prepare(guild_id):
+        raise RuntimeError("no images")
+
+    prefetcher = RoundPrefetcher("test", prepare, depth=1)
+
+    async def scenario():
+        await prefetcher.refill("guild")
+        return prefetcher.pop("guild")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_least_recent_guilds_are_dropped():
+    prefetcher = RoundPrefetcher("test", lambda guild_id: f"round for {guild_id}", depth=1, max_guilds=2)
+
+    async def scenario():
+        for guild in ("a", "b", "c"):
+            await prefetcher.refill(guild)
+
+    asyncio.run(scenario())
+    assert prefetcher.pending("a") == 0
+    assert prefetcher.pending("b") == prefetcher.pending("c") == 1
+    assert prefetcher.pop("c") == "round for c"
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from round_store import RoundStore, round_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rounds_are_independent_per_channel():
+    store = RoundStore("test")
+    store.set(("guild", "a"), {"operator": "Amiya"})
+    store.set(("guild", "b"), {"operator": "Texas"})
+    assert store.get(("guild", "a")) == {"operator": "Amiya"}
+    assert ("other", "a") not in store
+    assert store.pop(("guild", "a")) == {"operator": "Amiya"}
+    assert store.get(("guild", "a")) is None
+    assert len(store) == 1
+
+
+def test_least_recently_used_round_is_evicted():
+    evicted = []
+    store = RoundStore("test", max_rounds=2, on_evict=lambda key, value: evicted.append(key))
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")
+    store.set("c", 3)
+    assert evicted == ["b"]
+    assert list(store) == ["a", "c"]
+
+
+def test_idle_rounds_expire():
+    clock = FakeClock()
+    store = RoundStore("test", idle_seconds=10, clock=clock)
+    store.set("a", 1)
+    clock.now = 5
+    store.set("b", 2)
+    clock.now = 12
+    assert store.get("a") is None
+    assert store.get("b") == 2
+    clock.now = 30
+    assert store.evict_idle() == 1
+    assert len(store) == 0
+
+
+def test_pinned_rounds_are_never_evicted():
+    clock = FakeClock()
+    store = RoundStore("test", max_rounds=1, idle_seconds=10, pinned=lambda key: key.startswith("daily"),
+                       clock=clock)
+    store.set("daily:a", 1)
+    store.set("b", 2)
+    store.set("c", 3)
+    clock.now = 100
+    assert store.evict_idle() == 1
+    assert store.get("daily:a") == 1
+    assert list(store) == ["daily:a"]
+    assert store.pop("daily:a") == 1 and len(store) == 0
+
+
+def test_round_key_from_context():
+    ctx = SimpleNamespace(guild=SimpleNamespace(id=1), channel_id=2)
+    assert round_key(ctx) == ("1", "2")
+    assert round_key(SimpleNamespace(guild=None, channel_id=3)) == (None, "3")
@@ -0,0 +1,35 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from image_utils import silhouette_mask
+from silhouette_atlas import SilhouetteAtlas, build_silhouette_atlas
+
+
+def test_atlas_round_trip(tmp_path):
+    library = tmp_path / "library"
+    for operator, size in (("Amiya", (12, 9)), ("Texas", (7, 13))):
+        folder = library / operator
+        folder.mkdir(parents=True)
+        img = Image.new("RGBA", size, (255, 255, 255, 255))
+        for x in range(2, size[0] - 2):
+            for y in range(2, size[1] - 2):
+                img.putpixel((x, y), (0, 0, 200, 255))
+        img.save(folder / "base.png")
+        img.save(folder / "base_skin.png")
+
+    atlas_path = str(tmp_path / "atlas.bin")
+    index_path = str(tmp_path / "atlas.json")
+    build_silhouette_atlas(str(library), atlas_path, index_path)
+    atlas = SilhouetteAtlas(atlas_path, index_path)
+
+    assert len(atlas) == 2
+    assert ("Amiya", "base_skin.png") not in atlas
+    for operator in ("Amiya", "Texas"):
+        expected = silhouette_mask(str(library / operator / "base.png"))
+        assert np.array_equal(atlas.get_mask(operator, "base.png"), expected)
+
+    decoded = np.array(Image.open(io.BytesIO(atlas.encode_png("Texas", "base.png"))))
+    assert decoded.shape == (13, 7)
+    assert decoded[6, 3] == 0 and decoded[0, 0] == 255
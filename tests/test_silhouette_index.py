@@ -0,0 +1,43 @@
+from PIL import Image
+
+from image_utils import analyze_silhouette
+from silhouette_index import (
+    build_silhouette_index,
+    filter_quality_images,
+    is_quality_silhouette,
+    load_silhouette_index,
+    save_silhouette_index,
+)
+
+
+def _make_library(tmp_path):
+    folder = tmp_path / "Amiya"
+    folder.mkdir()
+    good = Image.new("RGBA", (20, 20), (255, 255, 255, 255))
+    for x in range(5, 15):
+        for y in range(5, 15):
+            good.putpixel((x, y), (10, 10, 10, 255))
+    good.save(folder / "good.png")
+    Image.new("RGBA", (20, 20), (255, 255, 255, 255)).save(folder / "blank.png")
+    return tmp_path
+
+
+def test_analyze_silhouette(tmp_path):
+    library = _make_library(tmp_path)
+    stats = analyze_silhouette(str(library / "Amiya" / "good.png"))
+    assert stats["large_contour_count"] == 1
+    assert stats["bbox"] == [5, 5, 10, 10]
+    assert abs(stats["foreground_ratio"] - 0.25) < 1e-6
+    blank = analyze_silhouette(str(library / "Amiya" / "blank.png"))
+    assert blank["bbox"] is None
+    assert not is_quality_silhouette(blank)
+
+
+def test_index_filters_degenerate_images(tmp_path):
+    library = _make_library(tmp_path)
+    index_path = str(tmp_path / "index.json")
+    save_silhouette_index(build_silhouette_index(str(library)), index_path)
+    index = load_silhouette_index(index_path)
+    images = ["good.png", "blank.png", "new.png"]
+    assert filter_quality_images("Amiya", images, index) == ["good.png", "new.png"]
+    assert filter_quality_images("Amiya", images, {}) == images
@@ -0,0 +1,63 @@
+from timer_wheel import Cooldowns, KeyedTimers, TimerWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_wheel(slots=8):
+    clock = FakeClock()
+    return TimerWheel(tick=1.0, slots=slots, clock=clock), clock
+
+
+def test_timers_fire_on_their_tick_across_turns():
+    wheel, clock = make_wheel(slots=4)
+    fired = []
+    for delay in (1, 3, 6, 13):
+        wheel.schedule(delay, fired.append, delay)
+
+    for second in range(1, 14):
+        clock.now = second
+        wheel.advance()
+        assert fired == [delay for delay in (1, 3, 6, 13) if delay <= second]
+    assert len(wheel) == 0
+
+
+def test_cancelled_timers_never_fire():
+    wheel, clock = make_wheel()
+    fired = []
+    handle = wheel.schedule(2, fired.append, "cancelled")
+    wheel.schedule(2, fired.append, "kept")
+    handle.cancel()
+    clock.now = 5
+    assert wheel.advance() == 1
+    assert fired == ["kept"]
+
+
+def test_keyed_timers_replace_the_pending_one():
+    wheel, clock = make_wheel()
+    fired = []
+    timers = KeyedTimers(wheel)
+    timers.schedule("round", 2, fired.append, "first")
+    timers.schedule("round", 4, fired.append, "second")
+    assert timers.remaining("round") == 4
+    clock.now = 4
+    wheel.advance()
+    assert fired == ["second"]
+    assert "round" not in timers
+    assert not timers.cancel("round")
+
+
+def test_cooldowns_expire_even_if_the_wheel_is_not_ticking():
+    wheel, clock = make_wheel()
+    cooldowns = Cooldowns(wheel)
+    cooldowns.start("user", 3)
+    assert cooldowns.active("user")
+    clock.now = 3
+    assert not cooldowns.active("user")
+    wheel.advance()
+    assert len(cooldowns) == 0
@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+from user_cache import UserCache, UserInfo
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class User(SimpleNamespace):
+    def __str__(self):
+        return self.username
+
+
+class FakeClient:
+    def __init__(self, missing=()):
+        self.fetched = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.missing = set(missing)
+
+    async def fetch_user(self, user_id):
+        self.fetched.append(user_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if user_id in self.missing:
+            raise LookupError(user_id)
+        return User(id=user_id, username=f"user{user_id}", mention=f"<@{user_id}>")
+
+
+def test_remembered_users_skip_fetching():
+    cache = UserCache()
+    cache.remember(User(id=1, username="amiya", mention="<@1>"))
+    client = FakeClient()
+    resolved = asyncio.run(cache.resolve(client, ["1", "2"]))
+    assert resolved == {"1": UserInfo("amiya", "<@1>"), "2": UserInfo("user2", "<@2>")}
+    assert client.fetched == [2]
+    assert cache.get(2) == UserInfo("user2", "<@2>")
+
+
+def test_fetches_are_bounded_and_failures_fall_back_to_mentions():
+    cache = UserCache(concurrency=3)
+    client = FakeClient(missing={5})
+    resolved = asyncio.run(cache.resolve(client, [str(user_id) for user_id in range(10)]))
+    assert client.max_in_flight == 3
+    assert resolved["5"] == UserInfo(None, "<@5>")
+    assert cache.get(5) is None
+
+
+def test_entries_expire_and_size_is_bounded():
+    clock = FakeClock()
+    cache = UserCache(ttl=10, max_size=2, clock=clock)
+    for user_id in range(3):
+        cache.put(user_id, UserInfo(str(user_id), f"<@{user_id}>"))
+    assert len(cache) == 2
+    assert cache.get(0) is None
+    clock.now = 10
+    assert cache.get(1) is None